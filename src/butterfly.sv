@@ -7,8 +7,8 @@ module butterfly #(
     output logic signed [WIDTH-1:0] Pos_real, Pos_imag,
     output logic signed [WIDTH-1:0] Neg_real, Neg_imag
 );
-    // Complex multiplication: W * B
-    logic signed [15:0] product_real, product_imag;
+    // Complex multiplication: W * B, full product width
+    logic signed [2*WIDTH-1:0] product_real, product_imag;
     
     assign product_real = (W_real * B_real) - (W_imag * B_imag);
     assign product_imag = (W_real * B_imag) + (W_imag * B_real);
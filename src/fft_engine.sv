@@ -1,5 +1,26 @@
+// RADIX4 selects the implementation; both are bit-exact, including 8-bit wrapping:
+//   0: two radix-2 stages of general butterfly modules (8x8 complex multiplies)
+//   1: one multiplierless radix-4 stage. The twiddles are only -1 and -j, so every
+//      product is a sign flip or a real/imag swap and each output is a sum of four
+//      inputs: two adder levels instead of a multiplier, an adder and a second stage.
+// Defining FFT_RADIX4 makes 1 the default, for running every testbench on the variant.
+//
+// PIPE_STAGES adds registers to the datapath and the outputs follow the inputs by
+// LATENCY = 1 + PIPE_STAGES clocks. Stages are placed, in order: between stage 1 and
+// stage 2, after the stage 2 twiddle multiply (butterfly implementation only), then
+// as extra output registers. FFT_PIPE_STAGES=<n> sets the default, like FFT_RADIX4.
 module fft_engine #(
-    parameter WIDTH = 8
+    parameter WIDTH = 8,
+`ifdef FFT_RADIX4
+    parameter bit RADIX4 = 1,
+`else
+    parameter bit RADIX4 = 0,
+`endif
+`ifdef FFT_PIPE_STAGES
+    parameter int PIPE_STAGES = `FFT_PIPE_STAGES
+`else
+    parameter int PIPE_STAGES = 0
+`endif
 )(
     input  logic clk, rst,
     // Individual input ports
@@ -13,65 +34,153 @@ module fft_engine #(
     output logic signed [WIDTH-1:0] out2_real, out2_imag,
     output logic signed [WIDTH-1:0] out3_real, out3_imag
 );
-    // Twiddle factors
-    localparam logic signed [WIDTH-1:0] W0_real = 8'sh80; // 1.0
-    localparam logic signed [WIDTH-1:0] W0_imag = 8'sh00;
-    localparam logic signed [WIDTH-1:0] W1_real = 8'sh00;  // -j
-    localparam logic signed [WIDTH-1:0] W1_imag = 8'sh80;
-    
-    // Stage 1 results
-    logic signed [WIDTH-1:0] s1_real[0:3];
-    logic signed [WIDTH-1:0] s1_imag[0:3];
-    
-    // Stage 2 butterfly outputs
-    logic signed [WIDTH-1:0] bfly_pos_real, bfly_pos_imag;
-    logic signed [WIDTH-1:0] bfly_neg_real, bfly_neg_imag;
-    
-    // Instantiate butterfly units for stage 1
-    butterfly bfly_stage1_0 (
-        .A_real(in0_real), .A_imag(in0_imag),
-        .B_real(in2_real), .B_imag(in2_imag),
-        .W_real(W0_real), .W_imag(W0_imag),
-        .Pos_real(s1_real[0]), .Pos_imag(s1_imag[0]),
-        .Neg_real(s1_real[1]), .Neg_imag(s1_imag[1])
-    );
+    // Clocks from a frame on the inputs to its bins on the outputs
+    localparam int LATENCY = 1 + PIPE_STAGES;
+
+    // Registers placed inside the datapath; the rest of PIPE_STAGES delays the outputs
+    localparam int CUTS = RADIX4 ? 1 : 2;
+    localparam int INNER = (PIPE_STAGES < CUTS) ? PIPE_STAGES : CUTS;
+    localparam int FRAME = 8 * WIDTH;
+
+    // Results of the last stage in port order, out0_real in the MSBs
+    logic [FRAME-1:0] result;
+
+    generate
+    if (RADIX4) begin : g_radix4
+        // Stage 1 sums and differences (the -1 butterflies), wrapped to WIDTH bits like the RTL below
+        logic signed [WIDTH-1:0] d02_real, d02_imag, s02_real, s02_imag;
+        logic signed [WIDTH-1:0] d13_real, d13_imag, s13_real, s13_imag;
+        assign d02_real = in0_real - in2_real;  assign d02_imag = in0_imag - in2_imag;
+        assign s02_real = in0_real + in2_real;  assign s02_imag = in0_imag + in2_imag;
+        assign d13_real = in1_real - in3_real;  assign d13_imag = in1_imag - in3_imag;
+        assign s13_real = in1_real + in3_real;  assign s13_imag = in1_imag + in3_imag;
+
+        // Stage 1 results as seen by stage 2, registered when INNER >= 1
+        logic [FRAME-1:0] s1, s1_q;
+        logic signed [WIDTH-1:0] a_real, a_imag, b_real, b_imag;
+        logic signed [WIDTH-1:0] c_real, c_imag, d_real, d_imag;
+        assign s1 = {d02_real, d02_imag, s02_real, s02_imag, d13_real, d13_imag, s13_real, s13_imag};
+        assign {a_real, a_imag, b_real, b_imag, c_real, c_imag, d_real, d_imag} = s1_q;
+
+        if (INNER >= 1) begin : g_stage1_reg
+            always_ff @(posedge clk or posedge rst) begin
+                if (rst) s1_q <= '0;
+                else     s1_q <= s1;
+            end
+        end else begin : g_stage1_comb
+            assign s1_q = s1;
+        end
+
+        // -j * (d_real + j d_imag) = d_imag - j d_real.
+        // Operands of a concatenation are self-determined, so each sum wraps to WIDTH bits.
+        assign result = {
+            a_real + c_real, a_imag + c_imag,    // out0 = d02 + d13
+            b_real + d_imag, b_imag - d_real,    // out1 = s02 - j s13
+            a_real - c_real, a_imag - c_imag,    // out2 = d02 - d13
+            b_real - d_imag, b_imag + d_real     // out3 = s02 + j s13
+        };
+    end else begin : g_butterfly
+        // Twiddle factors
+        localparam logic signed [WIDTH-1:0] W0_real = 8'sh80; // 1.0
+        localparam logic signed [WIDTH-1:0] W0_imag = 8'sh00;
+        localparam logic signed [WIDTH-1:0] W1_real = 8'sh00;  // -j
+        localparam logic signed [WIDTH-1:0] W1_imag = 8'sh80;
     
-    butterfly bfly_stage1_1 (
-        .A_real(in1_real), .A_imag(in1_imag),
-        .B_real(in3_real), .B_imag(in3_imag),
-        .W_real(W0_real), .W_imag(W0_imag),
-        .Pos_real(s1_real[2]), .Pos_imag(s1_imag[2]),
-        .Neg_real(s1_real[3]), .Neg_imag(s1_imag[3])
-    );
+        // Stage 1 results
+        logic signed [WIDTH-1:0] s1_real[0:3];
+        logic signed [WIDTH-1:0] s1_imag[0:3];
     
-    // Instantiate butterfly for stage 2
-    butterfly bfly_stage2_1 (
-        .A_real(s1_real[1]), .A_imag(s1_imag[1]),
-        .B_real(s1_real[3]), .B_imag(s1_imag[3]),
-        .W_real(W1_real), .W_imag(W1_imag),
-        .Pos_real(bfly_pos_real), .Pos_imag(bfly_pos_imag),
-        .Neg_real(bfly_neg_real), .Neg_imag(bfly_neg_imag)
-    );
+        // Instantiate butterfly units for stage 1
+        butterfly bfly_stage1_0 (
+            .A_real(in0_real), .A_imag(in0_imag),
+            .B_real(in2_real), .B_imag(in2_imag),
+            .W_real(W0_real), .W_imag(W0_imag),
+            .Pos_real(s1_real[0]), .Pos_imag(s1_imag[0]),
+            .Neg_real(s1_real[1]), .Neg_imag(s1_imag[1])
+        );
     
-    // Stage 2 processing
+        butterfly bfly_stage1_1 (
+            .A_real(in1_real), .A_imag(in1_imag),
+            .B_real(in3_real), .B_imag(in3_imag),
+            .W_real(W0_real), .W_imag(W0_imag),
+            .Pos_real(s1_real[2]), .Pos_imag(s1_imag[2]),
+            .Neg_real(s1_real[3]), .Neg_imag(s1_imag[3])
+        );
+
+        // Stage 1 results as seen by stage 2, registered when INNER >= 1
+        logic [FRAME-1:0] s1, s1_q;
+        logic signed [WIDTH-1:0] p_real[0:3];
+        logic signed [WIDTH-1:0] p_imag[0:3];
+        assign s1 = {s1_real[0], s1_imag[0], s1_real[1], s1_imag[1],
+                     s1_real[2], s1_imag[2], s1_real[3], s1_imag[3]};
+        assign {p_real[0], p_imag[0], p_real[1], p_imag[1],
+                p_real[2], p_imag[2], p_real[3], p_imag[3]} = s1_q;
+
+        if (INNER >= 1) begin : g_stage1_reg
+            always_ff @(posedge clk or posedge rst) begin
+                if (rst) s1_q <= '0;
+                else     s1_q <= s1;
+            end
+        end else begin : g_stage1_comb
+            assign s1_q = s1;
+        end
+
+        // Stage 2 twiddle multiply: a butterfly with A = 0 gives W1 * B scaled on Pos.
+        // Adding A after the WIDTH-bit truncation wraps exactly like the full butterfly.
+        logic signed [WIDTH-1:0] twiddled_real, twiddled_imag;
+        logic signed [WIDTH-1:0] unused_real, unused_imag;
+        butterfly bfly_stage2_1 (
+            .A_real('0), .A_imag('0),
+            .B_real(p_real[3]), .B_imag(p_imag[3]),
+            .W_real(W1_real), .W_imag(W1_imag),
+            .Pos_real(twiddled_real), .Pos_imag(twiddled_imag),
+            .Neg_real(unused_real), .Neg_imag(unused_imag)
+        );
+
+        // Stage 2 operands, registered after the multiply when INNER >= 2
+        logic [FRAME-1:0] s2, s2_q;
+        logic signed [WIDTH-1:0] a_real, a_imag, b_real, b_imag;
+        logic signed [WIDTH-1:0] c_real, c_imag, t_real, t_imag;
+        assign s2 = {p_real[0], p_imag[0], p_real[1], p_imag[1],
+                     p_real[2], p_imag[2], twiddled_real, twiddled_imag};
+        assign {a_real, a_imag, b_real, b_imag, c_real, c_imag, t_real, t_imag} = s2_q;
+
+        if (INNER >= 2) begin : g_stage2_reg
+            always_ff @(posedge clk or posedge rst) begin
+                if (rst) s2_q <= '0;
+                else     s2_q <= s2;
+            end
+        end else begin : g_stage2_comb
+            assign s2_q = s2;
+        end
+
+        // Each sum wraps to WIDTH bits: concatenation operands are self-determined
+        assign result = {
+            // First butterfly (no multiplication needed)
+            a_real + c_real, a_imag + c_imag,
+            // Second butterfly outputs
+            b_real + t_real, b_imag + t_imag,
+            a_real - c_real, a_imag - c_imag,
+            b_real - t_real, b_imag - t_imag
+        };
+    end
+    endgenerate
+
+    // Output register, followed by the stages that did not fit inside the datapath
+    localparam int DELAY = PIPE_STAGES - INNER;
+    logic [FRAME-1:0] out_pipe[0:DELAY];
+
     always_ff @(posedge clk or posedge rst) begin
         if (rst) begin
-            out0_real <= '0; out0_imag <= '0;
-            out1_real <= '0; out1_imag <= '0;
-            out2_real <= '0; out2_imag <= '0;
-            out3_real <= '0; out3_imag <= '0;
+            for (int i = 0; i <= DELAY; i++)
+                out_pipe[i] <= '0;
         end else begin
-            // First butterfly (no multiplication needed)
-            out0_real <= s1_real[0] + s1_real[2];
-            out0_imag <= s1_imag[0] + s1_imag[2];
-            out2_real <= s1_real[0] - s1_real[2];
-            out2_imag <= s1_imag[0] - s1_imag[2];
-            
-            // Second butterfly outputs
-            out1_real <= bfly_pos_real;
-            out1_imag <= bfly_pos_imag;
-            out3_real <= bfly_neg_real;
-            out3_imag <= bfly_neg_imag;
+            out_pipe[0] <= result;
+            for (int i = 1; i <= DELAY; i++)
+                out_pipe[i] <= out_pipe[i - 1];
         end
     end
+
+    assign {out0_real, out0_imag, out1_real, out1_imag,
+            out2_real, out2_imag, out3_real, out3_imag} = out_pipe[DELAY];
 endmodule
\ No newline at end of file
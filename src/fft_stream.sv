@@ -0,0 +1,93 @@
+module fft_stream #(
+    parameter WIDTH = 8,
+    // Passed to fft_engine; the result FIFO grows with the engine latency
+`ifdef FFT_PIPE_STAGES
+    parameter int PIPE_STAGES = `FFT_PIPE_STAGES
+`else
+    parameter int PIPE_STAGES = 0
+`endif
+)(
+    input  logic clk, rst,
+    // Input frame, transferred when in_valid && in_ready
+    input  logic in_valid,
+    output logic in_ready,
+    input  logic signed [WIDTH-1:0] in0_real, in0_imag,
+    input  logic signed [WIDTH-1:0] in1_real, in1_imag,
+    input  logic signed [WIDTH-1:0] in2_real, in2_imag,
+    input  logic signed [WIDTH-1:0] in3_real, in3_imag,
+    // Output frame, transferred when out_valid && out_ready
+    output logic out_valid,
+    input  logic out_ready,
+    output logic signed [WIDTH-1:0] out0_real, out0_imag,
+    output logic signed [WIDTH-1:0] out1_real, out1_imag,
+    output logic signed [WIDTH-1:0] out2_real, out2_imag,
+    output logic signed [WIDTH-1:0] out3_real, out3_imag
+);
+    localparam FRAME = 8 * WIDTH;
+    localparam int ENGINE_LATENCY = 1 + PIPE_STAGES;
+    // One entry per frame in flight through the engine, plus one being read:
+    // enough to accept a frame on every clock while the sink is ready
+    localparam int DEPTH = ENGINE_LATENCY + 1;
+    localparam int PTR = $clog2(DEPTH);
+    // Clocks from a frame being accepted to its result on out_*
+    localparam int LATENCY = ENGINE_LATENCY + 1;
+
+    // Engine results, registered ENGINE_LATENCY clocks after the inputs
+    logic signed [WIDTH-1:0] eng0_real, eng0_imag;
+    logic signed [WIDTH-1:0] eng1_real, eng1_imag;
+    logic signed [WIDTH-1:0] eng2_real, eng2_imag;
+    logic signed [WIDTH-1:0] eng3_real, eng3_imag;
+    // eng_valid[i]: the frame accepted i + 1 clocks ago
+    logic [ENGINE_LATENCY-1:0] eng_valid;
+    logic [$clog2(DEPTH + 1)-1:0] in_flight;
+
+    fft_engine #(.WIDTH(WIDTH), .PIPE_STAGES(PIPE_STAGES)) engine (
+        .clk(clk), .rst(rst),
+        .in0_real(in0_real), .in0_imag(in0_imag),
+        .in1_real(in1_real), .in1_imag(in1_imag),
+        .in2_real(in2_real), .in2_imag(in2_imag),
+        .in3_real(in3_real), .in3_imag(in3_imag),
+        .out0_real(eng0_real), .out0_imag(eng0_imag),
+        .out1_real(eng1_real), .out1_imag(eng1_imag),
+        .out2_real(eng2_real), .out2_imag(eng2_imag),
+        .out3_real(eng3_real), .out3_imag(eng3_imag)
+    );
+
+    // Result FIFO. The engine output register is overwritten on every
+    // clock, so each accepted frame is pushed here as it leaves the engine.
+    logic [FRAME-1:0] results[0:DEPTH-1];
+    logic [PTR-1:0] wr_ptr, rd_ptr;
+    logic [$clog2(DEPTH + 1)-1:0] count;
+
+    wire accept = in_valid && in_ready;
+    wire push = eng_valid[ENGINE_LATENCY-1];
+    wire pop  = out_valid && out_ready;
+
+    // Accept only if the frame will find a free entry when it leaves the engine
+    assign in_ready  = (count + in_flight) <= (DEPTH - 1 + pop);
+    assign out_valid = (count != '0);
+
+    always_ff @(posedge clk or posedge rst) begin
+        if (rst) begin
+            eng_valid <= '0;
+            in_flight <= '0;
+            wr_ptr <= '0;
+            rd_ptr <= '0;
+            count <= '0;
+        end else begin
+            eng_valid <= (eng_valid << 1) | accept;
+            in_flight <= in_flight + accept - push;
+            if (push) begin
+                results[wr_ptr] <= {eng0_real, eng0_imag, eng1_real, eng1_imag,
+                                    eng2_real, eng2_imag, eng3_real, eng3_imag};
+                wr_ptr <= (wr_ptr == DEPTH - 1) ? '0 : wr_ptr + 1'b1;
+            end
+            if (pop)
+                rd_ptr <= (rd_ptr == DEPTH - 1) ? '0 : rd_ptr + 1'b1;
+            count <= count + push - pop;
+        end
+    end
+
+    assign {out0_real, out0_imag, out1_real, out1_imag,
+            out2_real, out2_imag, out3_real, out3_imag} = results[rd_ptr];
+endmodule
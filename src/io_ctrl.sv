@@ -1,6 +1,7 @@
 module io_ctrl (
     input  logic clk, rst, ena,
     input  logic ui_in0, ui_in1,
+    input  logic burst,
     output logic load_pulse,
     output logic output_pulse,
     output logic [1:0] addr
@@ -17,13 +18,14 @@ module io_ctrl (
             prev_in0 <= ui_in0;
             prev_in1 <= ui_in1;
             
-            if (ui_in0 && !prev_in0) begin
+            if (load_pulse) begin
                 counter <= counter + 1;
             end
         end
     end
     
-    assign load_pulse = ui_in0 && !prev_in0;
-    assign output_pulse = ui_in1 && !prev_in1;
+    // Strobes fire on a rising edge, or on every clock while held in burst mode
+    assign load_pulse = ui_in0 && (burst || !prev_in0);
+    assign output_pulse = ui_in1 && (burst || !prev_in1);
     assign addr = counter;
 endmodule
\ No newline at end of file
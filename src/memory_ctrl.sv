@@ -1,5 +1,7 @@
 module memory_ctrl #(
-    parameter WIDTH = 8
+    parameter WIDTH = 8,
+    // 2: ping-pong banks, the outputs hold the last complete frame while the next one loads
+    parameter BANKS = 1
 )(
     input  logic clk, rst, ena,
     input  logic load_pulse,
@@ -11,30 +13,38 @@ module memory_ctrl #(
     output logic signed [WIDTH-1:0] real3_out, imag3_out
 );
     // Sample storage
-    logic signed [WIDTH-1:0] real_mem[0:3];
-    logic signed [WIDTH-1:0] imag_mem[0:3];
+    logic signed [WIDTH-1:0] real_mem[0:4*BANKS-1];
+    logic signed [WIDTH-1:0] imag_mem[0:4*BANKS-1];
+
+    // Bank being loaded; with two banks the outputs read the other one
+    logic load_bank;
+    wire read_bank = (BANKS == 2) ? ~load_bank : 1'b0;
     
     // Initialize arrays properly
     integer i;
     always_ff @(posedge clk or posedge rst) begin
         if (rst) begin
-            for (i = 0; i < 4; i = i + 1) begin
+            for (i = 0; i < 4*BANKS; i = i + 1) begin
                 real_mem[i] <= 0;
                 imag_mem[i] <= 0;
             end
+            load_bank <= 1'b0;
         end else if (ena && load_pulse) begin
-            real_mem[addr] <= $signed(data_in[7:4]) << 4;
-            imag_mem[addr] <= $signed(data_in[3:0]) << 4;
+            real_mem[{load_bank, addr}] <= $signed(data_in[7:4]) << 4;
+            imag_mem[{load_bank, addr}] <= $signed(data_in[3:0]) << 4;
+            // Swap banks as the last sample of a frame is written
+            if (BANKS == 2 && addr == 2'd3)
+                load_bank <= ~load_bank;
         end
     end
     
     // Continuous assignments for outputs
-    assign real0_out = real_mem[0];
-    assign imag0_out = imag_mem[0];
-    assign real1_out = real_mem[1];
-    assign imag1_out = imag_mem[1];
-    assign real2_out = real_mem[2];
-    assign imag2_out = imag_mem[2];
-    assign real3_out = real_mem[3];
-    assign imag3_out = imag_mem[3];
-endmodule
\ No newline at end of file
+    assign real0_out = real_mem[{read_bank, 2'd0}];
+    assign imag0_out = imag_mem[{read_bank, 2'd0}];
+    assign real1_out = real_mem[{read_bank, 2'd1}];
+    assign imag1_out = imag_mem[{read_bank, 2'd1}];
+    assign real2_out = real_mem[{read_bank, 2'd2}];
+    assign imag2_out = imag_mem[{read_bank, 2'd2}];
+    assign real3_out = real_mem[{read_bank, 2'd3}];
+    assign imag3_out = imag_mem[{read_bank, 2'd3}];
+endmodule
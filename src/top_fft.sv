@@ -1,4 +1,12 @@
-module tt_um_FFT_engine (
+// PIPE_STAGES is passed to fft_engine (see fft_engine.sv); processing stays high and
+// done waits until the engine's LATENCY clocks have passed.
+module tt_um_FFT_engine #(
+`ifdef FFT_PIPE_STAGES
+    parameter int PIPE_STAGES = `FFT_PIPE_STAGES
+`else
+    parameter int PIPE_STAGES = 0
+`endif
+) (
     input  wire [7:0] ui_in,
     output wire [7:0] uo_out,
     input  wire [7:0] uio_in,
@@ -46,6 +54,10 @@ module tt_um_FFT_engine (
     // State tracking
     logic processing, done;
     logic processing_dly;
+
+    // Clocks the engine takes from a loaded frame to its results, as in fft_engine
+    localparam int FFT_LATENCY = 1 + PIPE_STAGES;
+    logic [$clog2(FFT_LATENCY + 1)-1:0] processing_left;
     logic [1:0] output_counter;
 
     // Pipeline output to avoid hold violations
@@ -56,12 +68,15 @@ module tt_um_FFT_engine (
     io_ctrl io_inst (
         .clk(clk), .rst(rst_s), .ena(ena),
         .ui_in0(ui_in[0]), .ui_in1(ui_in[1]),
+        .burst(ui_in[2]),
         .load_pulse(load_pulse),
         .output_pulse(output_pulse),
         .addr(addr)
     );
     
-    memory_ctrl mem_inst (
+    // Ping-pong sample banks: the engine keeps computing the last complete frame,
+    // so its output register holds those results while the next frame loads
+    memory_ctrl #(.BANKS(2)) mem_inst (
         .clk(clk), .rst(rst_s), .ena(ena),
         .load_pulse(load_pulse),
         .addr(addr),
@@ -72,7 +87,9 @@ module tt_um_FFT_engine (
         .real3_out(sample3_real), .imag3_out(sample3_imag)
     );
     
-    fft_engine fft_inst (
+    fft_engine #(
+        .PIPE_STAGES(PIPE_STAGES)
+    ) fft_inst (
         .clk(clk), .rst(rst_s),
         .in0_real(sample0_real), .in0_imag(sample0_imag),
         .in1_real(sample1_real), .in1_imag(sample1_imag),
@@ -110,24 +127,70 @@ module tt_um_FFT_engine (
             done <= 1'b0;
             output_counter <= 2'b00;
             processing_dly <= 1'b0;
+            processing_left <= '0;
         end else if (ena) begin
             processing_dly <= processing;
-            if (load_pulse && addr == 2'd3) 
+            // processing is high for the FFT_LATENCY clocks the engine needs
+            if (load_pulse && addr == 2'd3) begin
                 processing <= '1;
-            else if (processing) 
-                processing <= '0;
+                processing_left <= FFT_LATENCY - 1;
+            end else if (processing) begin
+                if (processing_left == '0)
+                    processing <= '0;
+                else
+                    processing_left <= processing_left - 1'b1;
+            end
             
             if (processing_dly && !processing)
                 done <= '1;
             else if (output_pulse && output_counter == 2'd3)
                 done <= '0;
             
-            if (output_pulse && done) begin
+            // A newly completed frame is read out from bin 0
+            if (processing_dly && !processing)
+                output_counter <= '0;
+            else if (output_pulse && done) begin
                 output_counter <= (output_counter == 2'd3) ? '0 : output_counter + 1;
             end
         end
     end
 
+`ifdef PERF_COUNTERS
+    // Debug counters for simulation, read hierarchically by the testbench
+    // (test/fft_tb/perf.py). Not part of the taped-out design.
+    logic [15:0] perf_since_load, perf_since_done;
+    logic [15:0] perf_load_to_done;   // last sample load -> done
+    logic [15:0] perf_done_to_read;   // done -> first bin output pulse
+    logic [15:0] perf_frames;         // frames fully read out
+    logic perf_wait_read;
+
+    always_ff @(posedge clk or posedge rst_s) begin
+        if (rst_s) begin
+            perf_since_load <= '0;
+            perf_since_done <= '0;
+            perf_load_to_done <= '0;
+            perf_done_to_read <= '0;
+            perf_frames <= '0;
+            perf_wait_read <= 1'b0;
+        end else if (ena) begin
+            perf_since_load <= (load_pulse && addr == 2'd3) ? '0 : perf_since_load + 1'b1;
+            perf_since_done <= perf_since_done + 1'b1;
+
+            if (processing_dly && !processing) begin
+                perf_load_to_done <= perf_since_load + 1'b1;
+                perf_since_done <= '0;
+                perf_wait_read <= 1'b1;
+            end else if (output_pulse && done && perf_wait_read) begin
+                perf_done_to_read <= perf_since_done + 1'b1;
+                perf_wait_read <= 1'b0;
+            end
+
+            if (output_pulse && done && output_counter == 2'd3)
+                perf_frames <= perf_frames + 1'b1;
+        end
+    end
+`endif
+
     // Buffer FFT sample output
     logic [7:0] uio_out_reg;
 
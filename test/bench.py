@@ -0,0 +1,206 @@
+"""
+Benchmark suite with a stored history and a regression gate.
+
+Builds and runs every cocotb test of each testbench (waveforms off, see
+bench_sims.py) and records per testbench:
+
+    run_s             simulation wall time
+    cycles_per_s      simulated clock cycles per second of wall time
+    vectors_per_s     vectors checked per second (fft_tb.record_vectors)
+    latency           last sample load to done, in clocks (top only)
+    cycles_per_frame  fastest frame, first load to last bin, in clocks (top only)
+
+Every run is appended to a JSON-lines history file, with its --testcase
+and the workload knobs set in the environment (WORKLOAD_KNOBS), and
+compared against the baseline: the median of the last --window passing
+runs of the same testbench, simulator, testcase and knobs on the same
+host. A timing metric that is worse
+than the baseline by more than --threshold fails the run; the design
+metrics (latency, cycles_per_frame) may not grow at all.
+
+    python bench.py                             # every testbench, record and gate
+    python bench.py top fft_engine --sim verilator
+    python bench.py --threshold 0.1 --window 10
+    python bench.py --no-record                 # compare only, leave the history alone
+    python bench.py --no-gate                   # after an intended change, until the baseline catches up
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bench_sims import BENCH_ROOT, bench
+from runner import DEFAULT_TESTBENCHES, TEST_DIR, TESTBENCHES
+
+HISTORY = TEST_DIR / "bench_history.jsonl"
+
+# Metric -> (+1 if higher is better, -1 if lower is better, relative tolerance or None for --threshold)
+GATED = {
+    "run_s":            (-1, None),
+    "cycles_per_s":     (+1, None),
+    "vectors_per_s":    (+1, None),
+    "latency":          (-1, 0.0),
+    "cycles_per_frame": (-1, 0.0),
+}
+
+# Environment variables that change a run's workload: the test sizes and seeds, and the RTL build defines
+WORKLOAD_KNOBS = (
+    "BUTTERFLY_EXHAUSTIVE", "CONTINUOUS_FRAMES", "COVERAGE_MAX_FRAMES", "DEVICE_FRAMES", "EQUIV_FRAMES",
+    "GOLDEN_FRAMES", "GOLDEN_SEED", "GOLDEN_VECTORS", "LOCKSTEP_CYCLES", "SELFCHECK_FRAMES",
+    "SELFCHECK_VECTORS", "STIM_INDEX", "STREAM_FRAMES",
+    "FFT_PIPE_STAGES", "FFT_RADIX4", "PERF_COUNTERS",
+)
+
+
+def git_commit():
+    """Short hash of HEAD, with a + when the tree has local changes, or None outside git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=TEST_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=TEST_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("+" if dirty else "")
+
+
+def workload_knobs():
+    """The WORKLOAD_KNOBS set in the environment, by name."""
+    return {name: os.environ[name] for name in WORKLOAD_KNOBS if os.environ.get(name)}
+
+
+def read_metrics(metrics_dir):
+    """Vectors checked and the top-level frame metrics written by fft_tb.perf under `metrics_dir`."""
+    found = {"vectors": 0}
+    vectors = metrics_dir / "vectors.json"
+    if vectors.is_file():
+        found["vectors"] = sum(json.loads(vectors.read_text()).values())
+    latency, frame = [], []
+    for path in metrics_dir.glob("*.json"):
+        summary = json.loads(path.read_text()).get("summary", {})
+        if "load_to_done" in summary:
+            latency.append(summary["load_to_done"]["max"])
+        if "cycles_per_frame" in summary:
+            frame.append(summary["cycles_per_frame"]["min"])
+    if latency:
+        found["latency"] = max(latency)
+    if frame:
+        found["cycles_per_frame"] = min(frame)
+    return found
+
+
+def measure(name, sim, testcase=None):
+    """One benchmark record for testbench `name` under `sim`."""
+    record = bench(name, sim, testcase)
+    if "error" not in record:
+        record.update(read_metrics(BENCH_ROOT / sim / name / "metrics"))
+        record["vectors_per_s"] = record["vectors"] / record["run_s"] if record["run_s"] else 0.0
+    return record
+
+
+def load_history(path):
+    if not path.is_file():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+def workload(record):
+    """What a run measured: only runs with the same workload are comparable."""
+    return (record["testbench"], record["sim"], record["host"],
+            record.get("testcase"), record.get("knobs", {}))
+
+
+def baseline(history, record, window):
+    """Median of each gated metric over the last `window` passing runs comparable with `record`."""
+    runs = [h for h in history
+            if workload(h) == workload(record) and not h.get("error") and not h.get("failed")][-window:]
+    base = {}
+    for metric in GATED:
+        values = [h[metric] for h in runs if h.get(metric)]
+        if values:
+            base[metric] = statistics.median(values)
+    return base, len(runs)
+
+
+def regressions(record, base, threshold):
+    """(metric, value, baseline, relative change) for every gated metric worse than allowed."""
+    found = []
+    for metric, (direction, tolerance) in GATED.items():
+        if metric not in base or not record.get(metric):
+            continue
+        value, ref = record[metric], base[metric]
+        change = (value - ref) / ref
+        allowed = threshold if tolerance is None else tolerance
+        if -direction * change > allowed:
+            found.append((metric, value, ref, change))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("testbenches", nargs="*", metavar="testbench",
+                        help=f"testbenches to benchmark, from {', '.join(TESTBENCHES)} "
+                             f"(default: {', '.join(DEFAULT_TESTBENCHES)})")
+    parser.add_argument("--sim", default="icarus", help="cocotb simulator name")
+    parser.add_argument("--testcase", help="only run this cocotb test function")
+    parser.add_argument("--history", type=Path, default=HISTORY, help="JSON-lines history store")
+    parser.add_argument("--window", type=int, default=5, help="passing runs in the baseline median")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed relative slowdown of the timing metrics")
+    parser.add_argument("--no-record", dest="record", action="store_false", help="do not append to the history")
+    parser.add_argument("--no-gate", dest="gate", action="store_false", help="report regressions without failing")
+    args = parser.parse_args(argv)
+
+    names = args.testbenches or list(DEFAULT_TESTBENCHES)
+    unknown = set(names) - set(TESTBENCHES)
+    if unknown:
+        parser.error(f"unknown testbench: {', '.join(sorted(unknown))}")
+
+    history = load_history(args.history)
+    stamp = {"time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+             "host": platform.node(), "commit": git_commit(),
+             "testcase": args.testcase, "knobs": workload_knobs()}
+    records, regressed = [], []
+    for name in names:
+        print(f"INFO: benchmarking {name} under {args.sim}", flush=True)
+        record = {**stamp, **measure(name, args.sim, args.testcase)}
+        records.append(record)
+        if "error" in record:
+            print(record["error"], file=sys.stderr)
+            continue
+        base, runs = baseline(history, record, args.window)
+        record["baseline_runs"] = runs
+        regressed += [(name, *r) for r in regressions(record, base, args.threshold)]
+
+    print(f"\n{'testbench':<12} {'run (s)':>8} {'cycles/s':>10} {'vectors/s':>10} "
+          f"{'latency':>8} {'frame':>6} {'failed':>7} {'baseline':>9}")
+    for r in records:
+        if "error" in r:
+            print(f"{r['testbench']:<12} {'build/run error':>40}")
+            continue
+        print(f"{r['testbench']:<12} {r['run_s']:>8.2f} {r['cycles_per_s']:>10.0f} {r['vectors_per_s']:>10.0f} "
+              f"{r.get('latency', '-'):>8} {r.get('cycles_per_frame', '-'):>6} "
+              f"{r['failed']:>4}/{r['tests']:<2} {r['baseline_runs']:>5} runs")
+
+    for name, metric, value, ref, change in regressed:
+        print(f"REGRESSION: {name} {metric} {value:.4g} vs baseline {ref:.4g} ({change:+.1%})")
+
+    if args.record:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with args.history.open("a") as history_file:
+            for r in records:
+                history_file.write(json.dumps({**r, "error": "error" in r}) + "\n")
+        print(f"\n{len(records)} runs appended to {args.history}")
+
+    failed = any("error" in r or r["failed"] for r in records)
+    return 1 if failed or (args.gate and regressed) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
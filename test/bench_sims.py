@@ -0,0 +1,137 @@
+"""
+Icarus vs Verilator benchmark.
+
+Runs the same workload (every cocotb test of each testbench, waveforms
+off) under both simulators from a clean build and reports compile time,
+run time and simulated clock cycles per second of run time. Cycles are
+the simulated time from results.xml divided by the 10 ns testbench clock
+period; the combinational butterfly harness is counted the same way.
+
+    python bench_sims.py                          # every testbench, both simulators
+    python bench_sims.py fft_engine top --json bench.json
+    STREAM_FRAMES=200000 python bench_sims.py fft_engine
+
+Testbenches run one after another so the timings do not compete for
+cores. Exits non-zero if any test fails under either simulator.
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import time
+import traceback
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from runner import BUILD_ROOT, DEFAULT_TESTBENCHES, SRC_DIR, TESTBENCHES, build_args, testbench_env
+
+SIMULATORS = ("icarus", "verilator")
+
+# Clock period of every clocked harness (Clock(dut.clk, 10, units="ns"))
+CLOCK_PERIOD_NS = 10
+
+BENCH_ROOT = BUILD_ROOT / "bench"
+
+
+def parse_results(results):
+    """Return (tests, failures, simulated ns) from one cocotb results.xml."""
+    tests = failed = 0
+    sim_ns = 0.0
+    for case in ET.parse(results).getroot().iter("testcase"):
+        tests += 1
+        failed += any(True for _ in case.iter("failure"))
+        sim_ns += float(case.get("sim_time_ns", 0))
+    return tests, failed, sim_ns
+
+
+def bench(name, sim, testcase=None):
+    """Clean build and run of one testbench under `sim`; returns a metrics dict."""
+    from cocotb.runner import get_runner
+
+    tb = TESTBENCHES[name]
+    work_dir = BENCH_ROOT / sim / name
+    shutil.rmtree(work_dir, ignore_errors=True)
+    work_dir.mkdir(parents=True)
+    metrics = {"testbench": name, "sim": sim}
+
+    with testbench_env(tb, "off", work_dir, work_dir / "metrics"):
+        try:
+            runner = get_runner(sim)
+            start = time.perf_counter()
+            runner.build(
+                verilog_sources=tb.verilog_sources,
+                hdl_toplevel=tb.toplevel,
+                includes=[SRC_DIR],
+                build_args=build_args(sim, "off", tb.timing),
+                build_dir=work_dir / "build",
+                always=True,
+                log_file=work_dir / "build.log",
+            )
+            metrics["compile_s"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = runner.test(
+                test_module=tb.module,
+                hdl_toplevel=tb.toplevel,
+                hdl_toplevel_lang="verilog",
+                testcase=testcase,
+                build_dir=work_dir / "build",
+                test_dir=work_dir,
+                results_xml=str(work_dir / "results.xml"),
+                log_file=work_dir / "sim.log",
+            )
+            metrics["run_s"] = time.perf_counter() - start
+        except BaseException:
+            metrics["error"] = traceback.format_exc()
+            return metrics
+
+    tests, failed, sim_ns = parse_results(results)
+    cycles = sim_ns / CLOCK_PERIOD_NS
+    metrics.update(tests=tests, failed=failed, cycles=cycles,
+                   cycles_per_s=cycles / metrics["run_s"] if metrics["run_s"] else 0.0)
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("testbenches", nargs="*", metavar="testbench",
+                        help=f"testbenches to benchmark, from {', '.join(TESTBENCHES)} "
+                             f"(default: {', '.join(DEFAULT_TESTBENCHES)})")
+    parser.add_argument("--sims", nargs="+", default=list(SIMULATORS), help="simulators to compare")
+    parser.add_argument("--testcase", help="only run this cocotb test function")
+    parser.add_argument("--json", type=Path, help="also write the metrics to this file")
+    args = parser.parse_args(argv)
+
+    names = args.testbenches or list(DEFAULT_TESTBENCHES)
+    unknown = set(names) - set(TESTBENCHES)
+    if unknown:
+        parser.error(f"unknown testbench: {', '.join(sorted(unknown))}")
+
+    rows = []
+    for name in names:
+        for sim in args.sims:
+            print(f"INFO: benchmarking {name} under {sim}", flush=True)
+            metrics = bench(name, sim, args.testcase)
+            if "error" in metrics:
+                print(metrics["error"], file=sys.stderr)
+            rows.append(metrics)
+
+    print(f"\n{'testbench':<12} {'sim':<10} {'compile (s)':>11} {'run (s)':>8} "
+          f"{'cycles':>10} {'cycles/s':>10} {'failed':>7}")
+    for m in rows:
+        if "error" in m:
+            print(f"{m['testbench']:<12} {m['sim']:<10} {'build/run error':>50}")
+            continue
+        print(f"{m['testbench']:<12} {m['sim']:<10} {m['compile_s']:>11.2f} {m['run_s']:>8.2f} "
+              f"{m['cycles']:>10.0f} {m['cycles_per_s']:>10.0f} {m['failed']:>4}/{m['tests']:<2}")
+
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2))
+        print(f"\nMetrics written to {args.json}")
+
+    return 1 if any("error" in m or m["failed"] for m in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Content-hashed build directories for the simulator images.
+
+A build key hashes everything that affects elaboration: the simulator,
+the toplevel, the contents of every source file, the HDL files in every
+include directory and the remaining compile arguments (defines, flags).
+Testbenches whose key has not changed reuse their compiled image, so
+re-running a test after editing only Python skips elaboration entirely.
+Waveform paths are passed at run time (+VCD_PATH plusarg) so they do not
+invalidate the cache.
+
+The Makefile uses the command line form to pick SIM_BUILD:
+
+    python build_cache.py icarus butterfly_tb -I../src ./butterfly_unit/butterfly_tb.sv ../src/butterfly.sv
+"""
+
+import hashlib
+import shutil
+import sys
+from pathlib import Path
+
+HDL_SUFFIXES = {".v", ".sv", ".vh", ".svh"}
+
+# Keyed builds kept per testbench before the oldest are pruned
+KEEP_BUILDS = 3
+
+BUILT_MARKER = ".built"
+
+
+def _hash_file(h, path):
+    h.update(str(path.name).encode())
+    h.update(path.read_bytes())
+
+
+def build_key(sim, toplevel, args):
+    """
+    Hash of one simulator build.
+
+    `args` mixes source files, `-I<dir>` include directories and plain
+    compile arguments; files and include directories are hashed by content
+    so their location and timestamps do not matter.
+    """
+    h = hashlib.sha256(f"{sim}\0{toplevel}\0".encode())
+    for arg in map(str, args):
+        path = Path(arg)
+        if arg.startswith("-I") and Path(arg[2:]).is_dir():
+            h.update(b"-I")
+            for header in sorted(Path(arg[2:]).iterdir()):
+                if header.suffix in HDL_SUFFIXES:
+                    _hash_file(h, header)
+        elif path.is_file():
+            _hash_file(h, path)
+        else:
+            h.update(arg.encode())
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def is_built(build_dir):
+    """True if a previous build in `build_dir` completed."""
+    return (Path(build_dir) / BUILT_MARKER).is_file()
+
+
+def mark_built(build_dir):
+    (Path(build_dir) / BUILT_MARKER).touch()
+
+
+def prune(parent, keep=KEEP_BUILDS):
+    """Remove all but the `keep` most recently used keyed builds under `parent`."""
+    builds = sorted(
+        (d for d in Path(parent).iterdir() if d.is_dir() and (d / BUILT_MARKER).exists()),
+        key=lambda d: (d / BUILT_MARKER).stat().st_mtime,
+        reverse=True,
+    )
+    for stale in builds[keep:]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit(f"usage: {sys.argv[0]} SIM TOPLEVEL [SOURCES | -IDIR | ARGS]...")
+    print(build_key(sys.argv[1], sys.argv[2], sys.argv[3:]))
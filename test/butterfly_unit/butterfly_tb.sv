@@ -11,18 +11,28 @@ module butterfly_tb (
 
 logic [7:0] current_test_id = 0;
     // Dump the signals to a VCD file
+    // Only dumps when given +VCD_PATH; +WAVE_SCOPE / +WAVE_DEPTH narrow the dump (see test/waves.py)
     string vcd_name;
+    string wave_scope;
+    integer wave_depth;
     initial begin
-`ifdef VCD_PATH
-        vcd_name = `VCD_PATH;
-`else
-        vcd_name = {"butterfly_tb_", `TIMESTAMP, ".vcd"};
-`endif
-        $dumpfile(vcd_name);
-        $dumpvars(0, butterfly_tb);
-        #1;
+        if ($value$plusargs("VCD_PATH=%s", vcd_name)) begin
+            if (!$value$plusargs("WAVE_SCOPE=%s", wave_scope))
+                wave_scope = "";
+            if (!$value$plusargs("WAVE_DEPTH=%d", wave_depth))
+                wave_depth = 0;
+            $dumpfile(vcd_name);
+            case (wave_scope)
+                "dut":   $dumpvars(wave_depth, dut);
+                default: $dumpvars(wave_depth, butterfly_tb);
+            endcase
+        end
     end
 
+    // Toggled by fft_tb.window to flush the dump before it cuts out a failure window
+    logic wave_flush = 0;
+    always @(wave_flush) $dumpflush;
+
     // Instantiate the butterfly unit (DUT)
     butterfly dut (
         .A_real(A_real),
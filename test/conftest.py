@@ -0,0 +1,10 @@
+# pytest only collects the pure-Python model tests. The cocotb testbenches
+# in the module directories are run by the simulator through the Makefile.
+collect_ignore_glob = [
+    "butterfly_unit/*",
+    "fft_engine/*",
+    "fft_stream/*",
+    "io_ctrl/*",
+    "memory_ctrl/*",
+    "top_fft/*",
+]
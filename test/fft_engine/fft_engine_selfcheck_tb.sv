@@ -0,0 +1,123 @@
+`default_nettype none
+`timescale 1ns / 1ps
+
+// Self-checking harness: replays stimulus and expected outputs from $readmemh
+// files (fft_model/memh.py) with its own clock, so no Python runs per vector.
+//
+// While start is high the harness loads vector_count vectors from
+// selfcheck_stim.memh / selfcheck_expect.memh in the working directory and
+// streams them through the engine one per clock. finished rises once they
+// have all been checked and falls again when start is released, so cocotb
+// can refill the files and repeat. checked and mismatches accumulate.
+// Without cocotb, +VECTORS=<n> replays the files once and ends the simulation.
+module fft_engine_selfcheck_tb #(
+    parameter int DEPTH = 1 << 16       // must match fft_model.memh.DEPTH
+) (
+    input  logic        start,
+    input  logic [31:0] vector_count,
+    output logic        finished,
+    output logic [31:0] checked,
+    output logic [31:0] mismatches
+);
+
+    logic clk = 0;
+    logic rst = 1;
+    always #5 clk = ~clk;
+
+    logic [63:0] stim     [DEPTH];
+    logic [63:0] expected [DEPTH];
+
+    // Samples and bins in port order, sample 0 / bin 0 in the top byte
+    logic [63:0] in_bus = '0;
+    wire  [63:0] out_bus;
+
+    // Dump signals
+    // Only dumps when given +VCD_PATH; +WAVE_SCOPE / +WAVE_DEPTH narrow the dump (see test/waves.py)
+    string vcd_name;
+    string wave_scope;
+    integer wave_depth;
+    initial begin
+        if ($value$plusargs("VCD_PATH=%s", vcd_name)) begin
+            if (!$value$plusargs("WAVE_SCOPE=%s", wave_scope))
+                wave_scope = "";
+            if (!$value$plusargs("WAVE_DEPTH=%d", wave_depth))
+                wave_depth = 0;
+            $dumpfile(vcd_name);
+            case (wave_scope)
+                "dut":   $dumpvars(wave_depth, dut);
+                default: $dumpvars(wave_depth, fft_engine_selfcheck_tb);
+            endcase
+        end
+    end
+
+    // Toggled by fft_tb.window to flush the dump before it cuts out a failure window
+    logic wave_flush = 0;
+    always @(wave_flush) $dumpflush;
+
+    fft_engine dut (
+        .clk(clk),
+        .rst(rst),
+        .in0_real(in_bus[63:56]),
+        .in0_imag(in_bus[55:48]),
+        .in1_real(in_bus[47:40]),
+        .in1_imag(in_bus[39:32]),
+        .in2_real(in_bus[31:24]),
+        .in2_imag(in_bus[23:16]),
+        .in3_real(in_bus[15:8]),
+        .in3_imag(in_bus[7:0]),
+        .out0_real(out_bus[63:56]),
+        .out0_imag(out_bus[55:48]),
+        .out1_real(out_bus[47:40]),
+        .out1_imag(out_bus[39:32]),
+        .out2_real(out_bus[31:24]),
+        .out2_imag(out_bus[23:16]),
+        .out3_real(out_bus[15:8]),
+        .out3_imag(out_bus[7:0])
+    );
+
+    // Inputs change on the falling edge; the registered outputs for vector i
+    // are compared on the falling edge after the dut.LATENCY-th rising edge
+    // since it went in.
+    task automatic replay(input int count);
+        int latency = dut.LATENCY;
+        $readmemh("selfcheck_stim.memh", stim, 0, count - 1);
+        $readmemh("selfcheck_expect.memh", expected, 0, count - 1);
+        for (int i = 0; i < count + latency; i++) begin
+            @(negedge clk);
+            if (i >= latency) begin
+                if (out_bus !== expected[i - latency]) begin
+                    mismatches = mismatches + 1;
+                    if (mismatches <= 10)
+                        $display("SELFCHECK MISMATCH vector %0d: in=%h out=%h expected=%h",
+                                 checked, stim[i - latency], out_bus, expected[i - latency]);
+                end
+                checked = checked + 1;
+            end
+            if (i < count)
+                in_bus = stim[i];
+        end
+    endtask
+
+    int standalone;
+    initial begin
+        finished = 0;
+        checked = 0;
+        mismatches = 0;
+        repeat (2) @(negedge clk);
+        rst = 0;
+        if ($value$plusargs("VECTORS=%d", standalone)) begin
+            replay(standalone);
+            $display("SELFCHECK checked=%0d mismatches=%0d", checked, mismatches);
+            $finish;
+        end
+        forever begin
+            wait (start === 1'b1);
+            replay(vector_count);
+            $display("SELFCHECK checked=%0d mismatches=%0d", checked, mismatches);
+            finished = 1;
+            wait (start === 1'b0);
+            finished = 0;
+        end
+    end
+
+endmodule
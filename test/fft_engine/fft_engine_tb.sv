@@ -15,31 +15,53 @@ module fft_engine_tb (
 
 logic [7:0] current_test_id = 0;
 
+    // Packed buses for fft_tb.BusAdapter: one write and one read per frame, lane 0 in the MSBs.
+    // bus_mode selects in_bus over the individual in*_ ports.
+    logic        bus_mode = 0;
+    logic [63:0] in_bus = '0;
+    wire  [63:0] out_bus = {out0_real, out0_imag, out1_real, out1_imag,
+                            out2_real, out2_imag, out3_real, out3_imag};
+    wire  [63:0] dut_in = bus_mode ? in_bus : {in0_real, in0_imag, in1_real, in1_imag,
+                                               in2_real, in2_imag, in3_real, in3_imag};
+
+    // Clocks from in_bus to out_bus as built (fft_engine PIPE_STAGES), for the latency-aware tests
+    wire [7:0] latency = dut.LATENCY;
+
     // Dump signals
+    // Only dumps when given +VCD_PATH; +WAVE_SCOPE / +WAVE_DEPTH narrow the dump (see test/waves.py)
     string vcd_name;
+    string wave_scope;
+    integer wave_depth;
     initial begin
-`ifdef VCD_PATH
-        vcd_name = `VCD_PATH;
-`else
-        vcd_name = {"fft_engine_", `TIMESTAMP, ".vcd"};
-`endif
-        $dumpfile(vcd_name);
-        $dumpvars(0, fft_engine_tb);
-        #1;
+        if ($value$plusargs("VCD_PATH=%s", vcd_name)) begin
+            if (!$value$plusargs("WAVE_SCOPE=%s", wave_scope))
+                wave_scope = "";
+            if (!$value$plusargs("WAVE_DEPTH=%d", wave_depth))
+                wave_depth = 0;
+            $dumpfile(vcd_name);
+            case (wave_scope)
+                "dut":   $dumpvars(wave_depth, dut);
+                default: $dumpvars(wave_depth, fft_engine_tb);
+            endcase
+        end
     end
 
+    // Toggled by fft_tb.window to flush the dump before it cuts out a failure window
+    logic wave_flush = 0;
+    always @(wave_flush) $dumpflush;
+
     // Instantiate DUT
     fft_engine dut (
         .clk(clk),
         .rst(rst),
-        .in0_real(in0_real),
-        .in0_imag(in0_imag),
-        .in1_real(in1_real),
-        .in1_imag(in1_imag),
-        .in2_real(in2_real),
-        .in2_imag(in2_imag),
-        .in3_real(in3_real),
-        .in3_imag(in3_imag),
+        .in0_real(dut_in[63:56]),
+        .in0_imag(dut_in[55:48]),
+        .in1_real(dut_in[47:40]),
+        .in1_imag(dut_in[39:32]),
+        .in2_real(dut_in[31:24]),
+        .in2_imag(dut_in[23:16]),
+        .in3_real(dut_in[15:8]),
+        .in3_imag(dut_in[7:0]),
         .out0_real(out0_real),
         .out0_imag(out0_imag),
         .out1_real(out1_real),
@@ -50,4 +72,29 @@ logic [7:0] current_test_id = 0;
         .out3_imag(out3_imag)
     );
 
+    // Multiplierless radix-4 implementation on the same inputs, for test_radix4_equivalence
+    wire [63:0] radix4_out_bus;
+    fft_engine #(
+        .RADIX4(1)
+    ) dut_radix4 (
+        .clk(clk),
+        .rst(rst),
+        .in0_real(dut_in[63:56]),
+        .in0_imag(dut_in[55:48]),
+        .in1_real(dut_in[47:40]),
+        .in1_imag(dut_in[39:32]),
+        .in2_real(dut_in[31:24]),
+        .in2_imag(dut_in[23:16]),
+        .in3_real(dut_in[15:8]),
+        .in3_imag(dut_in[7:0]),
+        .out0_real(radix4_out_bus[63:56]),
+        .out0_imag(radix4_out_bus[55:48]),
+        .out1_real(radix4_out_bus[47:40]),
+        .out1_imag(radix4_out_bus[39:32]),
+        .out2_real(radix4_out_bus[31:24]),
+        .out2_imag(radix4_out_bus[23:16]),
+        .out3_real(radix4_out_bus[15:8]),
+        .out3_imag(radix4_out_bus[7:0])
+    );
+
 endmodule
\ No newline at end of file
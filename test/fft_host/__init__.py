@@ -0,0 +1,15 @@
+"""
+Host-side API for the tt_um_FFT_engine chip.
+
+Nothing here depends on cocotb: the same FFTDevice runs against the
+simulation (fft_tb.SimBoard), the cycle model (ModelBoard) or any
+backend that can clock the real chip.
+"""
+
+from .device import BURST, LOAD, READ, DeviceStats, FFTDevice
+from .model import ModelBoard
+
+__all__ = [
+    "BURST", "LOAD", "READ", "DeviceStats", "FFTDevice",
+    "ModelBoard",
+]
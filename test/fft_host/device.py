@@ -0,0 +1,124 @@
+"""
+FFTDevice: frames in, bins out, through the tt_um_FFT_engine pins.
+
+The device encodes each frame's samples into uio_in bytes the way
+fft_model.pack_input does, drives the chip through a backend and decodes
+the uio_out bytes it drives back. A backend provides two coroutines:
+
+    reset()                  reset the chip and leave ena high
+    step(ui_in, uio_in)      drive the inputs for one clock and return
+                             (uo_out, uio_out, uio_oe) after that edge
+
+fft_tb.SimBoard is the backend for the cocotb simulation. A board backend
+(a host clocking the chip by hand, one step per clock) implements the same
+two methods.
+
+The pin sequence is the shortest the protocol allows. Burst mode (ui_in[2])
+makes the strobes level-sensitive, so one sample loads or one bin is read
+per clock. The next frame's samples 0-2 go into the idle ping-pong bank
+before the current frame is read; sample 3 swaps the banks, so it waits
+until the bins are out and the chip has released uio.
+"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from fft_model import pack_input, unpack_output
+
+# ui_in bits
+LOAD = 0x01
+READ = 0x02
+BURST = 0x04
+
+# uio_oe while the chip drives a bin on uio_out
+DRIVEN = 0xFF
+
+
+@dataclass
+class DeviceStats:
+    """Frames transformed, clocks spent on them and wall time, accumulated across calls."""
+
+    frames: int = 0
+    cycles: int = 0
+    seconds: float = 0.0
+
+    @property
+    def cycles_per_frame(self):
+        return self.cycles / self.frames if self.frames else 0.0
+
+    @property
+    def frames_per_s(self):
+        """Frames per second of wall time, backend overhead included."""
+        return self.frames / self.seconds if self.seconds else 0.0
+
+    def frames_per_s_at(self, clock_hz):
+        """Frames per second the chip itself sustains with this schedule at `clock_hz`."""
+        return clock_hz / self.cycles_per_frame if self.frames else 0.0
+
+
+class FFTDevice:
+    """4-point FFTs on a tt_um_FFT_engine behind `backend`."""
+
+    def __init__(self, backend, timeout=100):
+        self.backend = backend
+        self.timeout = timeout          # clocks to wait for the four bins of a frame
+        self.stats = DeviceStats()
+
+    async def reset(self):
+        await self.backend.reset()
+        self.stats = DeviceStats()
+
+    async def _step(self, ui_in, uio_in=0):
+        self.stats.cycles += 1
+        return await self.backend.step(ui_in, uio_in)
+
+    async def _load(self, samples):
+        for sample in samples:
+            await self._step(BURST | LOAD, sample)
+
+    async def _read(self):
+        """Hold the output strobe until the four bins have been driven; returns the uio_out bytes."""
+        bins = []
+        for _ in range(self.timeout):
+            _, uio_out, uio_oe = await self._step(BURST | READ)
+            if uio_oe == DRIVEN:
+                bins.append(uio_out)
+                if len(bins) == 4:
+                    break
+        else:
+            raise TimeoutError(f"only {len(bins)} bins driven within {self.timeout} clocks")
+        # The chip drives uio for one more clock before the host may drive it again
+        await self._step(BURST | READ)
+        return bins
+
+    async def transform_many(self, frames, raw=False):
+        """
+        Transform (N, 4, 2) frames of (real, imag) samples, pipelined back to back.
+
+        Only the upper nibble of each sample reaches the chip. Returns the
+        bins as an (N, 4, 2) array with zero low nibbles, or the (N, 4)
+        uio_out bytes with `raw`.
+        """
+        frames = np.asarray(frames, dtype=np.int64).reshape(-1, 4, 2)
+        packed = pack_input(frames[..., 0], frames[..., 1]).tolist()
+        start = time.perf_counter()
+        out = []
+        if packed:
+            await self._load(packed[0])
+        for k in range(len(packed)):
+            following = packed[k + 1] if k + 1 < len(packed) else None
+            if following:
+                await self._load(following[:3])
+            out.append(await self._read())
+            if following:
+                await self._load(following[3:])
+        self.stats.frames += len(packed)
+        self.stats.seconds += time.perf_counter() - start
+        out = np.array(out, dtype=np.int64).reshape(-1, 4)
+        return out if raw else unpack_output(out)
+
+    async def transform(self, frame, raw=False):
+        """Transform one frame of four (real, imag) samples; see transform_many()."""
+        return (await self.transform_many([frame], raw))[0]
@@ -0,0 +1,26 @@
+"""
+ModelBoard: an FFTDevice backend on fft_model.ChipModel, with no simulator.
+
+It replays SimBoard's reset sequence and clocks one lane of the cycle
+model per step, so host-side sequences run unchanged against the model.
+"""
+
+from fft_model.chip import ChipModel
+
+
+class ModelBoard:
+    """A simulated board built from the cycle model; `latency` is the engine's 1 + PIPE_STAGES."""
+
+    def __init__(self, latency=1, reset_cycles=5):
+        self.model = ChipModel(latency=latency)
+        self.reset_cycles = reset_cycles
+
+    async def reset(self):
+        for _ in range(self.reset_cycles):
+            self.model.step(0, 0, ena=0, rst_n=0)
+        for _ in range(self.reset_cycles):
+            self.model.step(0, 0, ena=0)
+
+    async def step(self, ui_in, uio_in=0):
+        uo_out, uio_out, uio_oe = self.model.step(ui_in, uio_in)
+        return int(uo_out[0]), int(uio_out[0]), int(uio_oe[0])
@@ -0,0 +1,24 @@
+"""
+Bit-accurate golden models for the FFT engine testbenches.
+
+Every function operates on whole NumPy integer arrays (a batch of N
+vectors or frames in, N out) and reproduces the 2's complement wrap and
+arithmetic-shift behaviour of the RTL, so the same code serves a single
+cocotb test case or millions of expected results.
+"""
+
+from .fixed import pack_bytes, signed, unpack_bytes, wrap, wrap8
+from .butterfly import butterfly
+from .engine import W0, W1, fft_engine, fft_engine_radix4
+from .chip import ChipModel
+from .radix2 import bit_reverse, fft_radix2, twiddle_rom
+from .top import mem_transform, pack_input, pack_output, top_fft, unpack_output
+
+__all__ = [
+    "pack_bytes", "signed", "unpack_bytes", "wrap", "wrap8",
+    "butterfly",
+    "W0", "W1", "fft_engine", "fft_engine_radix4",
+    "ChipModel",
+    "bit_reverse", "fft_radix2", "twiddle_rom",
+    "mem_transform", "pack_input", "pack_output", "top_fft", "unpack_output",
+]
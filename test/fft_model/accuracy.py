@@ -0,0 +1,146 @@
+"""
+Fixed-point accuracy of the FFT datapath against floating point.
+
+Frames of a signal class are generated in floating point, quantized the
+way a datapath sees them, pushed through the bit-accurate fft_engine
+model and compared per output bin against two references:
+
+- numpy.fft.fft of the unquantized frame ("dft")
+- the datapath's own transform in exact arithmetic ("datapath"), which
+  isolates the error from input quantization and 8-bit wrapping
+
+Amplitudes are relative to full scale, 1.0 = 128 LSB. Everything works on
+chunks of frames so a sweep of any length runs in bounded memory; see
+test/accuracy_sweep.py for the multi-core driver.
+"""
+
+import numpy as np
+
+from .engine import fft_engine
+
+# Stimulus classes; a frame is four complex samples
+SIGNALS = ("tone", "noise", "impulse", "full_scale")
+
+# How samples reach the engine: 8-bit directly, or through memory_ctrl's upper nibble
+PATHS = ("engine", "top")
+
+FULL_SCALE = 128
+
+
+def signal_frames(kind, rng, count, scale=1.0):
+    """(count, 4) complex frames of signal class `kind` with peak amplitude `scale`."""
+    n = np.arange(4)
+    if kind == "tone":
+        # Off-bin frequencies leak into every bin
+        freq = rng.uniform(0, 4, size=(count, 1))
+        phase = rng.uniform(0, 2 * np.pi, size=(count, 1))
+        x = np.exp(1j * (2 * np.pi * freq * n / 4 + phase))
+    elif kind == "noise":
+        x = rng.uniform(-1, 1, size=(count, 4)) + 1j * rng.uniform(-1, 1, size=(count, 4))
+        x /= np.sqrt(2)
+    elif kind == "impulse":
+        x = np.zeros((count, 4), dtype=complex)
+        x[np.arange(count), rng.integers(0, 4, count)] = np.exp(1j * rng.uniform(0, 2 * np.pi, count))
+    elif kind == "full_scale":
+        x = rng.choice([-1.0, 1.0], size=(count, 4)) + 1j * rng.choice([-1.0, 1.0], size=(count, 4))
+    else:
+        raise ValueError(f"unknown signal class {kind!r}, expected one of {', '.join(SIGNALS)}")
+    return scale * x
+
+
+def quantize(x, path="engine"):
+    """
+    Integer (real, imag) samples, shape (..., 4, 2), as `path` delivers them to the engine.
+
+    "engine" rounds to 8 bits and saturates; "top" then keeps the upper
+    nibble like the host packing and memory_ctrl's `$signed(nibble) << 4`.
+    """
+    q = np.stack([x.real, x.imag], axis=-1) * FULL_SCALE
+    q = np.clip(np.rint(q), -FULL_SCALE, FULL_SCALE - 1).astype(np.int64)
+    if path == "top":
+        q = (q >> 4) << 4
+    elif path != "engine":
+        raise ValueError(f"unknown path {path!r}, expected one of {', '.join(PATHS)}")
+    return q
+
+
+def datapath_matrix():
+    """
+    The linear transform fft_engine implements, as a complex (4, 4) matrix (out = T @ in).
+
+    Probed with one small real impulse per input, so nothing wraps or truncates.
+    """
+    probe = np.zeros((4, 4, 2), dtype=np.int64)
+    probe[np.arange(4), np.arange(4), 0] = 16
+    out = fft_engine(probe) / 16
+    return (out[..., 0] + 1j * out[..., 1]).T
+
+
+def _power(z):
+    return z.real ** 2 + z.imag ** 2
+
+
+class AccuracyStats:
+    """Per-bin error accumulators for one (signal, scale, path) point; chunks merge with +=."""
+
+    def __init__(self):
+        self.frames = 0
+        self.signal = np.zeros(4)         # sum of |dft|^2
+        self.error = np.zeros(4)          # sum of |got - dft|^2
+        self.datapath_signal = np.zeros(4)
+        self.datapath_error = np.zeros(4)
+        self.max_error = np.zeros(4)      # max |got - dft|, LSB
+        self.overflows = np.zeros(4, dtype=np.int64)
+
+    def update(self, x, q, got):
+        """Accumulate frames `x` (floating point), their quantized samples `q` and the engine outputs `got`."""
+        transform = datapath_matrix().T
+        got = got[..., 0] + 1j * got[..., 1]
+        dft = np.fft.fft(x * FULL_SCALE, axis=-1)
+        ideal = (x * FULL_SCALE) @ transform
+        # The same transform on the quantized samples in exact arithmetic: differs from got only by wrapping
+        exact = (q[..., 0] + 1j * q[..., 1]) @ transform
+        err = _power(got - dft)
+        self.frames += len(x)
+        self.signal += _power(dft).sum(axis=0)
+        self.error += err.sum(axis=0)
+        self.datapath_signal += _power(ideal).sum(axis=0)
+        self.datapath_error += _power(got - ideal).sum(axis=0)
+        self.max_error = np.maximum(self.max_error, np.sqrt(err.max(axis=0, initial=0)))
+        self.overflows += (np.rint(exact) != got).sum(axis=0)
+        return self
+
+    def __iadd__(self, other):
+        self.frames += other.frames
+        for name in ("signal", "error", "datapath_signal", "datapath_error", "overflows"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.max_error = np.maximum(self.max_error, other.max_error)
+        return self
+
+    def summary(self):
+        """{bin: metrics} with SQNR in dB against both references, max error in LSB and overflow rate."""
+        with np.errstate(divide="ignore"):
+            sqnr = 10 * np.log10(self.signal / self.error)
+            datapath_sqnr = 10 * np.log10(self.datapath_signal / self.datapath_error)
+        return {
+            k: {
+                "sqnr_db": float(sqnr[k]),
+                "datapath_sqnr_db": float(datapath_sqnr[k]),
+                "max_error": float(self.max_error[k]),
+                "overflow_rate": float(self.overflows[k] / max(self.frames, 1)),
+            }
+            for k in range(4)
+        }
+
+
+def sweep_chunk(kind, scale, path, seed, chunk, count):
+    """
+    AccuracyStats for chunk number `chunk` (`count` frames) of one sweep point.
+
+    The frames depend only on (seed, kind, chunk) and `scale`, so every
+    scale and path of a sweep sees the same underlying signals.
+    """
+    rng = np.random.default_rng([seed, SIGNALS.index(kind), chunk])
+    x = signal_frames(kind, rng, count, scale)
+    q = quantize(x, path)
+    return AccuracyStats().update(x, q, fft_engine(q))
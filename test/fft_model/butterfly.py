@@ -0,0 +1,34 @@
+"""Vectorized model of src/butterfly.sv."""
+
+import numpy as np
+
+from .fixed import wrap
+
+
+def butterfly(a_r, a_i, b_r, b_i, w_r, w_i, width=8):
+    """
+    Reference butterfly matching the Verilog datapath.
+
+    Computes A +/- ((W * B) >>> (WIDTH - 1)) with fixed-point twiddles
+    (e.g. -128 for -1.0), the product held in 2 * WIDTH bits as in the RTL.
+    All arguments broadcast against each other. Returns the arrays
+    (pos_r, pos_i, neg_r, neg_i).
+    """
+    a_r, a_i, b_r, b_i, w_r, w_i = (
+        np.asarray(v, dtype=np.int64) for v in (a_r, a_i, b_r, b_i, w_r, w_i)
+    )
+
+    # Complex multiply: (w_r + jw_i) * (b_r + jb_i), wrapped to the 2*WIDTH-bit product registers
+    prod_real = wrap(w_r * b_r - w_i * b_i, 2 * width)
+    prod_imag = wrap(w_i * b_r + w_r * b_i, 2 * width)
+
+    # Arithmetic shift, simulating Verilog's `>>> (WIDTH - 1)`
+    pr = prod_real >> (width - 1)
+    pi = prod_imag >> (width - 1)
+
+    return (
+        wrap(a_r + pr, width),
+        wrap(a_i + pi, width),
+        wrap(a_r - pr, width),
+        wrap(a_i - pi, width),
+    )
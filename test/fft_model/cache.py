@@ -0,0 +1,45 @@
+"""On-disk cache for expensive model-generated arrays."""
+
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".model_cache"
+
+
+def cache_dir():
+    """Cache location, overridable with the FFT_MODEL_CACHE environment variable."""
+    return Path(os.environ.get("FFT_MODEL_CACHE", DEFAULT_CACHE_DIR))
+
+
+def model_version():
+    """Short hash of the model sources, so cached results expire when the model changes."""
+    h = hashlib.sha256()
+    for path in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        if path.name.startswith("test_"):
+            continue
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def cached(name, build):
+    """
+    Return the arrays produced by `build()`, reusing a copy saved on disk.
+
+    Files are keyed by `name` and the model version. Writes go through a
+    temporary file so concurrent simulations never see a partial cache.
+    """
+    path = cache_dir() / f"{name}-{model_version()}.npz"
+    if path.exists():
+        with np.load(path) as data:
+            return tuple(data[f"arr_{k}"] for k in range(len(data.files)))
+
+    arrays = tuple(build())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez(tmp, *arrays)
+    os.replace(tmp, path)
+    return arrays
@@ -0,0 +1,208 @@
+"""
+Cycle-accurate model of the tt_um_FFT_engine top level (src/top_fft.sv).
+
+ChipModel clocks `lanes` independent chips at once: every register of
+io_ctrl, memory_ctrl (two banks), the processing/done/output_counter FSM,
+fft_engine's pipeline and the output registers is an array with one entry
+per lane. step() takes the pins for one clock and returns the registered
+pins after that rising edge, the values a testbench samples in ReadOnly.
+
+The delay cells are buffers and have no effect on the cycle behaviour.
+fft_engine is feed-forward, so its registers are modelled as a delay line
+of LATENCY results; where they sit in the datapath does not matter.
+"""
+
+import numpy as np
+
+from .engine import fft_engine
+from .top import mem_transform, pack_output
+
+# ui_in bits
+LOAD = 0x01
+READ = 0x02
+BURST = 0x04
+
+# display_ctrl encodings
+D_1, D_2, D_3, D_4 = 0x0C, 0x5A, 0x4E, 0x64
+D_C, D_5, D_6, D_7 = 0x38, 0x6C, 0x7C, 0x0E
+
+# display_ctrl decodes `counter + 1` as a 32-bit value: sample 3 gives 4, which the
+# truncated 2'd4 item does not match (blank), and bin 3 falls to the default D_5
+LOAD_SEGMENTS = np.array([D_1, D_2, D_3, 0x00], dtype=np.int64)
+DONE_SEGMENTS = np.array([D_5, D_6, D_7, D_5], dtype=np.int64)
+
+
+def segments(addr, output_counter, processing, done):
+    """display_ctrl: the 7-segment code for the given state, vectorized."""
+    addr, output_counter = np.asarray(addr), np.asarray(output_counter)
+    return np.where(processing, D_C,
+                    np.where(done, DONE_SEGMENTS[output_counter], LOAD_SEGMENTS[addr]))
+
+
+def burst_stream(packed, latency=1):
+    """
+    Pins streaming (N, 4) packed frames back to back, without reset, as (ui_in, uio_in) per clock.
+
+    The schedule is FFTDevice's, open loop: after the first frame's four
+    loads, each frame period loads samples 0-2 of the next frame, holds the
+    output strobe until the current frame's four bins have been driven,
+    holds it one more turnaround clock and loads the next sample 3. Bin 0
+    is driven `latency` + 2 clocks after sample 3 loads, so the strobe is
+    held max(4, latency + 2) clocks. The last period loads nothing.
+    """
+    packed = np.asarray(packed, dtype=np.int64).reshape(-1, 4)
+    hold = max(4, latency + 2)
+    period = 3 + hold + 1 + 1
+    n = len(packed)
+    ui_in = np.full((n, period), BURST | READ, dtype=np.int64)
+    uio_in = np.zeros((n, period), dtype=np.int64)
+    following = np.zeros_like(packed)
+    following[:-1] = packed[1:]
+    ui_in[:-1, :3] = ui_in[:-1, -1] = BURST | LOAD
+    ui_in[-1, :3] = ui_in[-1, -1] = BURST
+    uio_in[:, :3], uio_in[:, -1] = following[:, :3], following[:, 3]
+    first_ui = np.full(4, BURST | LOAD, dtype=np.int64)
+    return np.concatenate([first_ui, ui_in.ravel()]), np.concatenate([packed[0], uio_in.ravel()])
+
+
+class ChipModel:
+    """`lanes` tt_um_FFT_engine chips whose engine takes `latency` (1 + PIPE_STAGES) clocks."""
+
+    def __init__(self, lanes=1, latency=1):
+        self.lanes = lanes
+        self.latency = latency
+        self.reset()
+
+    def reset(self):
+        """Every register in its reset state with the reset synchronizer released."""
+        n = self.lanes
+        zeros = lambda *shape: np.zeros((n, *shape), dtype=np.int64)
+        low = lambda: np.zeros(n, dtype=bool)
+        # reset synchronizer: rst_sync2 is the internal reset
+        self.rst_sync1, self.rst_sync2 = low(), low()
+        # io_ctrl
+        self.prev_in0, self.prev_in1, self.counter = low(), low(), zeros()
+        # memory_ctrl: packed uio_in bytes per bank and address
+        self.mem, self.load_bank = zeros(2, 4), zeros()
+        # top_fft FSM
+        self.processing, self.processing_dly, self.done = low(), low(), low()
+        self.processing_left, self.output_counter = zeros(), zeros()
+        # fft_engine: packed bins of the last `latency` clocks, a ring indexed by cycle
+        self.engine_pipe = zeros(self.latency, 4)
+        self._result = None
+        # output registers
+        self.uo_out, self.uio_out, self.uio_oe = zeros(), zeros(), zeros()
+        self.cycle = 0
+
+    @property
+    def addr(self):
+        return self.counter
+
+    @property
+    def engine_out(self):
+        """fft_engine's output ports as packed bins, shape (lanes, 4)."""
+        return self.engine_pipe[:, (self.cycle + 1) % self.latency]
+
+    def _engine_result(self):
+        # The read bank is the one not being loaded; it only changes when the banks swap
+        if self._result is None:
+            samples = self.mem[np.arange(self.lanes), 1 - self.load_bank]
+            bins = fft_engine(mem_transform(samples))
+            self._result = pack_output(bins[..., 0], bins[..., 1])
+        return self._result
+
+    def _pins(self, value, dtype=np.int64):
+        value = np.asarray(value, dtype=dtype)
+        return np.full(self.lanes, value) if value.ndim == 0 else value
+
+    def _commit(self, en, **registers):
+        """Clock `registers` in the lanes where `en` is set."""
+        if en.all():
+            self.__dict__.update(registers)
+        else:
+            for name, value in registers.items():
+                setattr(self, name, np.where(en, value, getattr(self, name)))
+
+    def step(self, ui_in, uio_in=0, ena=1, rst_n=1):
+        """
+        One rising edge with the given pins (scalars or one value per lane).
+
+        rst_n low resets asynchronously; the internal reset is released on
+        the second edge after it goes high, as by the synchronizer. Returns
+        (uo_out, uio_out, uio_oe), each of shape (lanes,).
+        """
+        ui_in, uio_in = self._pins(ui_in), self._pins(uio_in)
+        ena, rst_n = self._pins(ena, bool), self._pins(rst_n, bool)
+
+        # --- Combinational logic ahead of the edge ---
+        in0, in1, burst = (ui_in & 1) == 1, (ui_in & 2) == 2, (ui_in & 4) == 4
+        load_pulse = in0 & (burst | ~self.prev_in0)
+        output_pulse = in1 & (burst | ~self.prev_in1)
+        addr, oc, done = self.counter, self.output_counter, self.done
+        uo_out = segments(addr, oc, self.processing, done)
+        uio_oe = np.where(output_pulse & done, 0xFF, 0)
+        uio_out = self.engine_out[np.arange(self.lanes), oc]
+
+        # --- Registers ---
+        held = self.rst_sync2 | ~rst_n
+        active = ~held
+        en = active & ena
+
+        # fft_engine has no enable
+        self.cycle += 1
+        self.engine_pipe[:, self.cycle % self.latency] = np.where(active[:, None], self._engine_result(), 0)
+
+        # memory_ctrl
+        write = en & load_pulse
+        if write.any():
+            lanes = np.flatnonzero(write)
+            self.mem[lanes, self.load_bank[lanes], addr[lanes]] = uio_in[lanes]
+            swap = write & (addr == 3)
+            if swap.any():
+                self.load_bank = self.load_bank ^ swap
+                self._result = None
+
+        # io_ctrl and the FSM
+        start = load_pulse & (addr == 3)
+        busy, left = self.processing, self.processing_left
+        fall = self.processing_dly & ~busy
+        self._commit(
+            en,
+            prev_in0=in0, prev_in1=in1,
+            counter=(addr + load_pulse) & 3,
+            processing_dly=busy,
+            processing=start | (busy & (left != 0)),
+            processing_left=np.where(start, self.latency - 1, np.where(busy & (left != 0), left - 1, left)),
+            done=fall | (done & ~(output_pulse & (oc == 3))),
+            output_counter=np.where(fall, 0, np.where(output_pulse & done, (oc + 1) & 3, oc)),
+            uo_out=uo_out, uio_out=uio_out, uio_oe=uio_oe,
+        )
+
+        if held.any():
+            self._reset_lanes(held)
+        self.rst_sync2 = np.where(rst_n, self.rst_sync1, True)
+        self.rst_sync1 = ~rst_n
+        return self.uo_out, self.uio_out, self.uio_oe
+
+    def _reset_lanes(self, held):
+        for name in ("prev_in0", "prev_in1", "counter", "load_bank", "processing", "processing_dly",
+                     "done", "processing_left", "output_counter", "uo_out", "uio_out", "uio_oe"):
+            value = getattr(self, name)
+            setattr(self, name, np.where(held, np.zeros_like(value), value))
+        self.mem[held] = 0
+        self.engine_pipe[held] = 0
+        self._result = None
+
+    def run(self, ui_in, uio_in=0, ena=1, rst_n=1):
+        """
+        Clock a whole pin sequence: each argument has one row per clock, shape
+        (T,) or (T, lanes), or is a constant. Returns (uo_out, uio_out, uio_oe)
+        of shape (T, lanes).
+        """
+        steps = len(ui_in)
+        pins = [np.asarray(p, dtype=np.int64) for p in (ui_in, uio_in, ena, rst_n)]
+        pins = [np.broadcast_to(p, (steps,)) if p.ndim == 0 else p for p in pins]
+        out = np.empty((3, steps, self.lanes), dtype=np.int64)
+        for t in range(steps):
+            out[:, t] = self.step(*(p[t] for p in pins))
+        return tuple(out)
@@ -0,0 +1,192 @@
+"""
+Functional coverage for fft_engine and the top level, with coverage-directed stimulus.
+
+A coverpoint maps a batch of transactions to a boolean hit matrix of
+shape (N, bins), so a whole batch is sampled with a few NumPy operations.
+Coverage accumulates hit counts per bin and reports the holes;
+directed_frames() uses those holes to pick, from a pool of random
+candidate frames, the ones that hit the most bins not yet covered.
+
+The data coverpoints follow the fft_engine datapath: per lane wrap-around
+of every stage-1 and stage-2 butterfly output, the extreme codes on every
+input lane, the quadrant of every sample and the cross of the four sample
+signs. The top level adds FSM coverpoints sampled once per clock.
+"""
+
+import numpy as np
+
+from .fixed import wrap
+
+WRAP_BINS = ("none", "above", "below")
+QUADRANTS = ("++", "+-", "-+", "--")
+FSM_STATES = ("idle", "loading", "processing", "settling", "done")
+
+ENGINE_LANES = [f"{k}_{part}" for k in range(4) for part in ("real", "imag")]
+
+
+def _labels(prefixes, suffixes):
+    return [f"{p}:{s}" for p in prefixes for s in suffixes]
+
+
+def _wrap_hits(raw):
+    """One-hot WRAP_BINS of unwrapped 8-bit results (N, lanes), flattened to (N, lanes * 3)."""
+    hits = np.stack([(raw >= -128) & (raw <= 127), raw > 127, raw < -128], axis=-1)
+    return hits.reshape(len(raw), -1)
+
+
+def _corners(grid):
+    """Extreme and zero codes of an 8-bit lane restricted to multiples of `grid`."""
+    return (-128, 128 - grid, 0)
+
+
+def _stages(samples):
+    """Unwrapped stage-1 and stage-2 results of fft_engine.sv, each (N, 8) in ENGINE_LANES order."""
+    x = np.asarray(samples, dtype=np.int64).reshape(-1, 4, 2)
+    in0, in1, in2, in3 = (x[:, k] for k in range(4))
+    # Stage 1, W0 = -1: (W * B) >>> 7 is exactly -B
+    s0p, s0n = in0 - in2, in0 + in2
+    s1p, s1n = in1 - in3, in1 + in3
+    stage1 = np.concatenate([s0p, s0n, s1p, s1n], axis=-1)
+    s0p, s0n, s1p, s1n = wrap(s0p), wrap(s0n), wrap(s1p), wrap(s1n)
+    # Stage 2: adder on the Pos outputs, W1 = -j on the Neg outputs ((W * B) >>> 7 = (B_i, -B_r))
+    rot = np.stack([s1n[:, 1], -s1n[:, 0]], axis=-1)
+    stage2 = np.concatenate([s0p + s1p, s0n + rot, s0p - s1p, s0n - rot], axis=-1)
+    return stage1, stage2
+
+
+def engine_points(grid=1):
+    """Bin labels of the data coverpoints, for samples on multiples of `grid`."""
+    return {
+        "stage1_wrap": _labels(["s0_pos_real", "s0_pos_imag", "s0_neg_real", "s0_neg_imag",
+                                "s1_pos_real", "s1_pos_imag", "s1_neg_real", "s1_neg_imag"], WRAP_BINS),
+        "stage2_wrap": _labels([f"out{lane}" for lane in ENGINE_LANES], WRAP_BINS),
+        "input_corner": _labels([f"in{lane}" for lane in ENGINE_LANES], _corners(grid)),
+        "quadrant": _labels([f"in{k}" for k in range(4)], QUADRANTS),
+        "sign_cross": [format(k, "04b").replace("0", "+").replace("1", "-") for k in range(16)],
+    }
+
+
+def engine_hits(samples, grid=1):
+    """Hit matrices of engine_points(grid) for frames of shape (N, 4, 2)."""
+    x = np.asarray(samples, dtype=np.int64).reshape(-1, 4, 2)
+    lanes = x.reshape(len(x), 8)
+    stage1, stage2 = _stages(x)
+    negative = x < 0
+    quadrant = negative[..., 0] * 2 + negative[..., 1]
+    signs = negative[..., 0] @ (1 << np.arange(3, -1, -1))
+    return {
+        "stage1_wrap": _wrap_hits(stage1),
+        "stage2_wrap": _wrap_hits(stage2),
+        "input_corner": (lanes[..., None] == np.array(_corners(grid))).reshape(len(x), -1),
+        "quadrant": (quadrant[..., None] == np.arange(4)).reshape(len(x), -1),
+        "sign_cross": signs[:, None] == np.arange(16),
+    }
+
+
+def fsm_points():
+    """Bin labels of the tt_um_FFT_engine control coverpoints."""
+    return {
+        "fsm_state": list(FSM_STATES),
+        "load_addr": [f"addr{k}" for k in range(4)],
+        "read_bin": [f"bin{k}" for k in range(4)],
+        "load_while_done": ["hit"],
+    }
+
+
+def fsm_hits(processing, processing_dly, done, addr, load_pulse, output_pulse, output_counter):
+    """
+    Hit matrices of fsm_points() from per-clock samples of the top_fft.sv control signals.
+
+    Every argument is a 1-D array with one entry per sampled clock.
+    """
+    processing, processing_dly, done, load_pulse, output_pulse = (
+        np.asarray(v, dtype=bool) for v in (processing, processing_dly, done, load_pulse, output_pulse))
+    addr, output_counter = np.asarray(addr), np.asarray(output_counter)
+    settling = processing_dly & ~processing
+    state = np.select(
+        [processing, settling, done, addr != 0],
+        [FSM_STATES.index("processing"), FSM_STATES.index("settling"),
+         FSM_STATES.index("done"), FSM_STATES.index("loading")],
+        FSM_STATES.index("idle"))
+    reading = output_pulse & done
+    return {
+        "fsm_state": state[:, None] == np.arange(len(FSM_STATES)),
+        "load_addr": load_pulse[:, None] & (addr[:, None] == np.arange(4)),
+        "read_bin": reading[:, None] & (output_counter[:, None] == np.arange(4)),
+        "load_while_done": (load_pulse & done)[:, None],
+    }
+
+
+class Coverage:
+    """Hit counts for a set of coverpoints, each a fixed list of bin labels."""
+
+    def __init__(self, points):
+        self.points = {name: list(labels) for name, labels in points.items()}
+        self.counts = {name: np.zeros(len(labels), dtype=np.int64) for name, labels in self.points.items()}
+
+    def sample(self, hits):
+        """Accumulate hit matrices for any subset of the coverpoints."""
+        for name, matrix in hits.items():
+            self.counts[name] += np.asarray(matrix, dtype=np.int64).sum(axis=0)
+
+    def unhit(self, names=None):
+        """Boolean mask over the concatenated bins of `names` (default: all coverpoints) not hit yet."""
+        names = self.points if names is None else names
+        return np.concatenate([self.counts[name] == 0 for name in names])
+
+    def holes(self):
+        return {name: [label for label, n in zip(self.points[name], self.counts[name]) if not n]
+                for name in self.points}
+
+    def covered(self):
+        """Fraction of all bins hit at least once."""
+        total = sum(len(labels) for labels in self.points.values())
+        return 1.0 - self.unhit().sum() / total
+
+    def report(self):
+        """{coverpoint: {"hit", "bins", "holes"}} for logs and JSON."""
+        holes = self.holes()
+        return {name: {"hit": int((self.counts[name] > 0).sum()), "bins": len(labels), "holes": holes[name]}
+                for name, labels in self.points.items()}
+
+
+def random_frames(rng, count, grid=1, corner_rate=0.25):
+    """
+    (count, 4, 2) frames of multiples of `grid` in [-128, 127].
+
+    Each lane is uniform over the grid, except that with probability
+    `corner_rate` it is replaced by one of the extreme or near-zero codes
+    that the wrap and corner bins need.
+    """
+    codes = np.arange(-128, 128, grid)
+    frames = rng.choice(codes, size=(count, 4, 2))
+    special = np.array([-128, -128 + grid, -grid, 0, grid, 128 - 2 * grid, 128 - grid])
+    corner = rng.random(frames.shape) < corner_rate
+    frames[corner] = rng.choice(special, size=int(corner.sum()))
+    return frames
+
+
+def directed_frames(coverage, rng, count, grid=1, candidates=256):
+    """
+    Pick `count` frames that greedily maximise the newly hit data bins of `coverage`.
+
+    Candidates come from random_frames(); each pick takes the candidate
+    hitting the most bins that neither `coverage` nor an earlier pick has
+    hit, and falls back to the next random candidate once no candidate adds
+    anything. `coverage` itself is not updated: sample the frames after the
+    DUT has checked them.
+    """
+    names = list(engine_points(grid))
+    pool = random_frames(rng, candidates, grid)
+    pool_hits = np.concatenate([engine_hits(pool, grid)[name] for name in names], axis=1)
+    unhit = coverage.unhit(names)
+    chosen = np.empty((count, 4, 2), dtype=np.int64)
+    for k in range(count):
+        gain = (pool_hits & unhit).sum(axis=1)
+        best = int(np.argmax(gain)) if gain.any() else k % candidates
+        chosen[k] = pool[best]
+        unhit &= ~pool_hits[best]
+        # Replace the used candidate so the pool never repeats a frame
+        pool[best] = random_frames(rng, 1, grid)[0]
+        pool_hits[best] = np.concatenate([engine_hits(pool[best:best + 1], grid)[name] for name in names], axis=1)[0]
+    return chosen
@@ -0,0 +1,65 @@
+"""Vectorized model of src/fft_engine.sv."""
+
+import numpy as np
+
+from .butterfly import butterfly
+from .fixed import wrap
+
+# Twiddle factors used in the DUT (Q1.7 format: -128 represents -1.0)
+W0 = (-128, 0)  # -1
+W1 = (0, -128)  # -j
+
+
+def fft_engine(samples):
+    """
+    Bit-accurate model of the 4-point fft_engine DUT.
+
+    `samples` has shape (..., 4, 2): four complex inputs per frame as
+    (real, imag) pairs. Returns the registered outputs out0..out3 in the
+    same layout.
+    """
+    x = np.asarray(samples, dtype=np.int64)
+    in0, in1, in2, in3 = (x[..., k, :] for k in range(4))
+
+    # --- Stage 1 ---
+    # bfly_stage1_0: A=in0, B=in2, W=W0
+    s0p_r, s0p_i, s0n_r, s0n_i = butterfly(in0[..., 0], in0[..., 1],
+                                           in2[..., 0], in2[..., 1], *W0)
+    # bfly_stage1_1: A=in1, B=in3, W=W0
+    s1p_r, s1p_i, s1n_r, s1n_i = butterfly(in1[..., 0], in1[..., 1],
+                                           in3[..., 0], in3[..., 1], *W0)
+
+    # --- Stage 2 ---
+    out = np.empty(x.shape, dtype=np.int64)
+    # First butterfly (no multiplication) on the Pos outputs
+    out[..., 0, 0] = wrap(s0p_r + s1p_r)
+    out[..., 0, 1] = wrap(s0p_i + s1p_i)
+    out[..., 2, 0] = wrap(s0p_r - s1p_r)
+    out[..., 2, 1] = wrap(s0p_i - s1p_i)
+    # Second butterfly (W=-j) on the Neg outputs
+    (out[..., 1, 0], out[..., 1, 1],
+     out[..., 3, 0], out[..., 3, 1]) = butterfly(s0n_r, s0n_i, s1n_r, s1n_i, *W1)
+    return out
+
+
+def fft_engine_radix4(samples):
+    """
+    Model of the multiplierless RADIX4=1 fft_engine: one stage of adds and subtracts.
+
+    Written from the RTL's equations rather than from fft_engine(), so the
+    two can be checked against each other; both must agree bit for bit.
+    """
+    x = np.asarray(samples, dtype=np.int64)
+    in0, in1, in2, in3 = (x[..., k, :] for k in range(4))
+    d02, s02 = wrap(in0 - in2), wrap(in0 + in2)
+    d13, s13 = wrap(in1 - in3), wrap(in1 + in3)
+
+    out = np.empty(x.shape, dtype=np.int64)
+    out[..., 0, :] = wrap(d02 + d13)
+    out[..., 2, :] = wrap(d02 - d13)
+    # -j * s13 swaps real and imag and negates the new imag part
+    out[..., 1, 0] = wrap(s02[..., 0] + s13[..., 1])
+    out[..., 1, 1] = wrap(s02[..., 1] - s13[..., 0])
+    out[..., 3, 0] = wrap(s02[..., 0] - s13[..., 1])
+    out[..., 3, 1] = wrap(s02[..., 1] + s13[..., 0])
+    return out
@@ -0,0 +1,48 @@
+"""Fixed-point helpers shared by the reference models."""
+
+import numpy as np
+
+
+def wrap(x, width=8):
+    """
+    Wrap integers to the signed `width`-bit range as 2's complement.
+
+    Plain Python ints stay Python ints so per-signal conversions in the
+    testbenches do not pay NumPy's scalar overhead.
+    """
+    half = 1 << (width - 1)
+    if isinstance(x, int):
+        return ((x + half) & ((1 << width) - 1)) - half
+    return ((np.asarray(x, dtype=np.int64) + half) & ((1 << width) - 1)) - half
+
+
+def wrap8(x):
+    """Wrap integers to the signed 8-bit range [-128, 127]."""
+    return wrap(x, 8)
+
+
+def signed(val, bits):
+    """Convert unsigned values read from the simulator to signed integers."""
+    return wrap(val, bits)
+
+
+def pack_bytes(*lanes):
+    """
+    Concatenate signed 8-bit lanes into one unsigned integer, first lane in the MSBs.
+
+    Eight lanes fill the full 64 bits, so the result is returned as uint64.
+    """
+    packed = np.zeros(np.broadcast(*lanes).shape, dtype=np.uint64)
+    for lane in lanes:
+        packed = (packed << np.uint64(8)) | (np.asarray(lane, dtype=np.int64) & 0xFF).astype(np.uint64)
+    return packed
+
+
+def unpack_bytes(packed, lanes=8):
+    """
+    Split packed words into `lanes` signed 8-bit lanes, first lane from the MSBs.
+
+    The inverse of pack_bytes: returns an (N, lanes) int8 array for N words.
+    """
+    words = np.asarray(packed, dtype=np.uint64).reshape(-1).astype(">u8")
+    return words.view(np.int8).reshape(-1, 8)[:, 8 - lanes:]
@@ -0,0 +1,73 @@
+"""
+$readmemh stimulus and expected-response files for the self-checking harnesses.
+
+The *_selfcheck_tb.sv harnesses replay these files entirely inside the
+simulator: one hex word per line, the first record byte in the most
+significant position (sample 0 / bin 0 first, like the record layout in
+vectors.py). Records come from the golden vector store, so the files are
+the same vectors the cocotb tests check.
+
+    python -m fft_model.memh fft_engine 65536 --out sim_build/selfcheck
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from .vectors import golden_vectors
+
+# (stimulus field, expected field) of the golden records for each harness
+FIELDS = {
+    "fft_engine": ("inputs", "outputs"),
+    "top_fft": ("uio_in", "uio_out"),
+}
+
+# File names the harnesses read from their working directory
+STIM_FILE = "selfcheck_stim.memh"
+EXPECT_FILE = "selfcheck_expect.memh"
+
+# Vectors per file; must match DEPTH in the *_selfcheck_tb.sv harnesses
+DEPTH = 1 << 16
+
+_HEX = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+
+def write_memh(path, words):
+    """Write (N, W) bytes as N hex words of W bytes, first byte most significant."""
+    words = np.asarray(words).view(np.uint8).reshape(len(words), -1)
+    width = words.shape[1]
+    lines = np.empty((len(words), 2 * width + 1), dtype=np.uint8)
+    lines[:, 0:-1:2] = _HEX[words >> 4]
+    lines[:, 1:-1:2] = _HEX[words & 0xF]
+    lines[:, -1] = ord("\n")
+    Path(path).write_bytes(lines.tobytes())
+    return path
+
+
+def write_selfcheck(dut, records, directory="."):
+    """Write the stimulus and expected files for `records` of `dut` into `directory`; returns both paths."""
+    stim, expect = FIELDS[dut]
+    directory = Path(directory)
+    n = len(records)
+    return (write_memh(directory / STIM_FILE, records[stim].reshape(n, -1)),
+            write_memh(directory / EXPECT_FILE, records[expect].reshape(n, -1)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dut", choices=sorted(FIELDS))
+    parser.add_argument("count", type=int, help=f"vectors (at most {DEPTH}, the harness depth)")
+    parser.add_argument("--seed", type=int, help="stimulus seed (default: $GOLDEN_SEED or 0)")
+    parser.add_argument("--out", type=Path, default=Path("."), help="directory the simulator runs in")
+    args = parser.parse_args(argv)
+    if not 0 < args.count <= DEPTH:
+        parser.error(f"count must be between 1 and {DEPTH}")
+    args.out.mkdir(parents=True, exist_ok=True)
+    records = golden_vectors(args.dut, args.count, args.seed)
+    for path in write_selfcheck(args.dut, records, args.out):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Generic N-point radix-2 decimation-in-time model built from the RTL butterfly."""
+
+import numpy as np
+
+from .butterfly import butterfly
+from .fixed import wrap
+
+
+def twiddle_rom(n, width=8, overflow="wrap"):
+    """
+    Q1.(width-1) twiddle ROM for an N-point transform.
+
+    Returns W_N^k = exp(-2j*pi*k/N) for k < N/2 as an int64 array of shape
+    (N/2, 2) holding (real, imag). Entries are rounded to the nearest code;
+    +1.0 does not fit, so `overflow` selects what happens to it: "wrap"
+    (2's complement, +1.0 becomes -1.0 as in fft_engine.sv's W0 = 8'sh80)
+    or "saturate" (+1.0 becomes the largest positive code).
+    """
+    _check_points(n)
+    scale = 1 << (width - 1)
+    angle = 2 * np.pi * np.arange(n // 2) / n
+    raw = np.rint(np.stack([np.cos(angle), -np.sin(angle)], axis=-1) * scale).astype(np.int64)
+    if overflow == "wrap":
+        return wrap(raw, width)
+    if overflow == "saturate":
+        return np.clip(raw, -scale, scale - 1)
+    raise ValueError(f"overflow must be 'wrap' or 'saturate', not {overflow!r}")
+
+
+def bit_reverse(n):
+    """Bit-reversed index permutation of range(n), the DIT input order."""
+    bits = n.bit_length() - 1
+    k = np.arange(n)
+    rev = np.zeros(n, dtype=np.int64)
+    for b in range(bits):
+        rev |= ((k >> b) & 1) << (bits - 1 - b)
+    return rev
+
+
+def fft_radix2(samples, width=8, rom=None, adder_stages=None):
+    """
+    Bit-accurate iterative radix-2 DIT FFT.
+
+    `samples` has shape (..., N, 2) for any power-of-two N; the result has
+    the same layout in natural bin order. Every butterfly computes
+    A +/- ((W * B) >>> (width - 1)) with a 2*width-bit product and
+    `width`-bit wrap, exactly like butterfly.sv with WIDTH=width, using
+    twiddles from `rom` (default twiddle_rom(N, width)).
+
+    In the stages listed in `adder_stages` (0 = first stage) the W^0
+    butterflies are plain adders/subtractors with no multiplier. The
+    default, every stage but the first, mirrors fft_engine.sv: stage 1
+    multiplies by ROM[0] (1.0 wrapped to -1.0) while stage 2 adds. With
+    N=4 and width=8 the defaults reproduce fft_engine() exactly.
+    """
+    x = np.asarray(samples, dtype=np.int64)
+    n = x.shape[-2]
+    _check_points(n)
+    stages = n.bit_length() - 1
+    rom = twiddle_rom(n, width) if rom is None else np.asarray(rom, dtype=np.int64)
+    adder_stages = set(range(1, stages) if adder_stages is None else adder_stages)
+    batch = x.shape[:-2]
+
+    x = x[..., bit_reverse(n), :]
+    for stage in range(stages):
+        half = 1 << stage
+        blocks = x.reshape(*batch, n // (2 * half), 2, half, 2)
+        a, b = blocks[..., 0, :, :], blocks[..., 1, :, :]
+        w = rom[np.arange(half) * (n // (2 * half))]
+        pos_r, pos_i, neg_r, neg_i = butterfly(a[..., 0], a[..., 1], b[..., 0], b[..., 1],
+                                               w[:, 0], w[:, 1], width)
+        if stage in adder_stages:
+            total = wrap(a[..., 0, :] + b[..., 0, :], width)
+            diff = wrap(a[..., 0, :] - b[..., 0, :], width)
+            pos_r[..., 0], pos_i[..., 0] = total[..., 0], total[..., 1]
+            neg_r[..., 0], neg_i[..., 0] = diff[..., 0], diff[..., 1]
+        pos = np.stack([pos_r, pos_i], axis=-1)
+        neg = np.stack([neg_r, neg_i], axis=-1)
+        x = np.stack([pos, neg], axis=-3).reshape(*batch, n, 2)
+    return x
+
+
+def _check_points(n):
+    if n < 2 or n & (n - 1):
+        raise ValueError(f"N must be a power of two >= 2, not {n}")
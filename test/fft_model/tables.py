@@ -0,0 +1,64 @@
+"""Precomputed expected-output tables for exhaustive butterfly verification."""
+
+import numpy as np
+
+from .butterfly import butterfly
+from .cache import cached
+from .engine import W0, W1
+from .fixed import pack_bytes, wrap
+
+# The only twiddles fft_engine ever applies (0x80/0x00 and 0x00/0x80)
+SUPPORTED_TWIDDLES = {
+    "neg1": W0,
+    "negj": W1,
+}
+
+
+def sweep_inputs():
+    """
+    65536 (A_r, A_i, B_r, B_i) vectors covering every 8-bit (A, B) pair per lane.
+
+    With a single-component twiddle each butterfly output lane depends on
+    one A component and one B component. The vectors are chosen so that all
+    four (A, B) component pairings are bijections of the vector index, so a
+    single sweep is exhaustive for both lanes and both twiddles.
+    """
+    hi, lo = np.divmod(np.arange(1 << 16, dtype=np.int64), 256)
+    a_r = hi
+    a_i = hi + 2 * lo
+    b_r = lo
+    b_i = hi + lo
+    return wrap(np.stack([a_r, a_i, b_r, b_i], axis=-1), 8)
+
+
+def lane_coverage(vectors, twiddle):
+    """
+    Fraction of the 256x256 (A, B) byte pairs seen by each output lane.
+
+    Only meaningful for twiddles with a single non-zero component, which
+    covers both twiddles in SUPPORTED_TWIDDLES.
+    """
+    a_r, a_i, b_r, b_i = (np.asarray(v, dtype=np.int64) & 0xFF for v in vectors.T)
+    w_r, _ = twiddle
+    real_b, imag_b = (b_r, b_i) if w_r else (b_i, b_r)
+    return {
+        "real": np.unique(a_r * 256 + real_b).size / (1 << 16),
+        "imag": np.unique(a_i * 256 + imag_b).size / (1 << 16),
+    }
+
+
+def butterfly_table(twiddle):
+    """
+    Exhaustive sweep vectors and expected outputs for one twiddle, cached on disk.
+
+    Returns (vectors, expected): vectors has shape (65536, 4) holding
+    (A_r, A_i, B_r, B_i) and expected holds {Pos_r, Pos_i, Neg_r, Neg_i}
+    packed as bytes, MSB first.
+    """
+    def build():
+        vectors = sweep_inputs()
+        outputs = butterfly(vectors[:, 0], vectors[:, 1], vectors[:, 2], vectors[:, 3], *twiddle)
+        return vectors.astype(np.int16), pack_bytes(*outputs)
+
+    w_r, w_i = twiddle
+    return cached(f"butterfly_{w_r & 0xFF:02x}{w_i & 0xFF:02x}", build)
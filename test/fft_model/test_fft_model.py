@@ -0,0 +1,365 @@
+"""Equivalence tests: vectorized models vs. the scalar reference in scalar.py."""
+
+import asyncio
+import itertools
+
+import numpy as np
+import pytest
+
+import fft_model
+from fft_model import accuracy, chip, coverage, memh, scalar, stimulus, tables, vectors
+
+SEED = 298
+NUM_RANDOM = 5000
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(SEED)
+
+
+def test_wrap8_matches_scalar():
+    x = np.arange(-384, 384)
+    expected = [scalar.wrap8(int(v)) for v in x]
+    assert fft_model.wrap8(x).tolist() == expected
+
+
+def test_signed_conversion():
+    assert fft_model.signed(np.arange(256), 8).tolist() == list(range(128)) + list(range(-128, 0))
+    assert int(fft_model.signed(0xF, 4)) == -1
+
+
+@pytest.mark.parametrize("twiddle", [(-128, 0), (0, -128), (-1, 0), (0, -1)])
+def test_butterfly_fixed_twiddles(twiddle):
+    # All 256x256 (A, B) pairs on the real lane, shuffled pairs on the imag lane
+    a, b = np.divmod(np.arange(1 << 16), 256)
+    a, b = a - 128, b - 128
+    a_i, b_i = np.roll(a, 12345), np.roll(b, 777)
+    got = np.stack(fft_model.butterfly(a, a_i, b, b_i, *twiddle), axis=-1)
+    for k in range(0, len(a), 97):
+        (pr, pi), (nr, ni) = scalar.butterfly_ref_model(
+            int(a[k]), int(a_i[k]), int(b[k]), int(b_i[k]), *twiddle)
+        assert got[k].tolist() == [pr, pi, nr, ni]
+
+
+def test_butterfly_random_twiddles(rng):
+    v = rng.integers(-128, 128, size=(NUM_RANDOM, 6))
+    got = np.stack(fft_model.butterfly(*v.T), axis=-1)
+    for row, out in zip(v.tolist(), got.tolist()):
+        (pr, pi), (nr, ni) = scalar.butterfly_ref_model(*row)
+        assert out == [pr, pi, nr, ni]
+
+
+@pytest.mark.parametrize("width", [8, 12, 16])
+def test_butterfly_wide_words(rng, width):
+    # butterfly.sv for any WIDTH: a 2*WIDTH-bit product register, then the shift and a WIDTH-bit sum
+    lo, hi = -(1 << (width - 1)), (1 << (width - 1)) - 1
+    corners = np.array(list(itertools.product([lo, hi, 0, -1], repeat=6)))
+    v = np.concatenate([rng.integers(lo, hi + 1, size=(NUM_RANDOM, 6)), corners])
+    got = np.stack(fft_model.butterfly(*v.T, width=width), axis=-1)
+    for (a_r, a_i, b_r, b_i, w_r, w_i), out in zip(v.tolist(), got.tolist()):
+        pr = fft_model.wrap(w_r * b_r - w_i * b_i, 2 * width) >> (width - 1)
+        pi = fft_model.wrap(w_i * b_r + w_r * b_i, 2 * width) >> (width - 1)
+        expected = [fft_model.wrap(x, width) for x in (a_r + pr, a_i + pi, a_r - pr, a_i - pi)]
+        assert out == expected
+
+
+def test_butterfly_split_after_multiply():
+    # fft_engine's PIPE_STAGES >= 2 registers W * B from a butterfly with A = 0 and adds A afterwards
+    a, b = np.divmod(np.arange(1 << 16), 256)
+    a, b = a - 128, b - 128
+    a_i, b_i = np.roll(a, 4321), np.roll(b, 99)
+    for twiddle in [(-128, 0), (0, -128)]:
+        pr, pi, nr, ni = fft_model.butterfly(a, a_i, b, b_i, *twiddle)
+        tr, ti, _, _ = fft_model.butterfly(0, 0, b, b_i, *twiddle)
+        assert np.array_equal(pr, fft_model.wrap(a + tr)) and np.array_equal(pi, fft_model.wrap(a_i + ti))
+        assert np.array_equal(nr, fft_model.wrap(a - tr)) and np.array_equal(ni, fft_model.wrap(a_i - ti))
+
+
+def test_fft_engine_matches_scalar(rng):
+    frames = rng.integers(-128, 128, size=(NUM_RANDOM, 4, 2))
+    corners = np.array([np.full((4, 2), -128), np.full((4, 2), 127), np.zeros((4, 2), int)])
+    frames = np.concatenate([frames, corners])
+    got = fft_model.fft_engine(frames)
+    assert got.shape == frames.shape
+    for frame, out in zip(frames.tolist(), got.tolist()):
+        expected = scalar.fft_engine_ref_model(*[tuple(s) for s in frame])
+        assert [tuple(o) for o in out] == expected
+
+
+def test_fft_engine_single_frame():
+    frame = [(10, 20), (-30, -40), (50, -60), (-70, 80)]
+    expected = scalar.fft_engine_ref_model(*frame)
+    assert [tuple(o) for o in fft_model.fft_engine(frame).tolist()] == expected
+
+
+def test_twiddle_rom_matches_rtl_constants():
+    assert [tuple(w) for w in fft_model.twiddle_rom(4).tolist()] == [fft_model.W0, fft_model.W1]
+    assert fft_model.twiddle_rom(4, overflow="saturate").tolist() == [[127, 0], [0, -128]]
+
+
+def test_radix2_collapses_to_fft_engine(rng):
+    frames = rng.integers(-128, 128, size=(NUM_RANDOM, 4, 2))
+    corners = np.array([np.full((4, 2), -128), np.full((4, 2), 127), np.zeros((4, 2), int)])
+    frames = np.concatenate([frames, corners])
+    assert np.array_equal(fft_model.fft_radix2(frames), fft_model.fft_engine(frames))
+
+
+@pytest.mark.parametrize("n", [2, 8, 16, 64])
+def test_radix2_tracks_numpy_fft(rng, n):
+    # Exact +1.0 handling and a wide word: only twiddle rounding and truncation remain
+    width = 16
+    frames = rng.integers(-(1 << 15) // n, (1 << 15) // n, size=(200, n, 2))
+    got = fft_model.fft_radix2(frames, width, fft_model.twiddle_rom(n, width, "saturate"),
+                               adder_stages=range(n.bit_length() - 1))
+    expected = np.fft.fft(frames[..., 0] + 1j * frames[..., 1])
+    error = np.abs(got[..., 0] + 1j * got[..., 1] - expected)
+    assert error.max() <= 2 * n
+
+
+def test_radix2_rejects_non_power_of_two():
+    with pytest.raises(ValueError):
+        fft_model.fft_radix2(np.zeros((6, 2), dtype=int))
+
+
+def test_pack_and_mem_transform_exhaustive():
+    data = np.arange(256)
+    assert fft_model.mem_transform(data).tolist() == [list(scalar.model_mem_transform(d)) for d in range(256)]
+    r, i = np.divmod(np.arange(1 << 16), 256)
+    r, i = r - 128, i - 128
+    packed = fft_model.pack_input(r, i)
+    for k in range(0, len(r), 61):
+        assert packed[k] == scalar.pack_input(int(r[k]), int(i[k]))
+        assert packed[k] == scalar.pack_output(int(r[k]), int(i[k]))
+
+
+def test_top_fft_matches_scalar(rng):
+    frames = rng.integers(-128, 128, size=(NUM_RANDOM, 4, 2))
+    got = fft_model.top_fft(frames)
+    assert got.shape == (NUM_RANDOM, 4)
+    for frame, out in zip(frames.tolist(), got.tolist()):
+        assert out == scalar.top_fft_ref_model([tuple(s) for s in frame])
+
+
+@pytest.mark.parametrize("name", sorted(tables.SUPPORTED_TWIDDLES))
+def test_sweep_is_exhaustive_per_lane(name):
+    vectors = tables.sweep_inputs()
+    assert tables.lane_coverage(vectors, tables.SUPPORTED_TWIDDLES[name]) == {"real": 1.0, "imag": 1.0}
+
+
+def test_butterfly_table_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("FFT_MODEL_CACHE", str(tmp_path))
+    vectors, expected = tables.butterfly_table(fft_model.W1)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+    again_vectors, again_expected = tables.butterfly_table(fft_model.W1)
+    assert np.array_equal(vectors, again_vectors) and np.array_equal(expected, again_expected)
+
+    for k in range(0, len(vectors), 101):
+        a_r, a_i, b_r, b_i = (int(v) for v in vectors[k])
+        (pr, pi), (nr, ni) = scalar.butterfly_ref_model(a_r, a_i, b_r, b_i, *fft_model.W1)
+        packed = ((pr & 0xFF) << 24) | ((pi & 0xFF) << 16) | ((nr & 0xFF) << 8) | (ni & 0xFF)
+        assert expected[k] == packed
+
+
+def test_coverage_stages_wrap_to_fft_engine(rng):
+    frames = rng.integers(-128, 128, size=(NUM_RANDOM, 4, 2))
+    _, stage2 = coverage._stages(frames)
+    assert np.array_equal(fft_model.wrap(stage2), fft_model.fft_engine(frames).reshape(-1, 8))
+
+
+@pytest.mark.parametrize("grid", [1, 16])
+def test_directed_stimulus_closes_before_blind_random(grid):
+    directed = coverage.Coverage(coverage.engine_points(grid))
+    gen = np.random.default_rng(SEED)
+    frames = 0
+    while directed.covered() < 1.0:
+        batch = coverage.directed_frames(directed, gen, 8, grid)
+        directed.sample(coverage.engine_hits(batch, grid))
+        frames += len(batch)
+        assert frames <= 64, f"no closure after {frames} directed frames: {directed.holes()}"
+
+    blind = coverage.Coverage(coverage.engine_points(grid))
+    uniform = np.random.default_rng(SEED).choice(np.arange(-128, 128, grid), size=(4 * frames, 4, 2))
+    blind.sample(coverage.engine_hits(uniform, grid))
+    assert blind.covered() < 1.0
+
+
+def test_fsm_coverage_from_trace():
+    cov = coverage.Coverage(coverage.fsm_points())
+    # Four loads, processing, settling, done, four reads with a reload of sample 0 during the second
+    cov.sample(coverage.fsm_hits(
+        processing=    [0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
+        processing_dly=[0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+        done=          [0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1],
+        addr=          [0, 0, 1, 2, 3, 0, 0, 0, 0, 0, 1, 1],
+        load_pulse=    [0, 1, 1, 1, 1, 0, 0, 0, 0, 1, 0, 0],
+        output_pulse=  [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+        output_counter=[0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 2, 3],
+    ))
+    assert cov.covered() == 1.0, cov.holes()
+
+
+def test_stimulus_batches_are_prefix_stable():
+    long = stimulus.frame_batch(SEED, 1000, 16, "test_x")
+    assert np.array_equal(stimulus.frame_batch(SEED, 37, 16, "test_x"), long[:37])
+    assert np.array_equal(stimulus.replay_frame(SEED, 999, 16, "test_x"), long[999])
+    assert not np.array_equal(stimulus.frame_batch(SEED, 1000, 16, "test_y"), long)
+    assert set(np.unique(long)) <= set(range(-128, 128, 16))
+
+
+def test_stimulus_replays_one_frame():
+    full = stimulus.FrameStimulus(SEED, 20, name="test_x")
+    replay = stimulus.FrameStimulus(SEED, 20, name="test_x", index=13)
+    assert list(replay) == [list(full)[13]]
+    with pytest.raises(ValueError):
+        stimulus.FrameStimulus(SEED, 20, index=20)
+
+
+def test_golden_vectors_match_models(tmp_path, monkeypatch):
+    monkeypatch.setenv("FFT_MODEL_CACHE", str(tmp_path))
+    engine = vectors.golden_vectors("fft_engine", 1000)
+    assert isinstance(engine.base, np.memmap) or isinstance(engine, np.memmap)
+    expected = fft_model.pack_bytes(*fft_model.fft_engine(np.asarray(engine["inputs"])).reshape(-1, 8).T)
+    assert np.array_equal(vectors.packed_outputs(engine), expected)
+    assert np.array_equal(fft_model.unpack_bytes(vectors.packed_inputs(engine)), engine["inputs"].reshape(-1, 8))
+
+    for row in vectors.golden_vectors("butterfly", 500).view("i1").reshape(-1, 10).tolist():
+        assert [tuple(row[6:8]), tuple(row[8:10])] == list(scalar.butterfly_ref_model(*row[:6]))
+
+    top = vectors.golden_vectors("top_fft", 500)
+    for uio_in, uio_out in zip(top["uio_in"].tolist(), top["uio_out"].tolist()):
+        raw = [(int(fft_model.signed(x & 0xF0, 8)), int(fft_model.signed((x & 0x0F) << 4, 8))) for x in uio_in]
+        assert list(uio_out) == scalar.top_fft_ref_model(raw)
+
+
+def test_unpack_bytes_inverts_pack_bytes(rng):
+    lanes = rng.integers(-128, 128, size=(NUM_RANDOM, 8))
+    packed = fft_model.pack_bytes(*lanes.T)
+    assert np.array_equal(fft_model.unpack_bytes(packed), lanes)
+    assert fft_model.unpack_bytes(int(packed[0])).tolist() == [lanes[0].tolist()]
+    assert fft_model.unpack_bytes(fft_model.pack_bytes(*lanes[:, :2].T), 2).tolist() == lanes[:, :2].tolist()
+
+
+def test_golden_store_grows_prefix_stable(tmp_path, monkeypatch):
+    monkeypatch.setenv("FFT_MODEL_CACHE", str(tmp_path))
+    monkeypatch.setattr(vectors, "CHUNK", 64)
+    short = np.array(vectors.golden_vectors("fft_engine", 100))
+    longer = vectors.golden_vectors("fft_engine", 300)
+    assert len(longer) == 300 and np.array_equal(longer[:100], short)
+    assert len(list(tmp_path.glob("vectors_fft_engine_*.npy"))) == 1
+    assert not np.array_equal(vectors.golden_vectors("fft_engine", 100, seed=1), short)
+
+
+def test_selfcheck_memh_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("FFT_MODEL_CACHE", str(tmp_path))
+    records = vectors.golden_vectors("fft_engine", 300)
+    stim, expect = memh.write_selfcheck("fft_engine", records, tmp_path)
+    assert [int(line, 16) for line in expect.read_text().split()] == vectors.packed_outputs(records).tolist()
+    first = stim.read_text().split()[0]
+    assert [int(first[k:k + 2], 16) for k in range(0, 16, 2)] == records["inputs"][0].view(np.uint8).ravel().tolist()
+
+    top = vectors.golden_vectors("top_fft", 10)
+    stim, expect = memh.write_selfcheck("top_fft", top, tmp_path)
+    assert [int(line, 16) for line in expect.read_text().split()] == \
+        [int.from_bytes(bytes(row), "big") for row in top["uio_out"].tolist()]
+
+
+def test_datapath_matrix_reproduces_engine_without_overflow(rng):
+    frames = rng.integers(-32, 32, size=(NUM_RANDOM, 4, 2))
+    got = fft_model.fft_engine(frames)
+    expected = (frames[..., 0] + 1j * frames[..., 1]) @ accuracy.datapath_matrix().T
+    assert np.array_equal(got[..., 0] + 1j * got[..., 1], expected)
+
+
+def test_accuracy_chunks_merge_and_flag_overflow():
+    total = accuracy.AccuracyStats()
+    for chunk in range(3):
+        total += accuracy.sweep_chunk("noise", 0.125, "engine", SEED, chunk, 1000)
+    assert total.frames == 3000
+    summary = total.summary()
+    assert all(m["overflow_rate"] == 0 and m["datapath_sqnr_db"] > 20 for m in summary.values())
+    # The 4-bit top-level path loses accuracy, full-scale inputs wrap
+    top = accuracy.sweep_chunk("noise", 0.125, "top", SEED, 0, 1000).summary()
+    assert all(top[k]["datapath_sqnr_db"] < summary[k]["datapath_sqnr_db"] for k in range(4))
+    full = accuracy.sweep_chunk("full_scale", 1.0, "engine", SEED, 0, 1000).summary()
+    assert all(m["overflow_rate"] > 0 for m in full.values())
+
+
+def test_radix4_engine_matches_butterfly_engine(rng):
+    frames = rng.integers(-128, 128, size=(20 * NUM_RANDOM, 4, 2))
+    assert np.array_equal(fft_model.fft_engine_radix4(frames), fft_model.fft_engine(frames))
+    # Every frame built from the wrap corners, 5^8 of them
+    corners = np.array([-128, -1, 0, 1, 127])
+    grid = np.stack(np.meshgrid(*[corners] * 8, indexing="ij"), axis=-1).reshape(-1, 4, 2)
+    assert np.array_equal(fft_model.fft_engine_radix4(grid), fft_model.fft_engine(grid))
+
+
+def _toggle_schedule(packed):
+    """Pins for the switch protocol: four load toggles, a pause, then four output toggles."""
+    ui_in, uio_in = [], []
+    for sample in packed.T:
+        ui_in += [chip.LOAD, 0]
+        uio_in += [sample, sample]
+    ui_in += [0] * 6 + [chip.READ, 0] * 4
+    uio_in += [np.zeros_like(packed[:, 0])] * 14
+    return np.array(ui_in), np.array(uio_in)
+
+
+@pytest.mark.parametrize("latency", [1, 2, 4])
+def test_chip_model_toggle_protocol(rng, latency):
+    frames = rng.choice(np.arange(-128, 128, 16), size=(256, 4, 2))
+    packed = fft_model.pack_input(frames[..., 0], frames[..., 1])
+    ui_in, uio_in = _toggle_schedule(packed)
+    model = chip.ChipModel(lanes=len(frames), latency=latency)
+    uo_out, uio_out, uio_oe = model.run(ui_in, uio_in)
+
+    driven = uio_oe.T == 0xFF
+    assert (driven.sum(axis=1) == 4).all()
+    assert np.array_equal(uio_out.T[driven].reshape(-1, 4), fft_model.top_fft(frames))
+    # Samples 1-3, blank while sample 3 is pending, C for the engine latency, then bins 5, 6, 7, 5
+    codes = [k for k, _ in itertools.groupby(uo_out[:, 0].tolist())]
+    assert codes == [chip.D_1, chip.D_2, chip.D_3, 0x00, chip.D_C, chip.D_1,
+                     chip.D_5, chip.D_6, chip.D_7, chip.D_5, chip.D_1]
+    assert (uo_out == uo_out[:, :1]).all()
+
+
+def test_chip_model_reset_per_lane():
+    model = chip.ChipModel(lanes=2)
+    for _ in range(3):
+        model.step(chip.BURST | chip.LOAD, 0x11)
+    assert model.addr.tolist() == [3, 3]
+    model.step(0, rst_n=[True, False])
+    assert model.addr.tolist() == [3, 0]
+    # The synchronizer holds the internal reset for two edges after rst_n rises
+    model.step(chip.BURST | chip.LOAD, 0x11)
+    model.step(chip.BURST | chip.LOAD, 0x11)
+    assert model.addr.tolist() == [1, 0] and model.load_bank.tolist() == [1, 0]
+    model.step(chip.BURST | chip.LOAD, 0x11)
+    assert model.addr.tolist() == [2, 1]
+
+
+def test_fft_device_on_model_board(rng):
+    from fft_host import FFTDevice, ModelBoard
+
+    frames = rng.choice(np.arange(-128, 128, 16), size=(200, 4, 2))
+    device = FFTDevice(ModelBoard(latency=2))
+    asyncio.run(device.reset())
+    got = asyncio.run(device.transform_many(frames, raw=True))
+    assert np.array_equal(got, fft_model.top_fft(frames))
+    assert device.stats.cycles_per_frame < 10
+
+
+@pytest.mark.parametrize("latency", [1, 2, 5])
+def test_burst_stream_schedule(rng, latency):
+    frames = rng.choice(np.arange(-128, 128, 16), size=(300, 4, 2))
+    packed = fft_model.pack_input(frames[..., 0], frames[..., 1])
+    ui_in, uio_in = chip.burst_stream(packed, latency)
+    uo_out, uio_out, uio_oe = chip.ChipModel(latency=latency).run(ui_in, uio_in)
+    driven = uio_oe[:, 0] == 0xFF
+    assert np.array_equal(uio_out[driven, 0].reshape(-1, 4), fft_model.top_fft(frames))
+    assert len(ui_in) == 4 + len(frames) * (5 + max(4, latency + 2))
+    # Mid-stream frame periods all show the same display sequence; the last one loads nothing
+    period = (len(ui_in) - 4) // len(frames)
+    codes = uo_out[4:, 0].reshape(len(frames), period)
+    assert (codes[1:-1] == codes[1]).all()
+    assert chip.D_C in codes[1] and chip.D_7 in codes[1]
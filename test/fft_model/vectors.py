@@ -0,0 +1,119 @@
+"""
+Memory-mapped golden vector store.
+
+Inputs and bit-exact expected outputs are generated once per DUT by the
+reference models and kept as fixed-width records in a .npy file under the
+model cache, named after the DUT, the stimulus seed and model_version(),
+so a model change produces a new file. The seed defaults to $GOLDEN_SEED
+(0), so every run shares one store. Testbenches open the file with
+np.load(mmap_mode="r") and slice records straight out of the page cache:
+a large regression starts without running the models at all.
+
+    python -m fft_model.vectors fft_engine 10000000   # pre-generate
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from .butterfly import butterfly
+from .cache import cache_dir, model_version
+from .engine import fft_engine
+from .top import mem_transform, top_fft
+
+# Record layouts. fft_engine samples are stored in port order (in0_real, in0_imag, ...),
+# so 8 bytes of a record read as a big-endian uint64 are the packed frame.
+RECORDS = {
+    "butterfly": np.dtype([("a", "i1", 2), ("b", "i1", 2), ("w", "i1", 2), ("pos", "i1", 2), ("neg", "i1", 2)]),
+    "fft_engine": np.dtype([("inputs", "i1", (4, 2)), ("outputs", "i1", (4, 2))]),
+    "top_fft": np.dtype([("uio_in", "u1", 4), ("uio_out", "u1", 4)]),
+}
+
+# Records generated per independent random stream; a longer file starts with the same records
+CHUNK = 1 << 20
+
+
+def _fill(dut, records, rng):
+    n = len(records)
+    if dut == "butterfly":
+        x = rng.integers(-128, 128, size=(n, 6))
+        pos_r, pos_i, neg_r, neg_i = butterfly(*x.T)
+        records["a"], records["b"], records["w"] = x[:, 0:2], x[:, 2:4], x[:, 4:6]
+        records["pos"] = np.stack([pos_r, pos_i], axis=-1)
+        records["neg"] = np.stack([neg_r, neg_i], axis=-1)
+    elif dut == "fft_engine":
+        x = rng.integers(-128, 128, size=(n, 4, 2))
+        records["inputs"] = x
+        records["outputs"] = fft_engine(x)
+    else:
+        uio_in = rng.integers(0, 256, size=(n, 4))
+        records["uio_in"] = uio_in
+        records["uio_out"] = top_fft(mem_transform(uio_in))
+
+
+def _seed(seed):
+    return int(os.environ.get("GOLDEN_SEED", 0)) if seed is None else seed
+
+
+def vector_path(dut, seed=None):
+    seed = _seed(seed)
+    return cache_dir() / f"vectors_{dut}_s{seed}-{model_version()}.npy"
+
+
+def build(dut, count, seed=None):
+    """Generate `count` records for `dut` chunk by chunk into a new store file; returns its path."""
+    seed = _seed(seed)
+    if dut not in RECORDS:
+        raise ValueError(f"unknown DUT {dut!r}, expected one of {', '.join(RECORDS)}")
+    path = vector_path(dut, seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+    records = np.lib.format.open_memmap(tmp, mode="w+", dtype=RECORDS[dut], shape=(count,))
+    for chunk, start in enumerate(range(0, count, CHUNK)):
+        _fill(dut, records[start:start + CHUNK], np.random.default_rng([seed, chunk]))
+    records.flush()
+    del records
+    os.replace(tmp, path)
+    return path
+
+
+def golden_vectors(dut, count, seed=None):
+    """
+    The first `count` golden records for `dut`, memory-mapped read-only.
+
+    The store is (re)built when it is missing, belongs to another model
+    version or holds fewer than `count` records.
+    """
+    path = vector_path(dut, seed)
+    if path.exists():
+        records = np.load(path, mmap_mode="r")
+        if len(records) >= count:
+            return records[:count]
+        del records
+    return np.load(build(dut, count, seed), mmap_mode="r")
+
+
+def packed_inputs(records):
+    """fft_engine input frames packed as uint64 (sample 0 in the MSBs), a view of the records (no copy)."""
+    return records["inputs"].reshape(-1, 8).view(">u8")[:, 0]
+
+
+def packed_outputs(records):
+    """fft_engine expected outputs as packed uint64 frames, a view of the records (no copy)."""
+    return records["outputs"].reshape(-1, 8).view(">u8")[:, 0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("duts", nargs="+", choices=sorted(RECORDS), metavar="dut")
+    parser.add_argument("count", type=int, help="records per DUT")
+    parser.add_argument("--seed", type=int, help="stimulus seed (default: $GOLDEN_SEED or 0)")
+    args = parser.parse_args(argv)
+    for dut in args.duts:
+        records = golden_vectors(dut, args.count, args.seed)
+        print(f"{dut}: {len(records)} records of {records.dtype.itemsize} bytes in {vector_path(dut, args.seed)}")
+
+
+if __name__ == "__main__":
+    main()
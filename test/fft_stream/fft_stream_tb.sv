@@ -0,0 +1,75 @@
+`default_nettype none
+`timescale 1ns / 1ps
+
+module fft_stream_tb (
+    input  logic clk, rst,
+    input  logic in_valid,
+    output logic in_ready,
+    input  logic signed [7:0] in0_real, in0_imag,
+    input  logic signed [7:0] in1_real, in1_imag,
+    input  logic signed [7:0] in2_real, in2_imag,
+    input  logic signed [7:0] in3_real, in3_imag,
+    output logic out_valid,
+    input  logic out_ready,
+    output logic signed [7:0] out0_real, out0_imag,
+    output logic signed [7:0] out1_real, out1_imag,
+    output logic signed [7:0] out2_real, out2_imag,
+    output logic signed [7:0] out3_real, out3_imag
+);
+
+logic [7:0] current_test_id = 0;
+
+    // Clocks from an accepted frame to its result, and result FIFO entries, as built
+    wire [7:0] latency = dut.LATENCY;
+    wire [7:0] fifo_depth = dut.DEPTH;
+
+    // Dump signals
+    // Only dumps when given +VCD_PATH; +WAVE_SCOPE / +WAVE_DEPTH narrow the dump (see test/waves.py)
+    string vcd_name;
+    string wave_scope;
+    integer wave_depth;
+    initial begin
+        if ($value$plusargs("VCD_PATH=%s", vcd_name)) begin
+            if (!$value$plusargs("WAVE_SCOPE=%s", wave_scope))
+                wave_scope = "";
+            if (!$value$plusargs("WAVE_DEPTH=%d", wave_depth))
+                wave_depth = 0;
+            $dumpfile(vcd_name);
+            case (wave_scope)
+                "dut":   $dumpvars(wave_depth, dut);
+                default: $dumpvars(wave_depth, fft_stream_tb);
+            endcase
+        end
+    end
+
+    // Toggled by fft_tb.window to flush the dump before it cuts out a failure window
+    logic wave_flush = 0;
+    always @(wave_flush) $dumpflush;
+
+    // Instantiate DUT
+    fft_stream dut (
+        .clk(clk),
+        .rst(rst),
+        .in_valid(in_valid),
+        .in_ready(in_ready),
+        .in0_real(in0_real),
+        .in0_imag(in0_imag),
+        .in1_real(in1_real),
+        .in1_imag(in1_imag),
+        .in2_real(in2_real),
+        .in2_imag(in2_imag),
+        .in3_real(in3_real),
+        .in3_imag(in3_imag),
+        .out_valid(out_valid),
+        .out_ready(out_ready),
+        .out0_real(out0_real),
+        .out0_imag(out0_imag),
+        .out1_real(out1_real),
+        .out1_imag(out1_imag),
+        .out2_real(out2_real),
+        .out2_imag(out2_imag),
+        .out3_real(out3_real),
+        .out3_imag(out3_imag)
+    );
+
+endmodule
@@ -0,0 +1,25 @@
+"""Reusable cocotb verification components for the FFT engine testbenches."""
+
+from .board import SimBoard
+from .bus import BusAdapter
+from .coverage import SignalSampler
+from .handshake import Backpressure, StreamDriver, StreamMonitor
+from .lockstep import Lockstep
+from .perf import FrameMetrics, frame_metrics, metrics_path, record_vectors
+from .selfcheck import run_selfcheck
+from .stimulus import check_frames, frame_stimulus
+from .streaming import FrameDriver, FrameMonitor, Scoreboard, iter_rows
+from .window import cut_window, failure_window
+
+__all__ = [
+    "SimBoard",
+    "BusAdapter",
+    "SignalSampler",
+    "Backpressure", "StreamDriver", "StreamMonitor",
+    "Lockstep",
+    "FrameMetrics", "frame_metrics", "metrics_path", "record_vectors",
+    "run_selfcheck",
+    "check_frames", "frame_stimulus",
+    "FrameDriver", "FrameMonitor", "Scoreboard", "iter_rows",
+    "cut_window", "failure_window",
+]
@@ -0,0 +1,46 @@
+"""
+Per-clock signal sampler feeding the vectorized coverage model (fft_model.coverage).
+
+The sampler only appends integers to lists on each clock; the coverage
+bins are computed from the whole batch with NumPy when it is flushed.
+"""
+
+import cocotb
+import numpy as np
+from cocotb.triggers import ReadOnly, RisingEdge
+
+
+class SignalSampler:
+    """Records the value of each named signal under `scope` in the ReadOnly phase of every clock."""
+
+    def __init__(self, clk, scope, names):
+        self.clk = clk
+        self.signals = {name: getattr(scope, name) for name in names}
+        self.samples = {name: [] for name in names}
+        self._task = None
+
+    async def _sample(self):
+        edge = RisingEdge(self.clk)
+        settle = ReadOnly()
+        columns = [(self.samples[name], signal) for name, signal in self.signals.items()]
+        while True:
+            await settle
+            for column, signal in columns:
+                value = signal.value
+                column.append(int(value) if value.is_resolvable else 0)
+            await edge
+
+    def start(self):
+        self._task = cocotb.start_soon(self._sample())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    def flush(self):
+        """Return the samples since the last flush as {name: array} and start a new batch."""
+        batch = {name: np.array(column, dtype=np.int64) for name, column in self.samples.items()}
+        for column in self.samples.values():
+            column.clear()
+        return batch
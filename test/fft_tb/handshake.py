@@ -0,0 +1,105 @@
+"""
+Valid/ready bus driver, monitor and backpressure source.
+
+A transfer happens on a rising clock edge where both valid and ready are
+high. The components sample the handshake in the ReadOnly phase just
+before they move on to the next edge, which reads the same values under
+Icarus and Verilator. Monitored frames are queued packed like
+FrameMonitor's, so they plug into the same Scoreboard.
+"""
+
+import cocotb
+from cocotb.queue import Queue
+from cocotb.triggers import ReadOnly, RisingEdge
+
+from .streaming import iter_rows
+
+
+class StreamDriver:
+    """Drives rows onto `signals` with valid, holding each row until ready accepts it."""
+
+    def __init__(self, clk, valid, ready, signals):
+        self.clk = clk
+        self.valid = valid
+        self.ready = ready
+        self.signals = list(signals)
+        self.valid.value = 0
+
+    async def send(self, rows, idle=0.0, rng=None):
+        """
+        Transfer each row of `rows` (an (N, len(signals)) int array).
+
+        With `idle` > 0, valid is dropped for a cycle before a row with that
+        probability, drawn from the NumPy generator `rng`.
+        """
+        valid, ready, signals = self.valid, self.ready, self.signals
+        edge = RisingEdge(self.clk)
+        settle = ReadOnly()
+        for row in iter_rows(rows):
+            while idle and rng.random() < idle:
+                valid.value = 0
+                await edge
+            for signal, value in zip(signals, row):
+                signal.value = value
+            valid.value = 1
+            while True:
+                await settle
+                accepted = ready.value == 1
+                await edge
+                if accepted:
+                    break
+        valid.value = 0
+
+
+class StreamMonitor:
+    """Queues `signals` packed into one int on every transfer."""
+
+    def __init__(self, clk, valid, ready, signals, width=8):
+        self.clk = clk
+        self.valid = valid
+        self.ready = ready
+        self.signals = list(signals)
+        self.width = width
+        self.queue = Queue()
+        self.transfers = 0
+
+    async def sample(self, count):
+        """Queue the next `count` transfers."""
+        valid, ready, signals, width, queue = self.valid, self.ready, self.signals, self.width, self.queue
+        edge = RisingEdge(self.clk)
+        settle = ReadOnly()
+        while self.transfers < count:
+            await settle
+            if valid.value == 1 and ready.value == 1:
+                packed = 0
+                for signal in signals:
+                    packed = (packed << width) | signal.value.integer
+                queue.put_nowait(packed)
+                self.transfers += 1
+            await edge
+
+
+class Backpressure:
+    """Drives a ready signal low with probability `stall` on each clock until stopped."""
+
+    def __init__(self, clk, ready, stall=0.0, rng=None):
+        self.clk = clk
+        self.ready = ready
+        self.stall = stall
+        self.rng = rng
+        self._task = None
+
+    async def _drive(self):
+        ready, stall, rng = self.ready, self.stall, self.rng
+        edge = RisingEdge(self.clk)
+        while True:
+            ready.value = int(not (stall and rng.random() < stall))
+            await edge
+
+    def start(self):
+        self._task = cocotb.start_soon(self._drive())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
@@ -0,0 +1,71 @@
+"""
+Lockstep differential checker: fft_model.ChipModel clocked alongside the RTL.
+
+On every rising edge the checker feeds the pins the harness drives into
+the model and compares the model's registered outputs with the DUT's once
+they have settled. Start it while the harness is in reset or just after
+one, when the model's reset state matches the DUT.
+"""
+
+import cocotb
+from cocotb.triggers import ReadOnly, RisingEdge
+
+from fft_model.chip import ChipModel
+
+OUTPUTS = ("uo_out", "uio_out", "uio_oe")
+
+
+def _int(value):
+    return int(value) if value.is_resolvable else None
+
+
+class Lockstep:
+    """Clocks a ChipModel with the pins of the tt_um_FFT_engine harness `dut` and records mismatches."""
+
+    def __init__(self, dut, model=None, max_logged=10):
+        self.dut = dut
+        self.model = model or ChipModel(latency=dut.engine_latency.value.integer)
+        self.max_logged = max_logged
+        self.cycles = 0
+        self.mismatches = []
+        self._task = None
+
+    async def _check(self):
+        dut = self.dut
+        edge, settle = RisingEdge(dut.clk), ReadOnly()
+        pins = (dut.ui_in, dut.uio_in, dut.ena, dut.rst_n)
+        outputs = [getattr(dut, name) for name in OUTPUTS]
+        while True:
+            await edge
+            ui_in, uio_in, ena, rst_n = (_int(p.value) or 0 for p in pins)
+            await settle
+            # A reset asserted on this edge has already cleared the DUT's registers
+            rst_n &= _int(dut.rst_n.value) or 0
+            expected = self.model.step(ui_in, uio_in, ena, rst_n)
+            self.cycles += 1
+            for name, signal, want in zip(OUTPUTS, outputs, expected):
+                got = _int(signal.value)
+                if got != int(want[0]):
+                    self._mismatch(name, got, int(want[0]), ui_in, uio_in)
+
+    def _mismatch(self, name, got, want, ui_in, uio_in):
+        self.mismatches.append((self.cycles, name, got, want))
+        if len(self.mismatches) <= self.max_logged:
+            got = "X" if got is None else hex(got)
+            self.dut._log.error(f"Lockstep cycle {self.cycles}: {name} DUT={got}, model={hex(want)} "
+                                f"(ui_in={ui_in:#x}, uio_in={uio_in:#x})")
+
+    def start(self):
+        self._task = cocotb.start_soon(self._check())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    def check(self):
+        """Raise AssertionError if the DUT and the model ever disagreed."""
+        assert not self.mismatches, \
+            f"{len(self.mismatches)} lockstep mismatches in {self.cycles} cycles, first at cycle " \
+            f"{self.mismatches[0][0]}: {self.mismatches[0][1]} DUT={self.mismatches[0][2]}, " \
+            f"model={self.mismatches[0][3]}"
@@ -0,0 +1,187 @@
+"""
+Frame latency and throughput metrics for the tt_um_FFT_engine harness.
+
+FrameMetrics watches the top level once per clock and follows every frame
+through load, compute and readout:
+
+    load_to_done      last sample load edge -> done rising edge
+    done_to_readout   done rising edge -> first bin driven on uio_out
+    cycles_per_frame  first sample load edge -> last bin driven on uio_out
+
+All values are in clock cycles. When the design is built with
+-DPERF_COUNTERS, the RTL debug counters in top_fft.sv are read back and
+must agree with the cocotb measurement. Decorate a cocotb test with
+@frame_metrics to write its frames to $METRICS_DIR/<test>.json.
+
+record_vectors() keeps the number of vectors each test checked in
+$METRICS_DIR/vectors.json, for the benchmark suite (bench.py).
+"""
+
+import functools
+import json
+import os
+from collections import deque
+from pathlib import Path
+
+import cocotb
+from cocotb.result import TestSuccess
+from cocotb.triggers import ReadOnly, RisingEdge
+
+METRICS = ("load_to_done", "done_to_readout", "cycles_per_frame")
+
+
+def _bit(signal):
+    value = signal.value
+    return int(value) if value.is_resolvable else 0
+
+
+class FrameMetrics:
+    """Per-frame cycle counts of the top-level load / compute / readout flow."""
+
+    def __init__(self, dut):
+        self.dut = dut
+        self.top = dut.dut
+        self.rtl_counters = hasattr(self.top, "perf_load_to_done")
+        self.frames = []
+        self.errors = []
+        self._task = None
+        self._reset_state()
+
+    def _reset_state(self):
+        self.cycle = 0
+        self.loading = None          # frame whose samples are being loaded
+        self.computing = deque()     # frames fully loaded, waiting for done
+        self.reading = None          # frame whose bins are being read
+        self.prev_done = 0
+
+    def _record(self, frame):
+        frame["load_to_done"] = frame["done"] - frame["last_load"]
+        frame["done_to_readout"] = frame["first_bin"] - frame["done"]
+        frame["cycles_per_frame"] = frame["last_bin"] - frame["first_load"]
+        self.frames.append(frame)
+
+    def _check_rtl(self, name, counter, expected):
+        got = _bit(getattr(self.top, counter))
+        if got != expected:
+            self.errors.append(f"{counter}={got}, cocotb measured {name}={expected}")
+
+    async def _monitor(self):
+        top, dut = self.top, self.dut
+        edge = RisingEdge(dut.clk)
+        settle = ReadOnly()
+        while True:
+            await settle
+            if not _bit(dut.rst_n):
+                self._reset_state()
+                await edge
+                continue
+
+            # Registered values reflect the last edge, strobes describe the next one
+            now = self.cycle
+            done = _bit(top.done)
+            if done and not self.prev_done and self.computing:
+                frame = self.computing.popleft()
+                frame["done"] = now
+                self.reading = frame
+                if self.rtl_counters:
+                    self._check_rtl("load_to_done", "perf_load_to_done", now - frame["last_load"])
+            self.prev_done = done
+
+            if _bit(dut.uio_oe) and self.reading is not None:
+                frame = self.reading
+                frame["bins"] += 1
+                if frame["bins"] == 1:
+                    frame["first_bin"] = now
+                    if self.rtl_counters:
+                        self._check_rtl("done_to_readout", "perf_done_to_read", now - frame["done"])
+                if frame["bins"] == 4:
+                    frame["last_bin"] = now
+                    self._record(frame)
+                    self.reading = None
+
+            if _bit(top.load_pulse) and _bit(top.ena):
+                addr = _bit(top.addr)
+                if addr == 0 or self.loading is None:
+                    self.loading = {"first_load": now + 1, "bins": 0}
+                if addr == 3:
+                    self.loading["last_load"] = now + 1
+                    self.computing.append(self.loading)
+                    self.loading = None
+
+            await edge
+            self.cycle += 1
+
+    def start(self):
+        self._task = cocotb.start_soon(self._monitor())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    def summary(self):
+        """min / max / mean of each metric over the recorded frames."""
+        summary = {}
+        for metric in METRICS:
+            values = [f[metric] for f in self.frames]
+            if values:
+                summary[metric] = {"min": min(values), "max": max(values),
+                                   "mean": sum(values) / len(values)}
+        return summary
+
+    def write(self, path, **extra):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            **extra,
+            "sim": cocotb.SIM_NAME,
+            "seed": cocotb.RANDOM_SEED,
+            "rtl_counters": self.rtl_counters,
+            "frames": [{k: v for k, v in f.items() if k != "bins"} for f in self.frames],
+            "summary": self.summary(),
+            "errors": self.errors,
+        }
+        path.write_text(json.dumps(report, indent=2))
+        return path
+
+
+def metrics_path(test_name):
+    """Where a test's metrics JSON goes: $METRICS_DIR/<test>.json, ./metrics by default."""
+    return Path(os.environ.get("METRICS_DIR", "metrics")) / f"{test_name}.json"
+
+
+def record_vectors(test_name, count):
+    """Store how many vectors `test_name` checked in $METRICS_DIR/vectors.json."""
+    path = Path(os.environ.get("METRICS_DIR", "metrics")) / "vectors.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    counts = json.loads(path.read_text()) if path.is_file() else {}
+    counts[test_name] = count
+    path.write_text(json.dumps(counts, indent=2))
+
+
+def frame_metrics(test):
+    """Record FrameMetrics for `test`, write them to $METRICS_DIR/<test>.json and fail on RTL counter mismatches.
+
+    Every frame read out is checked by the top-level tests, so the frame count is also recorded as vectors.
+    """
+    @functools.wraps(test)
+    async def wrapper(dut, *args, **kwargs):
+        metrics = FrameMetrics(dut)
+        metrics.start()
+        passed = False
+        try:
+            result = await test(dut, *args, **kwargs)
+            passed = True
+            return result
+        except TestSuccess:
+            passed = True
+            raise
+        finally:
+            metrics.stop()
+            path = metrics.write(metrics_path(test.__name__), test=test.__name__, passed=passed)
+            record_vectors(test.__name__, len(metrics.frames))
+            dut._log.info(f"{len(metrics.frames)} frames, {metrics.summary()} -> {path}")
+            if passed and metrics.errors:
+                raise AssertionError("RTL performance counters disagree: " + "; ".join(metrics.errors))
+
+    return wrapper
@@ -0,0 +1,33 @@
+"""
+cocotb glue for the seeded frame batches of fft_model.stimulus.
+
+The batch is generated once when the test starts, from cocotb's logged
+RANDOM_SEED, so no random numbers are drawn on the per-cycle path. Set
+STIM_INDEX=k (with the same RANDOM_SEED and TESTCASE) to rerun frame k
+of a failing test on its own.
+"""
+
+import os
+
+import cocotb
+
+from fft_model.stimulus import FrameStimulus
+
+
+def frame_stimulus(dut, name, count, grid=1):
+    """The frames for test `name`: all `count` of them, or only frame $STIM_INDEX when replaying."""
+    index = os.environ.get("STIM_INDEX")
+    stim = FrameStimulus(cocotb.RANDOM_SEED, count, grid, name, None if index is None else int(index))
+    which = f"frame {index} of {count}" if index is not None else f"{count} frames"
+    dut._log.info(f"Stimulus for {name}: {which}, seed {stim.seed}, grid {grid}")
+    return stim
+
+
+async def check_frames(dut, stim, check):
+    """Await check(frame) for every frame of `stim`; a failure logs how to replay that frame alone."""
+    for index, frame in stim:
+        try:
+            await check(frame)
+        except AssertionError:
+            dut._log.error(f"Frame {index} failed, replay it alone with {stim.replay_args(index)}")
+            raise
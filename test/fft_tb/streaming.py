@@ -0,0 +1,96 @@
+"""
+Back-to-back streaming driver, monitor and scoreboard.
+
+The driver applies a new frame on every clock, the monitor samples the
+DUT outputs a fixed number of clocks later and the scoreboard checks them
+against precomputed expected values from its own coroutine, so the DUT
+sees one frame per cycle with no Python bookkeeping between frames.
+
+Rows and expected values are converted to Python ints a chunk at a time,
+so a memory-mapped golden vector file (fft_model.vectors) is read lazily
+instead of being copied into a list up front.
+"""
+
+from cocotb.queue import Queue
+from cocotb.triggers import ReadOnly, RisingEdge
+
+# Rows converted to Python lists at once
+CHUNK = 1 << 16
+
+
+def iter_rows(array):
+    """Yield the rows of `array` as Python values, converting CHUNK rows at a time."""
+    for start in range(0, len(array), CHUNK):
+        yield from array[start:start + CHUNK].tolist()
+
+
+class FrameDriver:
+    """Drives one row of values onto `signals` per clock edge."""
+
+    def __init__(self, clk, signals):
+        self.clk = clk
+        self.signals = list(signals)
+
+    async def drive(self, rows):
+        """Apply each row of `rows` (an (N, len(signals)) int array) for one clock."""
+        signals = self.signals
+        edge = RisingEdge(self.clk)
+        for row in iter_rows(rows):
+            for signal, value in zip(signals, row):
+                signal.value = value
+            await edge
+
+
+class FrameMonitor:
+    """Samples `signals` after every clock edge and queues them packed into one int."""
+
+    def __init__(self, clk, signals, width=8, latency=1):
+        self.clk = clk
+        self.signals = list(signals)
+        self.width = width
+        self.latency = latency
+        self.queue = Queue()
+
+    async def sample(self, count):
+        """
+        Queue `count` samples, the first one `latency` clocks after the call.
+
+        Start this together with FrameDriver.drive() so that sample k is the
+        response to row k.
+        """
+        signals, width, queue = self.signals, self.width, self.queue
+        edge = RisingEdge(self.clk)
+        settle = ReadOnly()
+        for _ in range(self.latency - 1):
+            await edge
+        for _ in range(count):
+            await edge
+            await settle
+            packed = 0
+            for signal in signals:
+                packed = (packed << width) | signal.value.integer
+            queue.put_nowait(packed)
+
+
+class Scoreboard:
+    """Checks monitored samples against packed expected values in order."""
+
+    def __init__(self, queue, expected, log, max_reports=10):
+        self.queue = queue
+        self.expected = expected
+        self.log = log
+        self.max_reports = max_reports
+        self.checked = 0
+        self.mismatches = []
+
+    async def check(self):
+        """Consume one sample per expected value, recording mismatches as (index, got)."""
+        queue = self.queue
+        for index, expected in enumerate(iter_rows(self.expected)):
+            got = await queue.get()
+            self.checked += 1
+            if got != expected:
+                if len(self.mismatches) < self.max_reports:
+                    self.log.error(f"Frame {index}: DUT={got:#018x}, EXPECTED={expected:#018x}")
+                self.mismatches.append((index, got))
+        return self.mismatches
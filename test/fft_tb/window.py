@@ -0,0 +1,111 @@
+"""
+Failure-window waveform capture (WAVES_MODE=window).
+
+In window mode waves.py points the harness dump at a scratch VCD
+(<toplevel>_<time>_window.vcd) covering WAVE_SCOPE / WAVE_DEPTH, so the
+simulator records the DUT internals with no Python work per clock. Only
+when a test fails does @failure_window flush that dump (the harness's
+wave_flush) and cut the last WAVE_WINDOW clock periods before the
+failure out of it into <test>_<time>_failure.vcd. waves.py deletes the
+scratch dumps on the next run. Decorate cocotb tests with
+@failure_window; in every other mode the decorator is a no-op.
+"""
+
+import functools
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+import cocotb
+from cocotb.result import TestSuccess
+from cocotb.triggers import Timer
+from cocotb.utils import get_sim_time
+
+# Clock periods kept before the failure
+DEFAULT_WINDOW = 256
+
+# Testbench clock period (Clock(dut.clk, 10, units="ns")); the window is measured in these
+CLOCK_PERIOD_PS = 10_000
+
+_UNITS_FS = {"s": 10**15, "ms": 10**12, "us": 10**9, "ns": 10**6, "ps": 10**3, "fs": 1}
+
+
+def _timescale_fs(header):
+    """Length of one VCD time unit in fs, from the header's $timescale."""
+    match = re.search(r"\$timescale\s+(\d+)\s*([a-z]+)\s+\$end", header)
+    if not match:
+        return _UNITS_FS["ps"]
+    return int(match.group(1)) * _UNITS_FS[match.group(2)]
+
+
+def _ident(line):
+    """VCD identifier of a value change line (`0!` or `b1010 !`)."""
+    return line.split()[1] if line[0] in "bBrR" else line[1:].strip()
+
+
+def cut_window(src, dst, start_ps):
+    """
+    Copy the part of VCD `src` from `start_ps` on to `dst`.
+
+    Every signal's value at `start_ps` is written as the window's opening
+    $dumpvars, so a viewer shows the state the window starts in.
+    """
+    dst = Path(dst)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    with open(src) as f, dst.open("w") as out:
+        header = []
+        for line in f:
+            header.append(line)
+            if "$enddefinitions" in line:
+                break
+        out.writelines(header)
+        start = start_ps * 1000 // _timescale_fs("".join(header))
+
+        state = {}
+        for line in f:
+            if line.startswith("#"):
+                if int(line[1:]) >= start:
+                    break
+            elif line.strip() and not line.startswith("$"):
+                state[_ident(line)] = line
+        else:
+            line = None
+        out.write(f"#{start}\n$dumpvars\n")
+        out.writelines(state.values())
+        out.write("$end\n")
+        if line is not None and int(line[1:]) > start:
+            out.write(line)
+        out.writelines(f)
+    return dst
+
+
+async def _flush(dut):
+    """Have the harness $dumpflush, so the scratch dump is complete up to now."""
+    dut.wave_flush.value = 1 - int(dut.wave_flush.value)
+    await Timer(1, units="step")
+
+
+def failure_window(test):
+    """Cut the last WAVE_WINDOW clocks before a failure of `test` out of the simulator's dump."""
+    @functools.wraps(test)
+    async def wrapper(dut, *args, **kwargs):
+        if os.environ.get("WAVES_MODE") != "window" or "VCD_PATH" not in cocotb.plusargs:
+            return await test(dut, *args, **kwargs)
+
+        try:
+            return await test(dut, *args, **kwargs)
+        except TestSuccess:
+            raise
+        except Exception:
+            failed_at = get_sim_time("ps")
+            window = int(os.environ.get("WAVE_WINDOW", DEFAULT_WINDOW))
+            await _flush(dut)
+            stamp = datetime.now().strftime("%Y%m%d_%H:%M:%S")
+            wave_dir = Path(os.environ.get("WAVES_DIR", "."))
+            path = cut_window(cocotb.plusargs["VCD_PATH"], wave_dir / f"{test.__name__}_{stamp}_failure.vcd",
+                              max(0, failed_at - window * CLOCK_PERIOD_PS))
+            dut._log.error(f"Wrote the last {window} clocks before the failure to {path}")
+            raise
+
+    return wrapper
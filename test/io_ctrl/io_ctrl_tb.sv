@@ -8,6 +8,7 @@ module io_ctrl_tb (
     input  logic ena,
     input  logic ui_in0,
     input  logic ui_in1,
+    input  logic burst,
 
     // Output signals
     output logic load_pulse,
@@ -18,18 +19,28 @@ module io_ctrl_tb (
 logic [7:0] current_test_id = 0;
 
     // Dump signals for waveform viewing
+    // Only dumps when given +VCD_PATH; +WAVE_SCOPE / +WAVE_DEPTH narrow the dump (see test/waves.py)
     string vcd_name;
+    string wave_scope;
+    integer wave_depth;
     initial begin
-`ifdef VCD_PATH
-        vcd_name = `VCD_PATH;
-`else
-        vcd_name = {"io_ctrl_tb_", `TIMESTAMP, ".vcd"};
-`endif
-        $dumpfile(vcd_name);
-        $dumpvars(0, io_ctrl_tb);
-        #1;
+        if ($value$plusargs("VCD_PATH=%s", vcd_name)) begin
+            if (!$value$plusargs("WAVE_SCOPE=%s", wave_scope))
+                wave_scope = "";
+            if (!$value$plusargs("WAVE_DEPTH=%d", wave_depth))
+                wave_depth = 0;
+            $dumpfile(vcd_name);
+            case (wave_scope)
+                "dut":   $dumpvars(wave_depth, dut);
+                default: $dumpvars(wave_depth, io_ctrl_tb);
+            endcase
+        end
     end
 
+    // Toggled by fft_tb.window to flush the dump before it cuts out a failure window
+    logic wave_flush = 0;
+    always @(wave_flush) $dumpflush;
+
     // Instantiate the DUT
     io_ctrl dut (
         .clk(clk),
@@ -37,6 +48,7 @@ logic [7:0] current_test_id = 0;
         .ena(ena),
         .ui_in0(ui_in0),
         .ui_in1(ui_in1),
+        .burst(burst),
         .load_pulse(load_pulse),
         .output_pulse(output_pulse),
         .addr(addr)
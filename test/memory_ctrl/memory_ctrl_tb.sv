@@ -16,34 +16,63 @@ module memory_ctrl_tb (
     output logic signed [7:0] real0_out, imag0_out,
     output logic signed [7:0] real1_out, imag1_out,
     output logic signed [7:0] real2_out, imag2_out,
-    output logic signed [7:0] real3_out, imag3_out
+    output logic signed [7:0] real3_out, imag3_out,
+
+    // Read Outputs of the ping-pong (BANKS=2) instance
+    output logic signed [7:0] pp_real0_out, pp_imag0_out,
+    output logic signed [7:0] pp_real1_out, pp_imag1_out,
+    output logic signed [7:0] pp_real2_out, pp_imag2_out,
+    output logic signed [7:0] pp_real3_out, pp_imag3_out
 );
 
 logic [7:0] current_test_id = 0;
 
+    // Packed buses for fft_tb.BusAdapter: one write and one read per vector, lane 0 in the MSBs.
+    // bus_mode selects in_bus = {ena, load_pulse, addr, data_in} over the individual ports.
+    logic        bus_mode = 0;
+    logic [11:0] in_bus = '0;
+    wire  [63:0] out_bus = {real0_out, imag0_out, real1_out, imag1_out,
+                            real2_out, imag2_out, real3_out, imag3_out};
+    wire  [63:0] pp_out_bus = {pp_real0_out, pp_imag0_out, pp_real1_out, pp_imag1_out,
+                               pp_real2_out, pp_imag2_out, pp_real3_out, pp_imag3_out};
+    wire         dut_ena        = bus_mode ? in_bus[11]   : ena;
+    wire         dut_load_pulse = bus_mode ? in_bus[10]   : load_pulse;
+    wire  [1:0]  dut_addr       = bus_mode ? in_bus[9:8]  : addr;
+    wire  [7:0]  dut_data_in    = bus_mode ? in_bus[7:0]  : data_in;
+
     // Dump the signals to a VCD file for debugging
+    // Only dumps when given +VCD_PATH; +WAVE_SCOPE / +WAVE_DEPTH narrow the dump (see test/waves.py)
     string vcd_name;
+    string wave_scope;
+    integer wave_depth;
     initial begin
-`ifdef VCD_PATH
-        vcd_name = `VCD_PATH;
-`else
-        vcd_name = {"memory_ctrl_tb_", `TIMESTAMP, ".vcd"};
-`endif
-        $dumpfile(vcd_name);
-        $dumpvars(0, memory_ctrl_tb);
-        #1;
+        if ($value$plusargs("VCD_PATH=%s", vcd_name)) begin
+            if (!$value$plusargs("WAVE_SCOPE=%s", wave_scope))
+                wave_scope = "";
+            if (!$value$plusargs("WAVE_DEPTH=%d", wave_depth))
+                wave_depth = 0;
+            $dumpfile(vcd_name);
+            case (wave_scope)
+                "dut":   $dumpvars(wave_depth, dut);
+                default: $dumpvars(wave_depth, memory_ctrl_tb);
+            endcase
+        end
     end
 
+    // Toggled by fft_tb.window to flush the dump before it cuts out a failure window
+    logic wave_flush = 0;
+    always @(wave_flush) $dumpflush;
+
     // Instantiate the memory controller (DUT)
     memory_ctrl #(
         .WIDTH(8)
     ) dut (
         .clk(clk),
         .rst(rst),
-        .ena(ena),
-        .load_pulse(load_pulse),
-        .addr(addr),
-        .data_in(data_in),
+        .ena(dut_ena),
+        .load_pulse(dut_load_pulse),
+        .addr(dut_addr),
+        .data_in(dut_data_in),
         .real0_out(real0_out),
         .imag0_out(imag0_out),
         .real1_out(real1_out),
@@ -54,4 +83,25 @@ logic [7:0] current_test_id = 0;
         .imag3_out(imag3_out)
     );
 
+    // Same inputs into a ping-pong memory controller
+    memory_ctrl #(
+        .WIDTH(8),
+        .BANKS(2)
+    ) dut_pp (
+        .clk(clk),
+        .rst(rst),
+        .ena(dut_ena),
+        .load_pulse(dut_load_pulse),
+        .addr(dut_addr),
+        .data_in(dut_data_in),
+        .real0_out(pp_real0_out),
+        .imag0_out(pp_imag0_out),
+        .real1_out(pp_real1_out),
+        .imag1_out(pp_imag1_out),
+        .real2_out(pp_real2_out),
+        .imag2_out(pp_imag2_out),
+        .real3_out(pp_real3_out),
+        .imag3_out(pp_imag3_out)
+    );
+
 endmodule
\ No newline at end of file
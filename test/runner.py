@@ -0,0 +1,284 @@
+"""
+Parallel regression runner built on cocotb's Python runner API.
+
+Each testbench is built and simulated in its own directory under
+sim_build/<sim>/<name>/, so the modules run concurrently in a process pool
+instead of one after another like the Makefile targets. Builds are
+cached by content hash (see build_cache.py) and the per-module JUnit
+files are merged into results.xml.
+
+    python runner.py                  # every testbench, one process per core
+    python runner.py top fft_engine   # selected testbenches
+    python runner.py -j 2 --sim icarus
+    python runner.py --waves off      # no trace overhead for long regressions
+    python runner.py --sim verilator  # compiled simulator for large random campaigns
+    PERF_COUNTERS=1 python runner.py top   # build with the RTL debug counters
+    FFT_RADIX4=1 python runner.py          # every testbench on the multiplierless fft_engine
+    FFT_PIPE_STAGES=2 python runner.py     # every testbench on a pipelined fft_engine
+    python runner.py fft_engine_selfcheck top_selfcheck   # bulk runs checked inside the simulator
+
+The self-checking harnesses only run when named, and without waves unless
+--waves or WAVES_MODE asks for them.
+
+Per-test frame metrics (fft_tb/perf.py) land in sim_build/<sim>/<name>/metrics/.
+"""
+
+import argparse
+import os
+import sys
+import time
+import traceback
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import waves
+from build_cache import build_key, is_built, mark_built, prune
+
+TEST_DIR = Path(__file__).resolve().parent
+SRC_DIR = TEST_DIR.parent / "src"
+PDK_DIR = TEST_DIR.parent / "pdk_files"
+BUILD_ROOT = TEST_DIR / "sim_build"
+
+
+@dataclass(frozen=True)
+class Testbench:
+    """Everything needed to build and run one cocotb testbench."""
+
+    directory: str
+    module: str
+    toplevel: str
+    tb_file: str
+    sources: tuple
+    timing: bool = False    # the harness has its own delays (Verilator needs --timing)
+    bulk: bool = False      # long vector replay: only run when named, without waves by default
+
+    @property
+    def path(self):
+        return TEST_DIR / self.directory
+
+    @property
+    def verilog_sources(self):
+        return [self.path / self.tb_file, *self.sources]
+
+
+ENGINE_SOURCES = (SRC_DIR / "fft_engine.sv", SRC_DIR / "butterfly.sv")
+TOP_SOURCES = (PDK_DIR / "sky130_fd_sc_hd_fast.v",) + tuple(
+    SRC_DIR / f for f in ("io_ctrl.sv", "butterfly.sv", "display_ctrl.sv", "fft_engine.sv",
+                          "memory_ctrl.sv", "delay_cell.sv", "top_fft.sv")
+)
+
+TESTBENCHES = {
+    "butterfly": Testbench(
+        "butterfly_unit", "test_butterfly", "butterfly_tb", "butterfly_tb.sv",
+        (SRC_DIR / "butterfly.sv",),
+    ),
+    "fft_engine": Testbench(
+        "fft_engine", "test_fft_engine", "fft_engine_tb", "fft_engine_tb.sv", ENGINE_SOURCES,
+    ),
+    "memory": Testbench(
+        "memory_ctrl", "test_memory_ctrl", "memory_ctrl_tb", "memory_ctrl_tb.sv",
+        (SRC_DIR / "memory_ctrl.sv",),
+    ),
+    "io": Testbench(
+        "io_ctrl", "test_io_ctrl", "io_ctrl_tb", "io_ctrl_tb.sv",
+        (SRC_DIR / "io_ctrl.sv",),
+    ),
+    "fft_stream": Testbench(
+        "fft_stream", "test_fft_stream", "fft_stream_tb", "fft_stream_tb.sv",
+        (SRC_DIR / "fft_stream.sv", SRC_DIR / "fft_engine.sv", SRC_DIR / "butterfly.sv"),
+    ),
+    "top": Testbench(
+        "top_fft", "test_top_fft", "tt_um_FFT_engine_tb", "top_fft_tb.sv", TOP_SOURCES,
+    ),
+    # Self-checking harnesses: stimulus and checks replayed from $readmemh files inside the simulator
+    "fft_engine_selfcheck": Testbench(
+        "fft_engine", "test_fft_engine_selfcheck", "fft_engine_selfcheck_tb", "fft_engine_selfcheck_tb.sv",
+        ENGINE_SOURCES, timing=True, bulk=True,
+    ),
+    "top_selfcheck": Testbench(
+        "top_fft", "test_top_fft_selfcheck", "tt_um_FFT_engine_selfcheck_tb", "top_fft_selfcheck_tb.sv",
+        TOP_SOURCES, timing=True, bulk=True,
+    ),
+}
+
+# Run when no testbench is named; the bulk self-checking harnesses must be asked for
+DEFAULT_TESTBENCHES = [name for name, tb in TESTBENCHES.items() if not tb.bulk]
+
+
+def wave_mode_for(name, mode=None):
+    """`mode` if one was chosen, else vcd, or off for the bulk harnesses."""
+    return mode or ("off" if TESTBENCHES[name].bulk else "vcd")
+
+
+def build_args(sim, wave_mode, timing=False):
+    """Simulator-specific compile arguments; they are part of the build key."""
+    defines = [f"-D{name}" for name in ("PERF_COUNTERS", "FFT_RADIX4") if os.environ.get(name)]
+    if os.environ.get("FFT_PIPE_STAGES"):
+        defines.append(f"-DFFT_PIPE_STAGES={int(os.environ['FFT_PIPE_STAGES'])}")
+    if sim != "verilator":
+        return defines
+    # The RTL leans on implicit width extension, which Verilator reports as lint
+    # warnings, and only the harnesses carry a `timescale
+    timing = ["--timing"] if timing else []
+    return [*defines, "-Wno-fatal", "--timescale", "1ns/1ps", *timing, *waves.trace_args(sim, wave_mode)]
+
+
+@contextmanager
+def testbench_env(tb, wave_mode, wave_dir, metrics_dir=None):
+    """Python path and environment for one cocotb run; cocotb hands both to the simulator."""
+    sys.path[:0] = [str(tb.path), str(TEST_DIR)]
+    os.environ.update(WAVES_MODE=wave_mode, WAVES_DIR=str(wave_dir))
+    if metrics_dir is not None:
+        os.environ["METRICS_DIR"] = str(metrics_dir)
+    try:
+        yield
+    finally:
+        del sys.path[:2]
+
+
+def timestamp():
+    """Waveform file suffix, same format as the Makefile: US/Eastern with colons between HH, MM, SS."""
+    return datetime.now(ZoneInfo("US/Eastern")).strftime("%Y%m%d_%H:%M:%S")
+
+
+def run_testbench(name, sim="icarus", testcase=None, wave_mode="vcd"):
+    """
+    Build (unless cached) and run one testbench in its own directory.
+
+    Runs inside a worker process. Returns (name, results_xml, seconds, error)
+    where error is a traceback string if the build or run raised.
+    """
+    from cocotb.runner import get_runner
+
+    tb = TESTBENCHES[name]
+    work_dir = BUILD_ROOT / sim / name
+    includes = [SRC_DIR]
+    args = build_args(sim, wave_mode, tb.timing)
+    key = build_key(sim, tb.toplevel, [*tb.verilog_sources, *(f"-I{i}" for i in includes), *args])
+    build_dir = work_dir / key
+    wave_dir = tb.path / "wave"
+    waves.prune(wave_dir, int(os.environ.get("WAVE_KEEP", waves.DEFAULT_KEEP)))
+    plusargs = waves.plusargs(wave_mode, wave_dir, tb.toplevel, timestamp(),
+                              os.environ.get("WAVE_SCOPE"), os.environ.get("WAVE_DEPTH"), sim)
+    start = time.perf_counter()
+
+    with testbench_env(tb, wave_mode, wave_dir, work_dir / "metrics"):
+        try:
+            runner = get_runner(sim)
+            if is_built(build_dir):
+                print(f"INFO: {name}: reusing build {key}")
+            else:
+                runner.build(
+                    verilog_sources=tb.verilog_sources,
+                    hdl_toplevel=tb.toplevel,
+                    includes=includes,
+                    build_args=args,
+                    build_dir=build_dir,
+                    always=True,
+                    waves=any(a.startswith("--trace") for a in args),
+                    log_file=work_dir / "build.log",
+                )
+            mark_built(build_dir)
+            prune(work_dir)
+
+            results = runner.test(
+                test_module=tb.module,
+                hdl_toplevel=tb.toplevel,
+                hdl_toplevel_lang="verilog",
+                testcase=testcase,
+                plusargs=plusargs,
+                build_dir=build_dir,
+                test_dir=work_dir,
+                results_xml=str(work_dir / "results.xml"),
+                log_file=work_dir / "sim.log",
+            )
+            return name, results, time.perf_counter() - start, None
+        except BaseException:
+            return name, None, time.perf_counter() - start, traceback.format_exc()
+
+
+def merge_results(outcomes, output):
+    """Merge the per-module JUnit files into one report, adding a failure for modules that crashed."""
+    merged = ET.Element("testsuites", name="results")
+    for name, results, _, error in outcomes:
+        if results is not None and Path(results).is_file():
+            for suite in ET.parse(results).getroot().iter("testsuite"):
+                suite.set("name", f"{name}.{suite.get('name', 'all')}")
+                merged.append(suite)
+        else:
+            suite = ET.SubElement(merged, "testsuite", name=name, tests="1")
+            case = ET.SubElement(suite, "testcase", classname=name, name="build_and_run")
+            ET.SubElement(case, "failure", message="testbench did not produce results").text = error
+    ET.ElementTree(merged).write(output, encoding="unicode", xml_declaration=True)
+    return merged
+
+
+def summarize(merged):
+    """Return {module: (tests, failures)} from a merged report."""
+    summary = {}
+    for suite in merged.iter("testsuite"):
+        module = suite.get("name").split(".")[0]
+        tests, failed = summary.get(module, (0, 0))
+        for case in suite.iter("testcase"):
+            tests += 1
+            failed += any(True for _ in case.iter("failure"))
+        summary[module] = (tests, failed)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("testbenches", nargs="*", metavar="testbench",
+                        help=f"testbenches to run, from {', '.join(TESTBENCHES)} "
+                             f"(default: {', '.join(DEFAULT_TESTBENCHES)})")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="parallel processes")
+    parser.add_argument("--sim", default=os.environ.get("SIM", "icarus"), help="cocotb simulator name")
+    parser.add_argument("--testcase", help="only run this cocotb test function")
+    parser.add_argument("--waves", choices=waves.MODES,
+                        help="waveform mode (see waves.py; default WAVES_MODE, else vcd, "
+                             "off for the self-checking harnesses)")
+    parser.add_argument("--results", default=TEST_DIR / "results.xml", type=Path, help="merged JUnit output")
+    args = parser.parse_args(argv)
+    try:
+        wave_mode = args.waves or waves.current_mode(default=None)
+    except ValueError as e:
+        parser.error(str(e))
+
+    names = args.testbenches or list(DEFAULT_TESTBENCHES)
+    unknown = set(names) - set(TESTBENCHES)
+    if unknown:
+        parser.error(f"unknown testbench: {', '.join(sorted(unknown))}")
+    start = time.perf_counter()
+    outcomes = []
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(names)))) as pool:
+        futures = [pool.submit(run_testbench, name, args.sim, args.testcase, wave_mode_for(name, wave_mode))
+                   for name in names]
+        for future in as_completed(futures):
+            outcome = future.result()
+            outcomes.append(outcome)
+            name, _, seconds, error = outcome
+            status = "ERROR" if error else "done"
+            print(f"[{status}] {name} in {seconds:.1f} s (logs in {BUILD_ROOT / args.sim / name})", flush=True)
+            if error:
+                print(error, file=sys.stderr)
+
+    outcomes.sort(key=lambda o: names.index(o[0]))
+    summary = summarize(merge_results(outcomes, args.results))
+    seconds = {name: s for name, _, s, _ in outcomes}
+
+    print(f"\n{'testbench':<12} {'tests':>6} {'failed':>7} {'time (s)':>9}")
+    for name in names:
+        tests, failed = summary.get(name, (0, 0))
+        print(f"{name:<12} {tests:>6} {failed:>7} {seconds[name]:>9.1f}")
+    print(f"\nWall time {time.perf_counter() - start:.1f} s, merged results in {args.results}")
+
+    return 1 if any(failed for _, failed in summary.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+"""
+Parallel multi-corner static timing analysis with OpenSTA.
+
+Times the tt_um_FFT_engine gate-level netlist once per (library corner,
+SPEF extraction) pair, each in its own OpenSTA process, with the
+constraints of verilog_sta/slack_test.tcl, and reports per pair:
+
+    setup_slack_ns    worst setup slack at --period
+    hold_slack_ns     worst hold slack
+    critical_paths    the --paths worst setup paths: start, end, arrival, required, slack
+    min_period_ns     smallest clock period without a setup violation, from a period sweep
+    fmax_mhz          1000 / min_period_ns
+
+The sweep re-times the design over a coarse period grid, then over a fine
+grid between the last failing and the first passing period. The I/O
+delays are absolute, so the slack is not exactly linear in the period;
+estimate_period_ns (period - setup slack) is reported next to it.
+
+The default netlist and SPEFs are the hardened submission that
+slack_test.tcl times, tt_submission/tt_um_FFT_engine.*. They are taken from
+verilog_sta/tt_submission/ when it has been unpacked, or extracted from
+"verilog_sta/tt_submission (17).zip" into sta_build/. That netlist is a
+fixed snapshot: the RTL in src/ only reaches the timing once a new
+netlist is hardened and passed with --netlist. A netlist without a
+tt_um_FFT_engine module is rejected. The liberty files are not in the
+repository: set PDK_ROOT or pass --lib-dir.
+
+Every run is appended to sta_history.jsonl with the git commit and the
+netlist's sha256, and is compared with the last run of a different
+commit. The run fails on a setup or hold violation at --period, or when a
+pair's Fmax dropped by more than --threshold.
+
+    python sta_corners.py                            # 3 corners x 3 SPEFs, results in sta.json
+    python sta_corners.py --corners tt --spefs nom --period 10
+    python sta_corners.py --lib-dir $PDK_ROOT/sky130A/libs.ref/sky130_fd_sc_hd/lib
+    python sta_corners.py --netlist path/to/tt_um_FFT_engine.v     # a newly hardened netlist
+    python sta_corners.py --no-gate                  # record after an intended change
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+
+from bench import git_commit, load_history
+from runner import TEST_DIR
+
+STA_DIR = TEST_DIR.parent / "verilog_sta"
+STA_BUILD = TEST_DIR / "sta_build"
+HISTORY = TEST_DIR / "sta_history.jsonl"
+
+# The design timed, and the submission slack_test.tcl reads its netlist and SPEFs from
+TOP = "tt_um_FFT_engine"
+SUBMISSION = "tt_submission"
+SUBMISSION_ZIP = STA_DIR / "tt_submission (17).zip"
+
+# Liberty file per corner, as in slack_test.tcl
+CORNERS = {
+    "ff": "sky130_fd_sc_hd__ff_n40C_1v76.lib",
+    "tt": "sky130_fd_sc_hd__tt_025C_1v80.lib",
+    "ss": "sky130_fd_sc_hd__ss_n40C_1v76.lib",
+}
+
+# Parasitic extractions next to the netlist: <design>.<spef>.spef
+SPEFS = ("min", "nom", "max")
+
+# The constraints of slack_test.tcl, re-applied for every clock period of the sweep
+CONSTRAIN = """\
+proc constrain {period} {
+    create_clock -name clk -period $period {clk}
+    set_clock_uncertainty 0.1 [all_clocks]
+    set_clock_transition  0.1 [all_clocks]
+    set_input_delay  -min  0.5 -clock [all_clocks] [all_inputs]
+    set_input_delay  -max  0.5 -clock [all_clocks] [all_inputs]
+    set_output_delay -min -2.5 -clock [all_clocks] [all_outputs]
+    set_output_delay -max -2.5 -clock [all_clocks] [all_outputs]
+    set_propagated_clock [all_clocks]
+}
+"""
+
+WORST_SLACK = re.compile(r"worst slack\s+(\S+)")
+PATH_FIELDS = {
+    "startpoint": re.compile(r"Startpoint:\s+(\S+)"),
+    "endpoint": re.compile(r"Endpoint:\s+(\S+)"),
+    "arrival_ns": re.compile(r"^\s*(-?[\d.]+)\s+data arrival time", re.M),
+    "required_ns": re.compile(r"^\s*(-?[\d.]+)\s+data required time", re.M),
+    "slack_ns": re.compile(r"^\s*(-?[\d.]+)\s+slack \(", re.M),
+}
+
+
+def default_lib_dir():
+    """The sky130_fd_sc_hd liberty files under $PDK_ROOT; None without it, so --lib-dir is required."""
+    if os.environ.get("PDK_ROOT"):
+        return Path(os.environ["PDK_ROOT"]) / "sky130A/libs.ref/sky130_fd_sc_hd/lib"
+    return None
+
+
+def default_netlist():
+    """tt_submission/tt_um_FFT_engine.v, unpacked under verilog_sta/ or extracted from the submission zip."""
+    unpacked = STA_DIR / SUBMISSION / f"{TOP}.v"
+    if unpacked.is_file():
+        return unpacked
+    extracted = STA_BUILD / SUBMISSION / f"{TOP}.v"
+    if not extracted.is_file() and SUBMISSION_ZIP.is_file():
+        with zipfile.ZipFile(SUBMISSION_ZIP) as archive:
+            for name in [f"{TOP}.v"] + [f"{TOP}.{spef}.spef" for spef in SPEFS]:
+                archive.extract(f"{SUBMISSION}/{name}", STA_BUILD)
+    return extracted if extracted.is_file() else None
+
+
+def netlist_modules(netlist):
+    return re.findall(r"^\s*module\s+(\w+)", netlist.read_text(errors="replace"), re.M)
+
+
+def file_digest(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+
+
+def tcl_path(path):
+    return "{" + str(path) + "}"
+
+
+def sta_script(lib, netlist, spef, period, sweep, paths=0):
+    """OpenSTA commands timing one corner/SPEF pair at `period`, then at every period of `sweep`."""
+    lines = [
+        CONSTRAIN,
+        f"read_liberty {tcl_path(lib)}",
+        f"read_verilog {tcl_path(netlist)}",
+        f"link_design {TOP}",
+        f"read_spef {tcl_path(spef)}",
+        f"constrain {period}",
+        'puts "@@ setup"',
+        "report_worst_slack -max -digits 4",
+        'puts "@@ hold"',
+        "report_worst_slack -min -digits 4",
+    ]
+    if paths:
+        lines += ['puts "@@ paths"', f"report_checks -path_delay max -group_count {paths} -digits 4"]
+    for p in sweep:
+        lines += [f"constrain {p}", f'puts "@@ period {p}"', "report_worst_slack -max -digits 4"]
+    return "\n".join(lines) + "\n"
+
+
+def sections(output):
+    """The report text after each `@@ <name>` marker, keyed by name."""
+    found = {}
+    for block in output.split("@@ ")[1:]:
+        name, _, text = block.partition("\n")
+        found[name.strip()] = text
+    return found
+
+
+def worst_slack(text):
+    """Slack of a report_worst_slack report in ns; None when nothing is constrained."""
+    match = WORST_SLACK.search(text)
+    if not match:
+        return None
+    try:
+        return float(match.group(1))
+    except ValueError:
+        return None
+
+
+def critical_paths(text):
+    """One dict of PATH_FIELDS per path of a full-format report_checks report."""
+    paths = []
+    for block in re.split(r"(?=Startpoint:)", text)[1:]:
+        path = {}
+        for field, pattern in PATH_FIELDS.items():
+            match = pattern.search(block)
+            path[field] = (match.group(1) if field in ("startpoint", "endpoint") else float(match.group(1))) \
+                if match else None
+        paths.append(path)
+    return paths
+
+
+def grid(lo, hi, step):
+    return [round(lo + i * step, 4) for i in range(int(round((hi - lo) / step)) + 1)]
+
+
+def run_sta(sta, script, workdir, name):
+    """Run `script` in OpenSTA from `workdir`, keeping the script and log there; returns the output."""
+    workdir.mkdir(parents=True, exist_ok=True)
+    (workdir / f"{name}.tcl").write_text(script)
+    result = subprocess.run([sta, "-no_init", "-no_splash", "-exit", f"{name}.tcl"], cwd=workdir,
+                            capture_output=True, text=True)
+    (workdir / f"{name}.log").write_text(result.stdout + result.stderr)
+    if result.returncode:
+        raise RuntimeError(f"{sta} exited with {result.returncode}:\n{(result.stdout + result.stderr)[-2000:]}")
+    return result.stdout
+
+
+def analyze(corner, spef, sta, lib_dir, netlist, period, sweep, paths):
+    """Timing record for one (corner, SPEF) pair; two OpenSTA runs, the second refining the sweep."""
+    lib = lib_dir / CORNERS[corner]
+    parasitics = netlist.with_suffix(f".{spef}.spef")
+    workdir = STA_BUILD / f"{corner}_{spef}"
+    lo, hi, step = sweep
+
+    report = sections(run_sta(sta, sta_script(lib, netlist, parasitics, period, grid(lo, hi, step), paths),
+                              workdir, "coarse"))
+    record = {
+        "corner": corner,
+        "spef": spef,
+        "period_ns": period,
+        "setup_slack_ns": worst_slack(report.get("setup", "")),
+        "hold_slack_ns": worst_slack(report.get("hold", "")),
+        "critical_paths": critical_paths(report.get("paths", "")),
+    }
+    slacks = {float(name.split()[1]): worst_slack(text) for name, text in report.items() if name.startswith("period ")}
+    passing = sorted(p for p, s in slacks.items() if s is not None and s >= 0)
+    if passing and passing[0] > lo:
+        # Refine between the last failing and the first passing coarse period
+        fine = grid(passing[0] - step, passing[0], step / 20)
+        report = sections(run_sta(sta, sta_script(lib, netlist, parasitics, period, fine), workdir, "fine"))
+        slacks.update({float(name.split()[1]): worst_slack(text)
+                       for name, text in report.items() if name.startswith("period ")})
+        passing = sorted(p for p, s in slacks.items() if s is not None and s >= 0)
+
+    min_period = passing[0] if passing else None
+    record.update({
+        "min_period_ns": min_period,
+        "min_period_is_bound": bool(passing) and min_period <= lo,
+        "fmax_mhz": 1000 / min_period if min_period else None,
+        "estimate_period_ns": None if record["setup_slack_ns"] is None else period - record["setup_slack_ns"],
+        "sweep": [{"period_ns": p, "setup_slack_ns": s} for p, s in sorted(slacks.items())],
+    })
+    return record
+
+
+def previous_run(history, netlist, record):
+    """The last recorded run of the same netlist and pair from another commit, or None."""
+    for h in reversed(history):
+        if ((h.get("netlist"), h.get("corner"), h.get("spef")) == (netlist, record["corner"], record["spef"])
+                and h.get("commit") != record["commit"] and not h.get("error")):
+            return h
+    return None
+
+
+def regressions(record, previous, threshold):
+    """Reasons `record` fails: violations at the target period, or an Fmax drop beyond `threshold`."""
+    found = []
+    for check in ("setup", "hold"):
+        slack = record[f"{check}_slack_ns"]
+        if slack is not None and slack < 0:
+            found.append(f"{check} violated at {record['period_ns']} ns, worst slack {slack:.4f} ns")
+    if previous and previous.get("fmax_mhz") and record["fmax_mhz"]:
+        change = (record["fmax_mhz"] - previous["fmax_mhz"]) / previous["fmax_mhz"]
+        if -change > threshold:
+            found.append(f"Fmax {record['fmax_mhz']:.1f} MHz vs {previous['fmax_mhz']:.1f} MHz "
+                         f"at {previous['commit']} ({change:+.1%})")
+    return found
+
+
+def fmt(value, spec=".3f"):
+    return "-" if value is None else format(value, spec)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corners", nargs="+", choices=CORNERS, default=list(CORNERS))
+    parser.add_argument("--spefs", nargs="+", choices=SPEFS, default=list(SPEFS))
+    parser.add_argument("--netlist", type=Path,
+                        help=f"gate-level {TOP} netlist; the SPEFs are <netlist stem>.<spef>.spef next to it "
+                             f"(default: {SUBMISSION}/{TOP}.v from the submission zip)")
+    parser.add_argument("--lib-dir", type=Path, default=default_lib_dir(),
+                        help="directory of the liberty files (default: under $PDK_ROOT)")
+    parser.add_argument("--sta", default=os.environ.get("STA", "sta"), help="OpenSTA executable")
+    parser.add_argument("--period", type=float, default=20.0, help="target clock period in ns (info.yaml: 50 MHz)")
+    parser.add_argument("--sweep", nargs=3, type=float, default=[2.0, 40.0, 1.0], metavar=("LO", "HI", "STEP"),
+                        help="coarse period grid in ns; the fine grid is STEP / 20")
+    parser.add_argument("--paths", type=int, default=5, help="worst setup paths reported per pair")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="parallel OpenSTA processes")
+    parser.add_argument("--json", type=Path, default=TEST_DIR / "sta.json", help="results of this run")
+    parser.add_argument("--history", type=Path, default=HISTORY, help="JSON-lines history store")
+    parser.add_argument("--threshold", type=float, default=0.0, help="allowed relative Fmax drop")
+    parser.add_argument("--no-record", dest="record", action="store_false", help="do not append to the history")
+    parser.add_argument("--no-gate", dest="gate", action="store_false", help="report regressions without failing")
+    args = parser.parse_args(argv)
+
+    if args.netlist is None:
+        args.netlist = default_netlist()
+    if args.netlist is None or not args.netlist.is_file():
+        parser.error(f"netlist not found: {args.netlist or SUBMISSION_ZIP}; pass --netlist")
+    modules = netlist_modules(args.netlist)
+    if TOP not in modules:
+        parser.error(f"{args.netlist} is not a {TOP} netlist (modules: {', '.join(modules) or 'none'})")
+    if args.lib_dir is None:
+        parser.error("no liberty files: set PDK_ROOT or pass --lib-dir")
+    missing = [str(args.lib_dir / CORNERS[c]) for c in args.corners if not (args.lib_dir / CORNERS[c]).is_file()]
+    missing += [str(args.netlist.with_suffix(f".{s}.spef")) for s in args.spefs
+                if not args.netlist.with_suffix(f".{s}.spef").is_file()]
+    if missing:
+        parser.error("missing input files:\n  " + "\n  ".join(missing))
+
+    digest = file_digest(args.netlist)
+    print(f"Timing {TOP} from {args.netlist} (sha256 {digest})", flush=True)
+    stamp = {"time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+             "host": platform.node(), "commit": git_commit(), "netlist": args.netlist.name,
+             "netlist_sha256": digest}
+    pairs = list(product(args.corners, args.spefs))
+    records = []
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(pairs)))) as pool:
+        futures = {pool.submit(analyze, corner, spef, args.sta, args.lib_dir, args.netlist, args.period,
+                               args.sweep, args.paths): (corner, spef) for corner, spef in pairs}
+        for future in as_completed(futures):
+            corner, spef = futures[future]
+            try:
+                record = {**stamp, **future.result()}
+            except Exception as exc:
+                record = {**stamp, "corner": corner, "spef": spef, "error": str(exc)}
+                print(f"[ERROR] {corner}/{spef}: {exc}", file=sys.stderr)
+            else:
+                print(f"[done] {corner}/{spef} (logs in {STA_BUILD / f'{corner}_{spef}'})", flush=True)
+            records.append(record)
+    records.sort(key=lambda r: pairs.index((r["corner"], r["spef"])))
+
+    history = load_history(args.history)
+    regressed = []
+    print(f"\n{'corner':<6} {'spef':<4} {'setup ns':>9} {'hold ns':>8} {'min period':>11} {'Fmax MHz':>9} "
+          f"{'previous':>9}  critical path")
+    for r in records:
+        if "error" in r:
+            print(f"{r['corner']:<6} {r['spef']:<4} {'OpenSTA error':>30}")
+            continue
+        previous = previous_run(history, args.netlist.name, r)
+        r["previous_fmax_mhz"] = previous and previous.get("fmax_mhz")
+        regressed += [f"{r['corner']}/{r['spef']}: {reason}" for reason in regressions(r, previous, args.threshold)]
+        bound = "<=" if r["min_period_is_bound"] else ""
+        worst = r["critical_paths"][0] if r["critical_paths"] else {}
+        print(f"{r['corner']:<6} {r['spef']:<4} {fmt(r['setup_slack_ns']):>9} {fmt(r['hold_slack_ns']):>8} "
+              f"{bound + fmt(r['min_period_ns'], '.2f'):>11} {fmt(r['fmax_mhz'], '.1f'):>9} "
+              f"{fmt(r['previous_fmax_mhz'], '.1f'):>9}  "
+              f"{worst.get('startpoint', '-')} -> {worst.get('endpoint', '-')}")
+
+    for reason in regressed:
+        print(f"REGRESSION: {reason}")
+
+    args.json.write_text(json.dumps({**stamp, "period_ns": args.period, "results": records}, indent=2))
+    print(f"\nResults in {args.json}")
+    if args.record:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with args.history.open("a") as history_file:
+            for r in records:
+                summary = {k: v for k, v in r.items() if k not in ("critical_paths", "sweep")}
+                history_file.write(json.dumps({**summary, "error": "error" in r}) + "\n")
+        print(f"{len(records)} runs appended to {args.history}")
+
+    failed = any("error" in r for r in records)
+    return 1 if failed or (args.gate and regressed) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,20 @@
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, Timer, ClockCycles
-import random
+from cocotb.triggers import RisingEdge, ReadOnly, Timer, ClockCycles
+from cocotb.utils import get_sim_time
+
+import os
+import time
+
+import numpy as np
+
+from fft_host import FFTDevice
+from fft_model import ChipModel, mem_transform, pack_input, top_fft, unpack_output
+from fft_model.chip import burst_stream
+from fft_model.coverage import Coverage, directed_frames, engine_hits, engine_points, fsm_hits, fsm_points
+from fft_model.vectors import golden_vectors
+from fft_tb import (FrameMetrics, Lockstep, SignalSampler, SimBoard, check_frames, failure_window,
+                    frame_metrics, frame_stimulus, iter_rows, metrics_path, record_vectors)
 
 TEST_IDS = {
     "reset":      1,
@@ -9,56 +22,46 @@ TEST_IDS = {
     "impulse":    3,
     "dc":         4,
     "random":     5,
+    "burst":      6,
+    "cycles":     7,
+    "overlap":    8,
+    "latency":    9,
+    "coverage":  10,
+    "golden":    11,
+    "device":    12,
+    "lockstep":  13,
+    "stream":    14,
 }
 
-def wrap8(x):
-    if x > 127: x -= 256
-    elif x < -128: x += 256
-    return x
-
-def pack_input(real, imag):
-    real_nibble_signed = real >> 4
-    imag_nibble_signed = imag >> 4
-    real_nibble_unsigned = real_nibble_signed & 0xF
-    imag_nibble_unsigned = imag_nibble_signed & 0xF
-    return (real_nibble_unsigned << 4) | imag_nibble_unsigned
-
-def pack_output(real, imag):
-    real_msbs = (real >> 4) & 0xF
-    imag_msbs = (imag >> 4) & 0xF
-    return (real_msbs << 4) | imag_msbs
-
-def model_mem_transform(data_in):
-    real_nibble = (data_in >> 4) & 0xF
-    imag_nibble = data_in & 0xF
-    real_val = (real_nibble - 16) if real_nibble >= 8 else real_nibble
-    imag_val = (imag_nibble - 16) if imag_nibble >= 8 else imag_nibble
-    return (real_val << 4, imag_val << 4)
-
-def butterfly_ref_model(a_r, a_i, b_r, b_i, t_r, t_i):
-    prod_real = t_r * b_r - t_i * b_i
-    prod_imag = t_i * b_r + t_r * b_i
-    scale = lambda val: wrap8(val >> 7)
-    pr, pi = scale(prod_real), scale(prod_imag)
-    return (wrap8(a_r + pr), wrap8(a_i + pi)), (wrap8(a_r - pr), wrap8(a_i - pi))
-
-def fft_engine_ref_model(in0, in1, in2, in3):
-    W0_r, W0_i = -128, 0
-    W1_r, W1_i = 0, -128
-    (s1_0_pos, s1_0_neg) = butterfly_ref_model(in0[0], in0[1], in2[0], in2[1], W0_r, W0_i)
-    (s1_1_pos, s1_1_neg) = butterfly_ref_model(in1[0], in1[1], in3[0], in3[1], W0_r, W0_i)
-    out0 = (wrap8(s1_0_pos[0] + s1_1_pos[0]), wrap8(s1_0_pos[1] + s1_1_pos[1]))
-    out2 = (wrap8(s1_0_pos[0] - s1_1_pos[0]), wrap8(s1_0_pos[1] - s1_1_pos[1]))
-    (out1, out3) = butterfly_ref_model(s1_0_neg[0], s1_0_neg[1], s1_1_neg[0], s1_1_neg[1], W1_r, W1_i)
-    return [out0, out1, out2, out3]
+# ui_in[2]: level-sensitive strobes, one sample loaded / one bin read per clock while held
+BURST = 0x04
+
+# Samples reach the engine as the upper nibbles of uio_in, so only multiples of 16 are distinct
+GRID = 16
+
+# top_fft.sv control signals sampled for FSM coverage (arguments of fsm_hits)
+FSM_SIGNALS = ("processing", "processing_dly", "done", "addr", "load_pulse", "output_pulse", "output_counter")
+
+# Clocks from the edge loading sample 3 to the edge setting done: processing is high for
+# the engine latency (1 + PIPE_STAGES, the harness's engine_latency), then processing_dly
+def load_to_done(dut):
+    return dut.engine_latency.value.integer + 1
+
+# Frames replayed from the golden vector store by test_golden_frames
+GOLDEN_FRAMES = int(os.environ.get("GOLDEN_FRAMES", 200))
+
+# Frames pushed through the host-side FFTDevice API by test_device_api
+DEVICE_FRAMES = int(os.environ.get("DEVICE_FRAMES", 500))
+
+# Clocks of random pin activity checked against the cycle model by test_lockstep_model
+LOCKSTEP_CYCLES = int(os.environ.get("LOCKSTEP_CYCLES", 20000))
+
+# Golden frames streamed back to back, without reset, by test_continuous_stream
+CONTINUOUS_FRAMES = int(os.environ.get("CONTINUOUS_FRAMES", 5000))
 
 def top_fft_ref_model(raw_inputs):
-    transformed_inputs = [model_mem_transform(pack_input(r, i)) for r, i in raw_inputs]
-    fft_results = fft_engine_ref_model(
-        transformed_inputs[0], transformed_inputs[1], transformed_inputs[2], transformed_inputs[3]
-    )
-    packed_outputs = [pack_output(r, i) for r, i in fft_results]
-    return packed_outputs
+    """Expected packed uio_out bytes for one frame, from the shared fft_model package."""
+    return top_fft(raw_inputs).tolist()
 
 
 async def reset_dut(dut):
@@ -81,13 +84,14 @@ async def load_sample(dut, data_in):
 async def run_full_fft_test(dut, inputs):
     """A complete test sequence: load 4 samples, wait, read 4 samples, and verify."""
     expected_outputs = top_fft_ref_model(inputs)
+    packed_inputs = pack_input([r for r, _ in inputs], [i for _, i in inputs]).tolist()
     dut._log.info(f"Inputs: {inputs}")
     dut._log.info(f"Expected packed outputs: {[hex(x) for x in expected_outputs]}")
 
     # --- Load Phase ---
     dut.ena.value = 1
-    for i in range(4):
-        packed_val = pack_input(inputs[i][0], inputs[i][1])
+    start = get_sim_time("ns")
+    for packed_val in packed_inputs:
         await load_sample(dut, packed_val)
     
     # --- Wait for processing to finish ---
@@ -109,8 +113,9 @@ async def run_full_fft_test(dut, inputs):
         dut.ui_in.value = 2
         await RisingEdge(dut.clk)
         
-        # Add a wait cycle for the output pipeline stage.
-        await RisingEdge(dut.clk)
+        # The output pipeline stage registers the bin on this edge; sample it once it has
+        # settled so Icarus and Verilator see the same value.
+        await ReadOnly()
 
         assert dut.uio_oe.value.integer == 0xFF, f"uio_oe was not asserted for output {i}."
         
@@ -120,16 +125,115 @@ async def run_full_fft_test(dut, inputs):
         assert dut_out == expected_outputs[i], \
             f"Output {i} mismatch: DUT={hex(dut_out)}, Expected={hex(expected_outputs[i])}"
 
+        await RisingEdge(dut.clk)
         dut.ui_in.value = 0
 
-        # Wait one more clock cycle to see the OE de-assert
-        await RisingEdge(dut.clk)
+        # The OE de-asserts one clock cycle later
+        await ReadOnly()
         assert dut.uio_oe.value == 0, f"uio_oe did not de-assert after reading output {i}"
+        await RisingEdge(dut.clk)
 
+    cycles = (get_sim_time("ns") - start) / 10
     dut._log.info(f"Actual packed outputs: {[hex(x) for x in actual_outputs]}")
-    dut._log.info("Test case passed.")
+    dut._log.info(f"Test case passed in {cycles:.0f} cycles.")
+    return cycles
+
+async def burst_frame(dut, packed_samples, timeout_cycles=100):
+    """Burst-load one frame, then hold the output strobe until the four bins have streamed out. Returns the bins."""
+    dut.ui_in.value = BURST | 1
+    for packed_val in packed_samples:
+        dut.uio_in.value = packed_val
+        await RisingEdge(dut.clk)
+
+    # Hold the output strobe: the bins stream out as soon as the FFT is done
+    dut.ui_in.value = BURST | 2
+    bins = []
+    for _ in range(timeout_cycles):
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        if dut.uio_oe.value.integer == 0xFF:
+            bins.append(dut.uio_out.value.integer)
+            if len(bins) == 4:
+                break
+    else:
+        assert False, f"Timeout: only {len(bins)} bins read after {timeout_cycles} cycles."
+
+    await RisingEdge(dut.clk)
+    dut.ui_in.value = BURST
+    return bins
+
+async def run_burst_fft_test(dut, inputs):
+    """Burst mode: load one sample per clock, stream the bins out one per clock, verify. Returns cycles used."""
+    expected_outputs = top_fft_ref_model(inputs)
+    packed_inputs = pack_input([r for r, _ in inputs], [i for _, i in inputs]).tolist()
+    dut._log.info(f"Burst inputs: {inputs}")
+
+    dut.ena.value = 1
+    start = get_sim_time("ns")
+    actual_outputs = await burst_frame(dut, packed_inputs)
+    # Cycles up to the last bin, not counting the turnaround clock
+    cycles = (get_sim_time("ns") - start) / 10 - 1
+
+    assert actual_outputs == expected_outputs, \
+        f"Burst outputs {[hex(x) for x in actual_outputs]}, expected {[hex(x) for x in expected_outputs]}"
+    dut._log.info(f"Burst frame passed in {cycles:.0f} cycles.")
+    return cycles
+
+async def burst_load(dut, packed_samples):
+    """Burst-load `packed_samples`, one per clock."""
+    dut.ui_in.value = BURST | 1
+    for packed_val in packed_samples:
+        dut.uio_in.value = packed_val
+        await RisingEdge(dut.clk)
+    dut.ui_in.value = BURST
+
+async def burst_read(dut):
+    """Read the four bins of the finished frame on consecutive clocks; ends one turnaround clock later."""
+    dut.ui_in.value = BURST | 2
+    bins = []
+    for i in range(4):
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        assert dut.uio_oe.value.integer == 0xFF, f"uio_oe was not asserted for bin {i}."
+        bins.append(dut.uio_out.value.integer)
+    # The DUT drives uio for one more clock before the host may drive it again
+    await RisingEdge(dut.clk)
+    dut.ui_in.value = BURST
+    return bins
+
+async def run_overlapped_frames(dut, frames, check=None):
+    """
+    Burst-stream `frames` with loading overlapped with readout: samples 0-2 of frame k+1
+    are loaded before frame k is read, sample 3 after. `check(read)` awaits read(frame)
+    for each frame in order (e.g. through check_frames); by default they simply run in
+    turn. Returns cycles per frame.
+    """
+    packed = [pack_input([r for r, _ in f], [i for _, i in f]).tolist() for f in frames]
+    following = iter(packed[1:] + [None])
+
+    async def read(inputs):
+        after = next(following)
+        if after:
+            await burst_load(dut, after[:3])
+        got = await burst_read(dut)
+        expected = top_fft_ref_model(inputs)
+        assert got == expected, f"DUT={[hex(x) for x in got]}, expected {[hex(x) for x in expected]}"
+        if after:
+            await burst_load(dut, after[3:])
+
+    async def in_turn(read):
+        for inputs in frames:
+            await read(inputs)
+
+    dut.ena.value = 1
+    start = get_sim_time("ns")
+    await burst_load(dut, packed[0])
+    await (check or in_turn)(read)
+    return (get_sim_time("ns") - start) / 10 / len(frames)
 
 @cocotb.test()
+@failure_window
+@frame_metrics
 async def test_reset_and_initial_state(dut):
     dut.current_test_id.value = TEST_IDS["reset"]          
     dut._log.info("Starting reset test")
@@ -140,6 +244,8 @@ async def test_reset_and_initial_state(dut):
     dut.current_test_id.value = 0                           
 
 @cocotb.test()
+@failure_window
+@frame_metrics
 async def test_full_cycle_complex(dut):
     dut.current_test_id.value = TEST_IDS["complex"]        
     dut._log.info("Starting full cycle test with complex values")
@@ -150,6 +256,8 @@ async def test_full_cycle_complex(dut):
     dut.current_test_id.value = 0                           
 
 @cocotb.test()
+@failure_window
+@frame_metrics
 async def test_fft_impulse(dut):
     dut.current_test_id.value = TEST_IDS["impulse"]        
     dut._log.info("Starting impulse response test")
@@ -160,6 +268,8 @@ async def test_fft_impulse(dut):
     dut.current_test_id.value = 0                           
 
 @cocotb.test()
+@failure_window
+@frame_metrics
 async def test_fft_dc_input(dut):
     dut.current_test_id.value = TEST_IDS["dc"]            
     dut._log.info("Starting DC input test")
@@ -170,20 +280,263 @@ async def test_fft_dc_input(dut):
     dut.current_test_id.value = 0                          
 
 @cocotb.test()
+@failure_window
+@frame_metrics
 async def test_randomized_end_to_end(dut):
     dut.current_test_id.value = TEST_IDS["random"]         
     dut._log.info("Starting randomized end-to-end test")
     cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
-    valid_values = list(range(-128, 128, 16))
-    num_tests = 5
-    for i in range(num_tests):
-        dut._log.info(f"--- Randomized Test Iteration {i+1}/{num_tests} ---")
+    stim = frame_stimulus(dut, "test_randomized_end_to_end", 5, GRID)
+
+    async def reset_and_check(inputs):
         await reset_dut(dut)
-        inputs = [
-            (random.choice(valid_values), random.choice(valid_values)),
-            (random.choice(valid_values), random.choice(valid_values)),
-            (random.choice(valid_values), random.choice(valid_values)),
-            (random.choice(valid_values), random.choice(valid_values))
-        ]
         await run_full_fft_test(dut, inputs)
+
+    await check_frames(dut, stim, reset_and_check)
     dut.current_test_id.value = 0                           
+
+@cocotb.test()
+@failure_window
+@frame_metrics
+async def test_burst_mode(dut):
+    dut.current_test_id.value = TEST_IDS["burst"]
+    dut._log.info("Starting burst mode test, frames back-to-back without reset")
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    stim = frame_stimulus(dut, "test_burst_mode", 10, GRID)
+    await reset_dut(dut)
+    await check_frames(dut, stim, lambda inputs: run_burst_fft_test(dut, inputs))
+    dut.current_test_id.value = 0
+
+@cocotb.test()
+@failure_window
+@frame_metrics
+async def test_cycles_per_frame(dut):
+    dut.current_test_id.value = TEST_IDS["cycles"]
+    dut._log.info("Measuring cycles per frame in strobe and burst modes")
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    inputs = [(16, 32), (-48, -64), (80, -96), (-112, 112)]
+
+    await reset_dut(dut)
+    strobe_cycles = await run_full_fft_test(dut, inputs)
+    await reset_dut(dut)
+    burst_cycles = await run_burst_fft_test(dut, inputs)
+
+    dut._log.info(f"Cycles per frame: strobe mode {strobe_cycles:.0f}, burst mode {burst_cycles:.0f} "
+                  f"({strobe_cycles / burst_cycles:.1f}x)")
+    assert burst_cycles < strobe_cycles, "Burst mode should need fewer cycles per frame"
+    dut.current_test_id.value = 0
+
+@cocotb.test()
+@failure_window
+@frame_metrics
+async def test_overlapped_frame_rate(dut):
+    dut.current_test_id.value = TEST_IDS["overlap"]
+    dut._log.info("Measuring steady-state frame rate with load overlapped with readout")
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    stim = frame_stimulus(dut, "test_overlapped_frame_rate", 20, GRID)
+    frames = [inputs for _, inputs in stim]
+
+    await reset_dut(dut)
+    start = get_sim_time("ns")
+    await check_frames(dut, stim, lambda inputs: run_burst_fft_test(dut, inputs))
+    sequential = (get_sim_time("ns") - start) / 10 / len(frames)
+
+    await reset_dut(dut)
+    overlapped = await run_overlapped_frames(dut, frames, lambda read: check_frames(dut, stim, read))
+
+    dut._log.info(f"Cycles per frame: sequential burst {sequential:.1f}, overlapped {overlapped:.1f} "
+                  f"({50e6 / overlapped:,.0f} frames/s at 50 MHz)")
+    assert overlapped < sequential, "Overlapping load with readout should raise the frame rate"
+    dut.current_test_id.value = 0
+
+@cocotb.test()
+@failure_window
+async def test_latency(dut):
+    dut.current_test_id.value = TEST_IDS["latency"]
+    dut._log.info("Measuring load-to-done and done-to-readout latency per frame")
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    stim = frame_stimulus(dut, "test_latency", 5, GRID)
+    metrics = FrameMetrics(dut)
+    metrics.start()
+
+    await reset_dut(dut)
+    await check_frames(dut, stim, lambda inputs: run_full_fft_test(dut, inputs))
+    strobe = len(metrics.frames)
+    await reset_dut(dut)
+    await check_frames(dut, stim, lambda inputs: run_burst_fft_test(dut, inputs))
+
+    metrics.stop()
+    path = metrics.write(metrics_path("test_latency"), test="test_latency", passed=True)
+    dut._log.info(f"Latency summary {metrics.summary()} -> {path}")
+    assert len(metrics.frames) == 2 * len(stim), \
+        f"Monitor recorded {len(metrics.frames)} frames, expected {2 * len(stim)}"
+    assert not metrics.errors, "RTL performance counters disagree: " + "; ".join(metrics.errors)
+    expected = load_to_done(dut)
+    for k, frame in enumerate(metrics.frames):
+        assert frame["load_to_done"] == expected, \
+            f"Frame {k}: done {frame['load_to_done']} cycles after the last load, expected {expected}"
+    # With the output strobe already held, bin 0 is driven on the clock after done
+    for k, frame in enumerate(metrics.frames[strobe:]):
+        assert frame["done_to_readout"] == 1, \
+            f"Burst frame {k}: first bin {frame['done_to_readout']} cycles after done, expected 1"
+
+    await RisingEdge(dut.clk)
+    dut.current_test_id.value = 0
+
+@cocotb.test()
+@failure_window
+@frame_metrics
+async def test_coverage_closure(dut):
+    dut.current_test_id.value = TEST_IDS["coverage"]
+    dut._log.info("Driving coverage-directed frames until the data and FSM bins are closed")
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    rng = np.random.default_rng(cocotb.RANDOM_SEED)
+    coverage = Coverage({**engine_points(GRID), **fsm_points()})
+    sampler = SignalSampler(dut.clk, dut.dut, FSM_SIGNALS)
+
+    await reset_dut(dut)
+    sampler.start()
+    frames, max_frames = 0, 128
+    while coverage.covered() < 1.0 and frames < max_frames:
+        batch = [[tuple(s) for s in f] for f in directed_frames(coverage, rng, 4, GRID).tolist()]
+        # Reloading while a result is waiting only happens with the overlapped schedule
+        if coverage.holes()["load_while_done"]:
+            await run_overlapped_frames(dut, batch)
+        else:
+            for inputs in batch:
+                await run_burst_fft_test(dut, inputs)
+        coverage.sample(engine_hits(batch, GRID))
+        coverage.sample(fsm_hits(**sampler.flush()))
+        frames += len(batch)
+    sampler.stop()
+
+    dut._log.info(f"Coverage {coverage.covered():.1%} after {frames} frames: {coverage.report()}")
+    assert coverage.covered() == 1.0, f"Coverage holes after {frames} frames: {coverage.holes()}"
+    await RisingEdge(dut.clk)
+    dut.current_test_id.value = 0
+
+@cocotb.test()
+@failure_window
+@frame_metrics
+async def test_golden_frames(dut):
+    dut.current_test_id.value = TEST_IDS["golden"]
+    dut._log.info("Burst-streaming frames from the memory-mapped golden vector store")
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    records = golden_vectors("top_fft", GOLDEN_FRAMES)
+
+    await reset_dut(dut)
+    dut.ena.value = 1
+    rows = zip(iter_rows(records["uio_in"]), iter_rows(records["uio_out"]))
+    for k, (uio_in, expected) in enumerate(rows):
+        got = await burst_frame(dut, uio_in)
+        assert got == expected, \
+            f"Frame {k}: uio_in={[hex(x) for x in uio_in]}, DUT={[hex(x) for x in got]}, " \
+            f"expected {[hex(x) for x in expected]}"
+
+    record_vectors("test_golden_frames", len(records))
+    dut.current_test_id.value = 0
+
+
+@cocotb.test()
+@failure_window
+@frame_metrics
+async def test_device_api(dut):
+    dut.current_test_id.value = TEST_IDS["device"]
+    dut._log.info("Transforming frames through the host-side FFTDevice API on the simulated board")
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    device = FFTDevice(SimBoard(dut))
+    await device.reset()
+
+    # One frame: decoded bins against the model
+    inputs = [(16, 32), (-48, -64), (80, -96), (-112, 112)]
+    single = await device.transform(inputs)
+    expected = unpack_output(top_fft(inputs))
+    assert np.array_equal(single, expected), f"transform: DUT={single.tolist()}, expected {expected.tolist()}"
+    single_cycles = device.stats.cycles_per_frame
+
+    # Golden frames back to back, compared byte for byte
+    records = golden_vectors("top_fft", DEVICE_FRAMES)
+    await device.reset()
+    got = await device.transform_many(mem_transform(records["uio_in"]), raw=True)
+    bad = np.flatnonzero((got != records["uio_out"]).any(axis=1))
+    assert not len(bad), \
+        f"{len(bad)} of {DEVICE_FRAMES} frames mismatched, first {bad[0]}: DUT={[hex(x) for x in got[bad[0]]]}, " \
+        f"expected {[hex(x) for x in records['uio_out'][bad[0]]]}"
+
+    stats = device.stats
+    dut._log.info(f"FFTDevice: {stats.frames} frames, {stats.cycles_per_frame:.2f} cycles/frame "
+                  f"(single frame {single_cycles:.0f}), {stats.frames_per_s:,.0f} frames/s simulated, "
+                  f"{stats.frames_per_s_at(50e6):,.0f} frames/s at 50 MHz")
+    record_vectors("test_device_api", stats.frames + 1)
+    assert stats.cycles_per_frame < single_cycles, "Pipelined frames should need fewer cycles than a lone frame"
+    dut.current_test_id.value = 0
+
+
+@cocotb.test()
+@failure_window
+async def test_lockstep_model(dut):
+    dut.current_test_id.value = TEST_IDS["lockstep"]
+    dut._log.info("Random pin activity with the cycle model (fft_model.ChipModel) checked on every clock")
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    rng = np.random.default_rng(cocotb.RANDOM_SEED)
+    ui_in = rng.integers(0, 8, LOCKSTEP_CYCLES)
+    uio_in = rng.integers(0, 256, LOCKSTEP_CYCLES)
+    ena = rng.random(LOCKSTEP_CYCLES) >= 0.02
+    # Occasional resets of one to three clocks
+    rst_n = np.ones(LOCKSTEP_CYCLES, dtype=bool)
+    for start in np.flatnonzero(rng.random(LOCKSTEP_CYCLES) < 0.002):
+        rst_n[start:start + rng.integers(1, 4)] = False
+
+    await reset_dut(dut)
+    lockstep = Lockstep(dut)
+    lockstep.start()
+    for pins in zip(ui_in.tolist(), uio_in.tolist(), ena.tolist(), rst_n.tolist()):
+        dut.ui_in.value, dut.uio_in.value, dut.ena.value, dut.rst_n.value = pins
+        await RisingEdge(dut.clk)
+    await RisingEdge(dut.clk)
+    lockstep.stop()
+
+    dut._log.info(f"Lockstep: {lockstep.cycles} cycles, {len(lockstep.mismatches)} mismatches")
+    lockstep.check()
+    dut.current_test_id.value = 0
+
+
+@cocotb.test()
+@failure_window
+@frame_metrics
+async def test_continuous_stream(dut):
+    dut.current_test_id.value = TEST_IDS["stream"]
+    dut._log.info(f"Streaming {CONTINUOUS_FRAMES} golden frames back to back without reset")
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    records = golden_vectors("top_fft", CONTINUOUS_FRAMES)
+    latency = dut.engine_latency.value.integer
+    ui_in, uio_in = burst_stream(records["uio_in"], latency)
+    expected = [bus[:, 0] for bus in ChipModel(latency=latency).run(ui_in, uio_in)]
+    driven = expected[2] == 0xFF
+    assert np.array_equal(expected[1][driven].reshape(-1, 4), records["uio_out"]), \
+        "Cycle model disagrees with the golden store"
+
+    board = SimBoard(dut)
+    await board.reset()
+    start_ns, start = get_sim_time("ns"), time.perf_counter()
+    got = [await board.step(ui, uio) for ui, uio in zip(ui_in.tolist(), uio_in.tolist())]
+    wall = time.perf_counter() - start
+    sim_s = (get_sim_time("ns") - start_ns) * 1e-9
+    got = np.array(got, dtype=np.int64).T
+
+    # Every clock: the 7-segment code, the output register and its enable
+    period = (len(ui_in) - 4) // CONTINUOUS_FRAMES
+    for name, dut_bus, model_bus in zip(("uo_out", "uio_out", "uio_oe"), got, expected):
+        bad = np.flatnonzero(dut_bus != model_bus)
+        assert not len(bad), \
+            f"{name}: {len(bad)} of {len(ui_in)} clocks mismatched, first at clock {bad[0]} " \
+            f"(frame {max(bad[0] - 4, 0) // period}): DUT={dut_bus[bad[0]]:#04x}, model={model_bus[bad[0]]:#04x}"
+    bins = got[1][got[2] == 0xFF].reshape(-1, 4)
+    assert np.array_equal(bins, records["uio_out"]), "Bins read out differ from the golden store"
+
+    dut._log.info(f"Continuous stream: {CONTINUOUS_FRAMES} frames in {len(ui_in)} clocks "
+                  f"({len(ui_in) / CONTINUOUS_FRAMES:.2f} cycles/frame), "
+                  f"{CONTINUOUS_FRAMES / sim_s:,.0f} frames per simulated second, "
+                  f"{CONTINUOUS_FRAMES / wall:,.0f} frames/s wall clock")
+    record_vectors("test_continuous_stream", CONTINUOUS_FRAMES)
+    dut.current_test_id.value = 0
@@ -0,0 +1,142 @@
+`default_nettype none
+`timescale 1ns / 1ps
+
+// Self-checking harness: replays burst-mode frames and their expected bins
+// from $readmemh files (fft_model/memh.py) with its own clock, so no Python
+// runs per frame.
+//
+// While start is high the harness loads vector_count frames from
+// selfcheck_stim.memh (four uio_in bytes) / selfcheck_expect.memh (four
+// uio_out bytes) in the working directory and pushes them through the chip
+// back-to-back, with the same burst schedule as burst_frame() in
+// test_top_fft.py. finished rises once they have all been checked and falls
+// again when start is released, so cocotb can refill the files and repeat.
+// Without cocotb, +VECTORS=<n> replays the files once and ends the simulation.
+module tt_um_FFT_engine_selfcheck_tb #(
+    parameter int DEPTH = 1 << 16,      // must match fft_model.memh.DEPTH
+    parameter int TIMEOUT = 100         // clocks to wait for the four bins
+) (
+    input  logic        start,
+    input  logic [31:0] vector_count,
+    output logic        finished,
+    output logic [31:0] checked,
+    output logic [31:0] mismatches
+);
+
+    // ui_in[2]: level-sensitive strobes; ui_in[0] loads a sample, ui_in[1] reads a bin
+    localparam logic [7:0] BURST = 8'h04;
+
+    logic       clk = 0;
+    logic       rst_n = 0;
+    logic       ena = 0;
+    logic [7:0] ui_in = '0;
+    logic [7:0] uio_in = '0;
+    wire  [7:0] uo_out, uio_out, uio_oe;
+    always #5 clk = ~clk;
+
+    logic [31:0] stim     [DEPTH];
+    logic [31:0] expected [DEPTH];
+
+    // Dump signals for waveform viewing
+    // Only dumps when given +VCD_PATH; +WAVE_SCOPE / +WAVE_DEPTH narrow the dump (see test/waves.py)
+    string vcd_name;
+    string wave_scope;
+    integer wave_depth;
+    initial begin
+        if ($value$plusargs("VCD_PATH=%s", vcd_name)) begin
+            if (!$value$plusargs("WAVE_SCOPE=%s", wave_scope))
+                wave_scope = "";
+            if (!$value$plusargs("WAVE_DEPTH=%d", wave_depth))
+                wave_depth = 0;
+            $dumpfile(vcd_name);
+            case (wave_scope)
+                "dut":   $dumpvars(wave_depth, dut);
+                "fft":   $dumpvars(wave_depth, dut.fft_inst);
+                "mem":   $dumpvars(wave_depth, dut.mem_inst);
+                "io":    $dumpvars(wave_depth, dut.io_inst);
+                default: $dumpvars(wave_depth, tt_um_FFT_engine_selfcheck_tb);
+            endcase
+        end
+    end
+
+    // Toggled by fft_tb.window to flush the dump before it cuts out a failure window
+    logic wave_flush = 0;
+    always @(wave_flush) $dumpflush;
+
+    tt_um_FFT_engine dut (
+        .ui_in(ui_in),
+        .uo_out(uo_out),
+        .uio_in(uio_in),
+        .uio_out(uio_out),
+        .uio_oe(uio_oe),
+        .ena(ena),
+        .clk(clk),
+        .rst_n(rst_n)
+    );
+
+    // Inputs change on the falling edge and outputs are sampled there, half a
+    // clock after the rising edge that produced them.
+    task automatic frame(input logic [31:0] samples, output logic [31:0] bins, output int got);
+        ui_in = BURST | 8'h01;
+        for (int s = 3; s >= 0; s--) begin
+            uio_in = samples[8 * s +: 8];
+            @(negedge clk);
+        end
+        // Hold the output strobe: the bins stream out as soon as the FFT is done
+        ui_in = BURST | 8'h02;
+        got = 0;
+        for (int t = 0; t < TIMEOUT && got < 4; t++) begin
+            @(negedge clk);
+            if (uio_oe == 8'hFF) begin
+                bins[8 * (3 - got) +: 8] = uio_out;
+                got++;
+            end
+        end
+        // The DUT drives uio for one more clock before the host may drive it again
+        @(negedge clk);
+        ui_in = BURST;
+    endtask
+
+    task automatic replay(input int count);
+        logic [31:0] bins;
+        int got;
+        $readmemh("selfcheck_stim.memh", stim, 0, count - 1);
+        $readmemh("selfcheck_expect.memh", expected, 0, count - 1);
+        for (int i = 0; i < count; i++) begin
+            bins = '0;
+            frame(stim[i], bins, got);
+            if (got != 4 || bins !== expected[i]) begin
+                mismatches = mismatches + 1;
+                if (mismatches <= 10)
+                    $display("SELFCHECK MISMATCH frame %0d: uio_in=%h uio_out=%h (%0d bins) expected=%h",
+                             checked, stim[i], bins, got, expected[i]);
+            end
+            checked = checked + 1;
+        end
+    endtask
+
+    int standalone;
+    initial begin
+        finished = 0;
+        checked = 0;
+        mismatches = 0;
+        repeat (5) @(negedge clk);
+        rst_n = 1;
+        repeat (5) @(negedge clk);
+        ena = 1;
+        if ($value$plusargs("VECTORS=%d", standalone)) begin
+            replay(standalone);
+            $display("SELFCHECK checked=%0d mismatches=%0d", checked, mismatches);
+            $finish;
+        end
+        forever begin
+            wait (start === 1'b1);
+            replay(vector_count);
+            $display("SELFCHECK checked=%0d mismatches=%0d", checked, mismatches);
+            finished = 1;
+            wait (start === 1'b0);
+            finished = 0;
+        end
+    end
+
+endmodule
@@ -17,19 +17,35 @@ module tt_um_FFT_engine_tb (
 
 logic [7:0] current_test_id = 0;
 
+    // Clocks fft_engine takes from a loaded frame to its results, as built
+    wire [7:0] engine_latency = dut.FFT_LATENCY;
+
     // Dump signals for waveform viewing
+    // Only dumps when given +VCD_PATH; +WAVE_SCOPE / +WAVE_DEPTH narrow the dump (see test/waves.py)
     string vcd_name;
+    string wave_scope;
+    integer wave_depth;
     initial begin
-`ifdef VCD_PATH
-        vcd_name = `VCD_PATH;
-`else
-        vcd_name = {"tt_um_FFT_engine_tb_", `TIMESTAMP, ".vcd"};
-`endif
-        $dumpfile(vcd_name);
-        $dumpvars(0, tt_um_FFT_engine_tb);
-        #1;
+        if ($value$plusargs("VCD_PATH=%s", vcd_name)) begin
+            if (!$value$plusargs("WAVE_SCOPE=%s", wave_scope))
+                wave_scope = "";
+            if (!$value$plusargs("WAVE_DEPTH=%d", wave_depth))
+                wave_depth = 0;
+            $dumpfile(vcd_name);
+            case (wave_scope)
+                "dut":   $dumpvars(wave_depth, dut);
+                "fft":   $dumpvars(wave_depth, dut.fft_inst);
+                "mem":   $dumpvars(wave_depth, dut.mem_inst);
+                "io":    $dumpvars(wave_depth, dut.io_inst);
+                default: $dumpvars(wave_depth, tt_um_FFT_engine_tb);
+            endcase
+        end
     end
 
+    // Toggled by fft_tb.window to flush the dump before it cuts out a failure window
+    logic wave_flush = 0;
+    always @(wave_flush) $dumpflush;
+
     // Instantiate the top-level DUT
     tt_um_FFT_engine dut (
         .ui_in(ui_in),
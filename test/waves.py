@@ -0,0 +1,110 @@
+"""
+Waveform policy for the testbenches.
+
+The harnesses only dump when they receive a +VCD_PATH plusarg, so the
+policy is applied at run time without touching the cached builds:
+
+    vcd     full VCD of the harness (default)
+    fst     same, written as compressed FST
+    off     no dump at all
+    window  VCD to a scratch <name>_<stamp>_window.vcd; fft_tb.window cuts the
+            clocks before a failure out of it, and the scratch dump is
+            deleted on the next run
+
+WAVE_SCOPE narrows vcd/fst/window dumps to a sub-hierarchy (`dut`, or
+`fft`, `mem`, `io` for the top level) and WAVE_DEPTH limits the levels
+dumped. Old wave files beyond WAVE_KEEP per directory are pruned on
+every run.
+
+Verilator is the exception to run-time selection: tracing and the trace
+format are compiled in, so trace_args() feeds its build (and build key).
+
+The Makefile uses the command line form to build PLUSARGS:
+
+    python waves.py --mode fst --scope dut ./fft_engine/wave fft_engine_tb 20250101_12:00:00
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+MODES = ("vcd", "fst", "off", "window")
+
+# Wave files kept per wave directory
+DEFAULT_KEEP = 10
+
+WAVE_SUFFIXES = (".vcd", ".fst")
+
+# Scratch dump of window mode, only kept until the next run
+WINDOW_SUFFIX = "_window.vcd"
+
+
+def current_mode(default="vcd"):
+    """Mode selected through the WAVES_MODE environment variable, `default` when it is unset."""
+    mode = os.environ.get("WAVES_MODE") or default
+    if mode is not None and mode not in MODES:
+        raise ValueError(f"WAVES_MODE must be one of {', '.join(MODES)}, not {mode!r}")
+    return mode
+
+
+def trace_args(sim, mode):
+    """Compile arguments `sim` needs for the harness $dumpfile to work in `mode`."""
+    if sim != "verilator":
+        return []
+    return {"vcd": ["--trace"], "fst": ["--trace-fst"], "window": ["--trace"]}.get(mode, [])
+
+
+def plusargs(mode, wave_dir, name, stamp, scope=None, depth=None, sim="icarus"):
+    """Simulator run-time arguments implementing `mode` for one run."""
+    if mode == "off":
+        return []
+    suffix = {"fst": ".fst", "window": WINDOW_SUFFIX}.get(mode, ".vcd")
+    args = [f"+VCD_PATH={Path(wave_dir) / f'{name}_{stamp}{suffix}'}"]
+    if scope:
+        args.append(f"+WAVE_SCOPE={scope}")
+    if depth:
+        args.append(f"+WAVE_DEPTH={depth}")
+    if mode == "fst" and sim == "icarus":
+        # Icarus extended argument selecting the FST writer for $dumpfile
+        args.append("-fst")
+    return args
+
+
+def prune(wave_dir, keep=DEFAULT_KEEP):
+    """Delete the window-mode scratch dumps and all but the `keep` newest wave files in `wave_dir`."""
+    wave_dir = Path(wave_dir)
+    if not wave_dir.is_dir():
+        return []
+    scratch = [p for p in wave_dir.iterdir() if p.name.endswith(WINDOW_SUFFIX)]
+    waves = sorted(
+        (p for p in wave_dir.iterdir() if p.suffix in WAVE_SUFFIXES and p not in scratch),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for stale in scratch + waves[keep:]:
+        stale.unlink(missing_ok=True)
+    return scratch + waves[keep:]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print simulator plusargs for a waveform mode.")
+    parser.add_argument("wave_dir")
+    parser.add_argument("name")
+    parser.add_argument("stamp")
+    parser.add_argument("--mode", choices=MODES, help="default: WAVES_MODE, else vcd")
+    parser.add_argument("--sim", default="icarus")
+    parser.add_argument("--scope", default="")
+    parser.add_argument("--depth", type=int, default=0)
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP)
+    args = parser.parse_args(argv)
+    try:
+        mode = args.mode or current_mode()
+    except ValueError as e:
+        parser.error(str(e))
+
+    prune(args.wave_dir, args.keep)
+    print(" ".join(plusargs(mode, args.wave_dir, args.name, args.stamp, args.scope, args.depth, args.sim)))
+
+
+if __name__ == "__main__":
+    main()